@@ -0,0 +1,75 @@
+"""Measures the import time of the package with ``python -X importtime``,
+for a program that only imports it, one that uses :class:`SyncClient`
+and one that uses :class:`AsyncClient`.
+
+    $ python benchmarks/import_time.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import typing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'import only': 'import openrobot.api_wrapper',
+    'SyncClient': 'from openrobot.api_wrapper import SyncClient',
+    'AsyncClient': 'from openrobot.api_wrapper import AsyncClient',
+}
+
+TRANSPORTS = ('aiohttp', 'requests')
+
+
+def import_time(code: str) -> typing.Tuple[int, typing.Set[str]]:
+    # Returns the time in microseconds spent importing modules while
+    # running the code, and the names of these modules.
+    env = {**os.environ, 'PYTHONPATH': ROOT + os.pathsep + os.environ.get('PYTHONPATH', '')}
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, check=True,
+                            stderr=subprocess.PIPE, universal_newlines=True).stderr
+
+    total = 0
+    modules = set()
+    started = False
+
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+
+        if not started:
+            # Everything up to site is imported by the interpreter itself.
+            started = name.strip() == 'site'
+            continue
+
+        modules.add(name.strip())
+
+        # Only the outermost imports are counted, the nested ones are part
+        # of their cumulative time.
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+
+    return total, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print(f'{"mode":<12} {"ms":>8}  transports')
+
+    for mode, code in MODES.items():
+        totals = []
+
+        for _ in range(runs):
+            total, modules = import_time(code)
+            totals.append(total)
+
+        transports = ', '.join(t for t in TRANSPORTS if t in modules) or '-'
+
+        print(f'{mode:<12} {statistics.median(totals) / 1000:>8.1f}  {transports}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Compares the old two-pass decoding of responses with the single-pass
+decoding of ``json_or_text``, with :func:`json.loads` and with orjson.
+
+    $ python benchmarks/json_decoding.py [repeat]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openrobot.api_wrapper.utils import decode_body  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+def celebrity(count: int = 500) -> dict:
+    return {'celebrities': [{
+        'name': f'Celebrity {i}',
+        'confidence': 0.99 - i / 10000,
+        'face_rectangle': {'left': i, 'top': i * 2, 'width': 120, 'height': 140},
+    } for i in range(count)]}
+
+
+def description(count: int = 500) -> dict:
+    return {
+        'tags': [f'tag-{i}' for i in range(count)],
+        'captions': [{'text': f'a photo of thing number {i} on a table', 'confidence': 0.5} for i in range(count)],
+    }
+
+
+def tts_support(count: int = 2000) -> dict:
+    return {'languages': [f'xx-{i}' for i in range(50)], 'voices': [{
+        'Gender': 'Female' if i % 2 else 'Male',
+        'Id': f'Voice{i}',
+        'LanguageCode': f'xx-{i % 50}',
+        'LanguageName': f'Language {i % 50}',
+        'Name': f'Voice {i}',
+        'SupportedEngines': ['neural', 'standard'],
+    } for i in range(count)]}
+
+
+def two_pass(body: bytes):
+    # What json_or_text did before: response.text, then response.json(),
+    # which decodes the body to text again before parsing it.
+    body.decode('utf-8')
+    return json.loads(body.decode('utf-8'))
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    decoders = [
+        ('two-pass (before)', two_pass),
+        ('single-pass json', lambda body: decode_body(body, CONTENT_TYPE, loads=json.loads)),
+    ]
+
+    if orjson is not None:
+        decoders.append(('single-pass orjson', lambda body: decode_body(body, CONTENT_TYPE, loads=orjson.loads)))
+
+    print(f'{"payload":<12} {"size":>9} {"decoder":<20} {"ms/response":>11}')
+
+    for name, payload in (('celebrity', celebrity()), ('description', description()), ('tts-support', tts_support())):
+        body = json.dumps(payload).encode('utf-8')
+        baseline = None
+
+        for decoder_name, decode in decoders:
+            assert decode(body) == payload
+
+            seconds = min(timeit.repeat(lambda: decode(body), number=repeat, repeat=5)) / repeat
+            baseline = baseline or seconds
+
+            print(f'{name:<12} {len(body):>9} {decoder_name:<20} {seconds * 1000:>11.3f}  ({baseline / seconds:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Measures the memory used by each result object.
+
+Compares results with a ``__dict__`` (as they were before ``__slots__``),
+slotted results that keep the raw data, and slotted results created
+with ``keep_raw=False``.
+
+    $ python benchmarks/results_memory.py [count]
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openrobot.api_wrapper import NSFWCheckResult, SentimentResult  # noqa: E402
+
+PAYLOADS = {
+    SentimentResult: json.dumps({
+        'task_id': '4f0f8b8e-2d64-4a8f-9b1e-7c3f0e7c2d11',
+        'text': 'I love this library, it is so fast!',
+        'status': 'COMPLETED',
+        'result': [{'label': 'POSITIVE', 'score': 0.9998}],
+        'timestamp': 1640995200.123,
+    }),
+    NSFWCheckResult: json.dumps({
+        'image_url': 'https://api.openrobot.xyz/api/nsfw-check/images/4f0f8b8e.png',
+        'adult': {'is_adult': False, 'adult_score': 0.0123},
+        'racy': {'is_racy': False, 'racy_score': 0.0456},
+        'gore': {'is_gore': False, 'gore_score': 0.0012},
+    }),
+}
+
+# Reading these builds the lazy nested objects, like a real consumer would.
+NESTED = {
+    SentimentResult: 'result',
+    NSFWCheckResult: 'adult',
+}
+
+
+def with_dict(cls):
+    # A subclass without __slots__ gets a __dict__ again.
+    return type(cls.__name__, (cls,), {})
+
+
+def measure(cls, factory, count: int, **kwargs) -> float:
+    payload = PAYLOADS[cls]
+
+    tracemalloc.start()
+    results = [factory(json.loads(payload), **kwargs) for _ in range(count)]
+
+    for result in results:
+        getattr(result, NESTED[cls])
+
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del results
+
+    return size / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f'{"result":<18} {"variant":<26} {"bytes/object":>12}')
+
+    for cls in PAYLOADS:
+        baseline = None
+
+        for variant, factory, kwargs in (
+            ('__dict__, raw', with_dict(cls), {}),
+            ('__slots__, raw', cls, {}),
+            ('__slots__, keep_raw=False', cls, {'keep_raw': False}),
+        ):
+            size = measure(cls, factory, count, **kwargs)
+            baseline = baseline or size
+
+            print(f'{cls.__name__:<18} {variant:<26} {size:>12.0f}  ({size / baseline:.0%})')
+
+
+if __name__ == '__main__':
+    main()
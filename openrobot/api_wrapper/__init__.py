@@ -1,11 +1,63 @@
-from ._async import *
-from ._sync import *
+import importlib
+import types
+
 from .error import *
 from .results import *
 from .translate import *
 from .speech import *
 from .utils import *
+from .ratelimit import *
+from .batch import *
+from .tasks import *
+from .cache import *
+from .store import *
+from .coalesce import *
+from .upload import *
+from .preprocess import *
+from .retry import *
+from .timeout import *
+from .breaker import *
+from .hedge import *
+from .metrics import *
+from .tracing import *
+from .timing import *
 
-from . import _async, _sync, translate, results, error, speech, utils
+from . import translate, results, error, speech, utils, ratelimit, batch, tasks, cache, store, coalesce, upload, preprocess, retry, timeout, breaker, hedge, metrics, tracing, timing
 
 __version__ = '0.5.0.2'
+
+# The clients are imported the first time they are used, so that aiohttp is
+# only imported by programs using AsyncClient and requests only by programs
+# using SyncClient.
+_LAZY = {
+    'AsyncClient': '._async',
+    'SyncClient': '._sync',
+    '_async': '._async',
+    '_sync': '._sync',
+}
+
+# The public names of the submodules, without the modules they import.
+__all__ = list(dict.fromkeys(
+    name
+    for module in (error, results, translate, speech, utils, ratelimit, batch, tasks, cache, store, coalesce, upload,
+                   preprocess, retry, timeout, breaker, hedge, metrics, tracing, timing)
+    for name, value in vars(module).items()
+    if not name.startswith('_') and not isinstance(value, types.ModuleType)
+))
+__all__ += ['AsyncClient', 'SyncClient']
+
+
+def __getattr__(name):
+    try:
+        module = importlib.import_module(_LAZY[name], __name__)
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    value = module if name.startswith('_') else getattr(module, name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -1,6 +1,7 @@
 import aiohttp
 import asyncio
 import re
+import time
 import warnings
 import io
 import typing
@@ -8,6 +9,21 @@ from .error import *
 from .results import *
 from .translate import Translate
 from .speech import Speech
+from .ratelimit import RateLimiter
+from .cache import CacheEntry, ResponseCache
+from .store import ResultStore
+from .tasks import AsyncTaskPoller, CompletionEstimator, PollBackoff, wait_task_async
+from .batch import Batch, BatchItem, async_map
+from .coalesce import AsyncSingleFlight, request_key
+from .upload import Upload, UploadSource
+from .preprocess import ImagePreprocessor
+from .retry import RetryPolicy
+from .breaker import CircuitBreaker
+from .hedge import HedgePolicy
+from .metrics import Metrics, RequestEvent
+from .tracing import Tracer, _NOOP_SPAN
+from .timing import RequestTimings
+from .timeout import Deadline, Timeout
 from .utils import *
 
 try:
@@ -21,6 +37,47 @@ except:
             'urllib.parse.quote_plus and urllib.parse.quote cannot be found. Things might not be parsed well.')
 
 
+def _timing_trace_config() -> aiohttp.TraceConfig:
+    # Measures the phases of the RequestTimings passed as the
+    # trace_request_ctx of a request.
+    trace_config = aiohttp.TraceConfig()
+
+    def phase(name, end):
+        async def callback(session, ctx, params):
+            timings = ctx.trace_request_ctx
+            if isinstance(timings, RequestTimings):
+                if end:
+                    timings.stop(name)
+                else:
+                    timings.start(name)
+
+        return callback
+
+    async def on_connection_create_end(session, ctx, params):
+        timings = ctx.trace_request_ctx
+        if isinstance(timings, RequestTimings):
+            timings.stop('connect')
+            # aiohttp opens a new one when a reused connection was closed.
+            timings.reused = False
+            timings.ready()
+
+    async def on_connection_reuseconn(session, ctx, params):
+        timings = ctx.trace_request_ctx
+        if isinstance(timings, RequestTimings):
+            timings.reused = True
+            timings.ready()
+
+    trace_config.on_connection_queued_start.append(phase('queue', False))
+    trace_config.on_connection_queued_end.append(phase('queue', True))
+    trace_config.on_dns_resolvehost_start.append(phase('dns', False))
+    trace_config.on_dns_resolvehost_end.append(phase('dns', True))
+    trace_config.on_connection_create_start.append(phase('connect', False))
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+    return trace_config
+
+
 class AsyncClient:
     """Async Client for OpenRobot API.
 
@@ -44,6 +101,79 @@ class AsyncClient:
         handle 429s. This does not affect anything if ``handle_ratelimit``
         is ``False``. If this is ``None``, it will go infinitely, and you
         might get Temp-Banned by Cloudflare. Defaults to ``5``.
+    limit: Optional[:class:`int`]
+        The total number of simultaneous connections the client-owned
+        session may open. ``0`` means no limit. Defaults to ``100``.
+    limit_per_host: Optional[:class:`int`]
+        The number of simultaneous connections to a single host.
+        ``0`` means no limit. Defaults to ``0``.
+    ttl_dns_cache: Optional[:class:`int`]
+        The number of seconds resolved DNS entries are cached for.
+        ``None`` caches them forever. Defaults to ``300``.
+    keepalive_timeout: Optional[:class:`float`]
+        The number of seconds an idle connection is kept alive for
+        reuse. Defaults to ``30``.
+    enable_cleanup_closed: Optional[:class:`bool`]
+        Whether to clean up connections that were closed by the server
+        without a proper TLS shutdown. Defaults to ``False``.
+    ratelimiter: Optional[:class:`RateLimiter`]
+        The rate limiter used to pace the requests before they are sent.
+        Defaults to ``None``.
+    poll_backoff: Optional[:class:`PollBackoff`]
+        How to poll tasks that are being waited for. Defaults to
+        :class:`PollBackoff` with its default values.
+    cache: Optional[:class:`ResponseCache`]
+        The cache used for the idempotent lookups: :meth:`lyrics`,
+        :class:`Translate` and the :class:`Speech` supports. Defaults to
+        ``None``.
+    store: Optional[:class:`ResultStore`]
+        The persistent store checked before uploading an image to the
+        image endpoints. Defaults to ``None``.
+    coalesce: Optional[:class:`bool`]
+        Whether identical lookups and image uploads made at the same time
+        share a single request, and whether :meth:`map` collapses
+        duplicate inputs. Defaults to ``False``.
+    preprocess: Optional[:class:`ImagePreprocessor`]
+        Checks and downscales the images before they are uploaded to the
+        image endpoints. Defaults to ``None``.
+    keep_raw: Optional[:class:`bool`]
+        Whether the results keep the raw data given by the API in their
+        ``raw`` attribute. Not keeping it more than halves the memory
+        used by each result, but their nested objects are built right
+        away instead of lazily. Defaults to ``True``.
+    json_loads: Optional[Callable[[:class:`bytes`], Any]]
+        The function used to decode the JSON responses, straight from
+        their bytes. Defaults to ``orjson.loads`` if orjson is installed
+        (e.g with the ``orjson`` extra), else :func:`json.loads`. Large
+        responses are only decoded faster with orjson.
+    retry: Optional[:class:`RetryPolicy`]
+        Which failed requests to retry, and how. Defaults to
+        :class:`RetryPolicy` with its default values, which retries the
+        5xx statuses, connection errors and timeouts of the idempotent
+        requests up to 3 times. The ``POST`` requests, such as the
+        uploads, are not retried.
+    timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+        How long each attempt of a request can take. A number is a total
+        timeout in seconds. Every method also takes a ``timeout``, which
+        overrides this one. Defaults to a total of 300 seconds, with 10
+        seconds to connect and 60 seconds between reads.
+    breaker: Optional[:class:`CircuitBreaker`]
+        The circuit breakers that stop sending requests to the routes that
+        keep failing, e.g ``CircuitBreaker()``. Defaults to ``None``.
+    hedge: Optional[:class:`HedgePolicy`]
+        Hedges the ``GET`` lookups that are slow to answer, by sending them
+        a second time. Defaults to ``None``.
+    metrics: Optional[:class:`Metrics`]
+        Counts the requests, and calls the hooks added to it. Passing the
+        same one to several clients counts them together. Defaults to a
+        new :class:`Metrics`.
+    tracer: Optional[:class:`Tracer`]
+        Traces every call, and the steps it took, as :class:`Span`\\s.
+        Defaults to ``None``.
+
+    These connector options are only used when ``session`` is not
+    passed, in which case the client creates its own session on the
+    first request and keeps it until :meth:`aclose` is called.
 
     Attributes
     ----------
@@ -52,12 +182,32 @@ class AsyncClient:
     loop: :class:`asyncio.AbstractEventLoop`
         The loop that is used.
     session: Optional[:class:`aiohttp.ClientSession`]
-        The session used. ``None`` if not specified.
+        The session used. ``None`` until the first request if not specified.
+    poller: :class:`AsyncTaskPoller`
+        The poller that tracks every task being waited for.
+    metrics: :class:`Metrics`
+        The counters of the requests, and their hooks.
     """
 
+    # Retried when the RetryPolicy does not say otherwise.
+    _RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+    # The errors a stale cached response is served instead of, with the
+    # 5xx statuses: the API failed or couldn't be reached, as opposed to
+    # refusing the request.
+    _STALE_IF_ERROR = (UnexpectedContentType, DeadlineExceeded, CircuitOpen, aiohttp.ClientError, asyncio.TimeoutError)
+
     def __init__(self, token: str = 'I-Am-Testing', *, session: aiohttp.ClientSession = None,
                  loop: asyncio.AbstractEventLoop = None, ignore_warning: bool = False, handle_ratelimit: bool = True,
-                 tries: int = 5):
+                 tries: int = 5, limit: int = 100, limit_per_host: int = 0,
+                 ttl_dns_cache: typing.Optional[int] = 300, keepalive_timeout: float = 30,
+                 enable_cleanup_closed: bool = False, ratelimiter: RateLimiter = None,
+                 poll_backoff: PollBackoff = None, cache: ResponseCache = None,
+                 store: ResultStore = None, coalesce: bool = False,
+                 preprocess: ImagePreprocessor = None, keep_raw: bool = True,
+                 json_loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = None,
+                 retry: RetryPolicy = None, timeout: typing.Union[float, Timeout, None] = None,
+                 breaker: CircuitBreaker = None, hedge: HedgePolicy = None,
+                 metrics: Metrics = None, tracer: Tracer = None):
         token = token or get_token_from_file()
 
         if not token:
@@ -76,12 +226,115 @@ class AsyncClient:
         if self.session:
             self.session._loop = self.loop
 
+        self._owns_session: bool = self.session is None
+
         self.handle_ratelimit: bool = handle_ratelimit
 
         self.tries: int = tries
 
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.ttl_dns_cache: typing.Optional[int] = ttl_dns_cache
+        self.keepalive_timeout: float = keepalive_timeout
+        self.enable_cleanup_closed: bool = enable_cleanup_closed
+
+        self.ratelimiter: typing.Optional[RateLimiter] = ratelimiter
+
+        self.poll_backoff: PollBackoff = poll_backoff or PollBackoff()
+        self.task_estimator: CompletionEstimator = CompletionEstimator()
+        self.poller: AsyncTaskPoller = AsyncTaskPoller(self)
+
+        self.cache: typing.Optional[ResponseCache] = cache
+        self.store: typing.Optional[ResultStore] = store
+
+        self.coalesce: bool = coalesce
+        self.preprocess: typing.Optional[ImagePreprocessor] = preprocess
+        self.keep_raw: bool = keep_raw
+        self.json_loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = json_loads
+        self.retry: RetryPolicy = retry or RetryPolicy()
+        self.timeout: Timeout = Timeout.coerce(timeout) or Timeout(300, connect=10, read=60)
+        self.breaker: typing.Optional[CircuitBreaker] = breaker
+        self.hedge: typing.Optional[HedgePolicy] = hedge
+        self.metrics: Metrics = metrics or Metrics()
+        self.tracer: typing.Optional[Tracer] = tracer
+        self._inflight: AsyncSingleFlight = AsyncSingleFlight()
+
+        self._background: typing.Set[asyncio.Future] = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """|coro|
+
+        Closes the session and all of its pooled connections.
+
+        This does nothing to a session that was passed to the client.
+        """
+
+        await self.poller.close()
+
+        for task in list(self._background):
+            task.cancel()
+
+        if self.session is not None and self._owns_session:
+            session, self.session = self.session, None
+            await session.close()
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Returns the statistics of the client.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            The stats of the ``requests`` to each route (see
+            :meth:`Metrics.stats`), of the connection ``pool`` once the
+            session is made, of the ``retry`` policy, and of the ``breaker``
+            of each route, ``ratelimiter``, ``cache``, ``preprocess`` and
+            ``hedge`` if they are set, and the number of calls that were
+            ``coalesced`` into another one.
+
+        Example
+        -------
+        .. code-block:: python3
+
+            latency = client.stats()['requests']['routes']['/api/ocr']['latency']
+            print(f"OCR p99: {latency['p99']:.3f}s")
+        """
+
+        return {
+            'requests': self.metrics.stats(),
+            'pool': self._pool_stats(),
+            'retry': self.retry.stats(),
+            'breaker': self.breaker.stats() if self.breaker is not None else None,
+            'ratelimiter': self.ratelimiter.stats() if self.ratelimiter is not None else None,
+            'cache': self.cache.stats() if self.cache is not None else None,
+            'preprocess': self.preprocess.stats() if self.preprocess is not None else None,
+            'hedge': self.hedge.stats() if self.hedge is not None else None,
+            'coalesced': self._inflight.shared,
+        }
+
     # Important and internal methods, but should be used un-regularly by the User itself.
 
+    def _pool_stats(self) -> typing.Optional[typing.Dict[str, int]]:
+        # The connections of the connector of the session. aiohttp doesn't
+        # expose them, so this reads its internals.
+        connector = self.session.connector if self.session is not None and not self.session.closed else None
+        if connector is None:
+            return None
+
+        conns = getattr(connector, '_conns', {})
+
+        return {
+            'hosts': len(conns),
+            'in_use': len(getattr(connector, '_acquired', ())),
+            'idle': sum(len(c) for c in conns.values()),
+            'limit': connector.limit,
+        }
+
     def _get_authorization_headers(self, token: str = None, *, header=True):
         token = str(token or self.token)
         if header is False:
@@ -89,12 +342,78 @@ class AsyncClient:
         else:
             return {'Authorization': token}
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        # This never awaits, so there is no need for a lock to stop two
+        # coroutines on the same loop from creating a session each.
+        if self.session is None or (self._owns_session and self.session.closed):
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             ttl_dns_cache=self.ttl_dns_cache,
+                                             use_dns_cache=self.ttl_dns_cache != 0,
+                                             keepalive_timeout=self.keepalive_timeout,
+                                             enable_cleanup_closed=self.enable_cleanup_closed)
+
+            self.session = aiohttp.ClientSession(connector=connector, trace_configs=[_timing_trace_config()])
+            self._owns_session = True
+
+        return self.session
+
+    def _spawn(self, coro: typing.Awaitable) -> asyncio.Future:
+        # Runs a coroutine in the background, keeping a reference to it
+        # so it isn't garbage collected before it is done.
+        task = asyncio.ensure_future(coro)
+
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        return task
+
+    async def _upload(self, route: str, upload: Upload, **kwargs):
+        digest = None
+
+        if self.store is not None or self.coalesce:
+            # Hashing a file reads all of it, which would block the loop.
+            digest = upload.digest() if upload.in_memory else await asyncio.get_running_loop().run_in_executor(None, upload.digest)
+
+        if digest is None:
+            return await self._send_image(route, upload, kwargs)
+        elif self.coalesce:
+            return await self._inflight.do((route, digest), lambda: self._stored_request(route, digest, upload, kwargs))
+
+        return await self._stored_request(route, digest, upload, kwargs)
+
+    async def _stored_request(self, route: str, digest: str, upload: Upload, kwargs: dict):
+        if self.store is None:
+            return await self._send_image(route, upload, kwargs)
+
+        loop = asyncio.get_running_loop()
+
+        js = await loop.run_in_executor(None, self.store.get, route, digest)
+
+        if js is None:
+            js = await self._send_image(route, upload, kwargs)
+            await loop.run_in_executor(None, self.store.put, route, digest, js)
+
+        return js
+
+    async def _send_image(self, route: str, upload: Upload, kwargs: dict):
+        if self.preprocess is None:
+            return await self._request('POST', route, upload=upload, **kwargs)
+
+        # Decoding and encoding the image would block the loop.
+        image = await asyncio.get_running_loop().run_in_executor(None, self.preprocess.process, upload)
+
+        return image.restore(route, await self._request('POST', route, upload=image.upload, **kwargs))
+
+    async def _wait_task(self, result, *, timeout: typing.Optional[float] = None):
+        return await wait_task_async(self, result, timeout)
+
     async def _request(self, method: str, url: str, **kwargs) -> typing.Union[dict, aiohttp.ClientResponse]:
-        url = str(url)
+        url = route = str(url)
 
         headers = self._get_authorization_headers()
         if kwargs.get('headers') and isinstance(kwargs.get('headers'), dict):
-            kwargs['headers'].update(headers)
+            kwargs['headers'] = {**kwargs['headers'], **headers}
         else:
             kwargs['headers'] = headers
 
@@ -114,60 +433,238 @@ class AsyncClient:
         else:
             raise TypeError('URL is not a valid HTTP/HTTPs URL.')
 
+        kwargs['timeout'] = Timeout.coerce(kwargs.get('timeout')) or self.timeout
+        kwargs['deadline'] = Deadline.coerce(kwargs.get('deadline'))
+
+        cache = kwargs.pop('cache', False) and self.cache is not None and method == 'GET' and not raw
+        coalesce = kwargs.pop('coalesce', False) and self.coalesce and not raw
+
+        span = kwargs['span'] = self._start_span(method, route)
+
+        with span:
+            if raw:
+                return (await self._perform(method, url, route, return_on, kwargs))[0]
+            elif coalesce:
+                key = request_key(method, url, kwargs.get('params'))
+                return await self._inflight.do(key, lambda: self._fetch(method, url, route, return_on, kwargs, cache=cache))
+
+            return await self._fetch(method, url, route, return_on, kwargs, cache=cache)
+
+    def _start_span(self, method: str, route: str):
+        if self.tracer is None:
+            return _NOOP_SPAN
+
+        return self.tracer.start_span('openrobot.request', attributes={'http.method': method,
+                                                                       'openrobot.route': get_route(route)})
+
+    async def _fetch(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict, *, cache: bool):
+        if cache:
+            return await self._cached_request(method, url, route, return_on, kwargs)
+
+        return (await self._send(method, url, route, return_on, kwargs))[1]
+
+    async def _cached_request(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict):
+        key = self.cache.key(url, kwargs.get('params'))
+        entry, state = self.cache.lookup(key)
+
+        if state == 'fresh':
+            return entry.value
+        elif state == 'stale':
+            if self.cache.begin_revalidation(key):
+                # In the background, so without the caller's deadline, and
+                # outside of its span, which ends before this does.
+                self._spawn(self._revalidate_in_background(method, url, route, return_on,
+                                                           {**kwargs, 'deadline': None, 'span': _NOOP_SPAN}, key, entry))
+
+            return entry.value
+
+        return await self._revalidate(method, url, route, return_on, kwargs, key, entry)
+
+    async def _revalidate_in_background(self, method: str, url: str, route: str, return_on: typing.List[int],
+                                        kwargs: dict, key: typing.Hashable, entry: CacheEntry):
+        # Only the caller of begin_revalidation ends it, so that a call that
+        # revalidates in the foreground doesn't let another refresh start.
+        try:
+            await self._revalidate(method, url, route, return_on, kwargs, key, entry)
+        finally:
+            self.cache.end_revalidation(key)
+
+    async def _revalidate(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict,
+                          key: typing.Hashable, entry: typing.Optional[CacheEntry]):
+        if entry is not None:
+            kwargs = {**kwargs, 'headers': {**kwargs['headers'], **self.cache.conditional_headers(entry)}}
+
+        try:
+            resp, js = await self._send(method, url, route, [*return_on, 304], kwargs)
+        except (OpenRobotAPIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            response = getattr(e, 'response', None)
+            failed = isinstance(e, self._STALE_IF_ERROR) or (response is not None and response.status >= 500)
+
+            if failed and self.cache.usable_on_error(entry):
+                return entry.value
+
+            raise
+
+        if resp.status == 304 and entry is not None:
+            return self.cache.refresh(key, entry, resp.headers)
+        elif resp.status == 200:
+            return self.cache.store(key, js, resp.headers)
+
+        return js
+
+    async def _send(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict):
+        # Performs the request, hedging it if it is slow to answer.
+        hedge = self.hedge
+        if hedge is None or not hedge.applies(method, route):
+            return await self._perform(method, url, route, return_on, kwargs)
+
+        delay = hedge.hedge_delay(route)
+        started = time.monotonic()
+
+        if delay is None:
+            result = await self._perform(method, url, route, return_on, kwargs)
+            hedge.observe(route, time.monotonic() - started)
+            return result
+
+        primary = asyncio.ensure_future(self._perform(method, url, route, return_on, kwargs))
+        tasks = [primary]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not hedge.allow(route):
+                result = await primary
+                hedge.observe(route, time.monotonic() - started)
+                return result
+
+            tasks.append(asyncio.ensure_future(self._perform(method, url, route, return_on, kwargs)))
+            pending = set(tasks)
+            error = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        hedge.observe(route, time.monotonic() - started, hedge_won=task is not primary)
+                        return task.result()
+
+                    error = error or task.exception()
+
+            raise error
+        finally:
+            # The slower one, or both if this was cancelled.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _emit_end(self, method: str, route: str, sends: int, sent: float, resp: aiohttp.ClientResponse,
+                  upload: typing.Optional[Upload], received: int, timings: RequestTimings):
+        length = resp.request_info.headers.get('Content-Length')
+
+        self.metrics.emit(RequestEvent('request_end', method, route, sends, status=resp.status,
+                                       duration=time.monotonic() - sent,
+                                       bytes_sent=int(length) if length else upload.size if upload is not None else None,
+                                       bytes_received=received, timings=timings))
+
+    async def _perform(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict):
         tries = int(self.tries) if self.tries is not None else None
 
-        while tries is None or tries > 0:
-            if self.session:
-                async with self.session.request(method, url, **kwargs) as resp:
-                    js = await json_or_text(resp)
+        session = self._get_session()
+        upload = kwargs.get('upload')
 
-                    if not isinstance(js, dict):
-                        raise UnexpectedContentType(resp, js)
+        timeout = kwargs['timeout']
+        deadline = kwargs['deadline']
+        span = kwargs['span']
+        kwargs = {k: v for k, v in kwargs.items() if k not in ('deadline', 'span')}
+
+        breaker = self.breaker
+        policy = self.retry
+        metrics = self.metrics
+        exceptions = policy.exceptions if policy.exceptions is not None else self._RETRY_EXCEPTIONS
+        retrying = policy.applies(method)
+        attempt = 0
+        # The number of times the API ratelimited the request.
+        ratelimited = 0
+        sends = 0
+        started = time.monotonic()
+
+        if upload is not None and retrying:
+            upload.spool()
+
+        while tries is None or tries > 0:
+            if deadline is not None:
+                deadline.check()
+
+            probe = breaker.acquire(route) if breaker is not None else None
+            recorded = False
+            delay = None
+            # How long the API asked to wait, after a 429.
+            ratelimit_wait = None
+            # When this attempt was sent, until its response is read.
+            sent = None
+            timings = None
+            attempt_span = _NOOP_SPAN
+
+            try:
+                if self.ratelimiter is not None:
+                    with span.child('openrobot.ratelimit', {'openrobot.ratelimit.source': 'limiter'}) as wait_span:
+                        wait = await self.ratelimiter.acquire_async(route, deadline=deadline)
+                        wait_span.set_attribute('openrobot.ratelimit.wait', wait)
+
+                    if wait > 0:
+                        metrics.emit(RequestEvent('ratelimit_wait', method, route, sends + 1, duration=wait))
+
+                kwargs['timeout'] = timeout.aiohttp_timeout(deadline.remaining() if deadline is not None else None)
+
+                sends += 1
+                sent = time.monotonic()
+                metrics.emit(RequestEvent('request_start', method, route, sends))
+                attempt_span = span.child('openrobot.attempt', {'openrobot.attempt': sends})
+                timings = RequestTimings()
+
+                async with session.request(method, url, trace_request_ctx=timings,
+                                           **(upload.aiohttp_kwargs(kwargs, attempt_span) if upload is not None else kwargs)) as resp:
+                    timings.headers()
+
+                    with attempt_span:
+                        attempt_span.set_attribute('http.status_code', resp.status)
+
+                        if resp.status == 304 and 304 in return_on:
+                            if breaker is not None:
+                                breaker.record(route, True, probe)
+                            timings.finish()
+                            self._emit_end(method, route, sends, sent, resp, upload, 0, timings)
+                            return resp, None
+
+                        # aiohttp reads the body after returning the response.
+                        with attempt_span.child('openrobot.download'):
+                            body = await resp.read()
+
+                        timings.finish()
+
+                        with attempt_span.child('openrobot.decode', {'openrobot.response.size': len(body)}):
+                            js = await json_or_text(resp, loads=self.json_loads)
+
+                    if breaker is not None:
+                        breaker.record(route, not breaker.failed(resp.status), probe)
+                    recorded = True
+
+                    self._emit_end(method, route, sends, sent, resp, upload, len(body), timings)
+                    sent = None
+
+                    if retrying and resp.status in policy.statuses and resp.status not in return_on:
+                        delay = policy.next_delay(attempt, started, resp.status,
+                                                  parse_retry_after(resp.headers.get('Retry-After')),
+                                                  remaining=deadline.remaining() if deadline is not None else None)
+                        if delay is not None:
+                            metrics.emit(RequestEvent('retry', method, route, sends, status=resp.status, duration=delay))
+
+                    if delay is None:
+                        if not isinstance(js, dict):
+                            raise UnexpectedContentType(resp, js)
 
-                    if resp.status in return_on:
-                        if raw:
-                            return resp
-                        else:
-                            return js
-                    elif resp.status == 403:
-                        raise Forbidden(resp, js)
-                    elif resp.status == 400:
-                        raise BadRequest(resp, js)
-                    elif resp.status == 500:
-                        raise InternalServerError(resp, js)
-                    elif resp.status == 429:
-                        if not self.handle_ratelimit:
-                            raise TooManyRequests(resp, js)
-
-                        try:
-                            await asyncio.sleep(int(resp.headers['Retry-After']))
-                        except KeyError as e:
-                            raise KeyError(
-                                'Retry-After header is not present.') from e  # this probably won't trigger, but
-                            # either way we still need to handle it, right?
-
-                        if tries:
-                            tries -= 1
-                    elif 200 <= resp.status < 300:
-                        if raw:
-                            return resp
-                        else:
-                            return js
-                    else:
-                        cls = OpenRobotAPIError(js)
-                        cls.raw = js
-                        cls.response = resp
-
-                        raise cls
-            else:
-                async with aiohttp.ClientSession(loop=self.loop) as sess:
-                    async with sess.request(method, url, **kwargs) as resp:
-                        js = await resp.json()
                         if resp.status in return_on:
-                            if raw:
-                                return resp
-                            else:
-                                return js
+                            return resp, js
                         elif resp.status == 403:
                             raise Forbidden(resp, js)
                         elif resp.status == 400:
@@ -178,31 +675,94 @@ class AsyncClient:
                             if not self.handle_ratelimit:
                                 raise TooManyRequests(resp, js)
 
-                            try:
-                                await asyncio.sleep(resp.headers['Retry-After'])
-                            except KeyError as e:
-                                raise KeyError('Retry-After header is not present.') from e
+                            retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+                            if retry_after is None:
+                                # Without a (readable) Retry-After, back off like the retries do.
+                                retry_after = policy.delay(ratelimited)
+
+                            ratelimited += 1
+
+                            if deadline is not None:
+                                # Give up now if we can't wait that long anyway.
+                                deadline.check(retry_after, cause=TooManyRequests(resp, js))
+
+                            if self.ratelimiter is not None:
+                                # Hold back everyone else sharing the limiter too.
+                                self.ratelimiter.penalize(route, retry_after)
+
+                            policy.count(429)
+                            metrics.emit(RequestEvent('ratelimit_wait', method, route, sends, status=429,
+                                                      duration=retry_after))
+                            ratelimit_wait = retry_after
 
                             if tries:
                                 tries -= 1
                         elif 200 <= resp.status < 300:
-                            if raw:
-                                return resp
-                            else:
-                                return js
+                            return resp, js
                         else:
                             cls = OpenRobotAPIError(js)
                             cls.raw = js
                             cls.response = resp
 
                             raise cls
+            except exceptions as e:
+                if breaker is not None and not recorded:
+                    breaker.record(route, False, probe)
+
+                attempt_span.record_exception(e)
+                attempt_span.end()
+
+                if sent is not None:
+                    timings.finish()
+                    metrics.emit(RequestEvent('error', method, route, sends, duration=time.monotonic() - sent,
+                                              bytes_sent=upload.size if upload is not None else None, error=e,
+                                              timings=timings))
+
+                delay = policy.next_delay(attempt, started, e,
+                                          remaining=deadline.remaining() if deadline is not None else None) if retrying else None
+                if delay is None:
+                    if deadline is not None:
+                        # The deadline is likely why it timed out.
+                        deadline.check(cause=e)
+
+                    raise
+
+                metrics.emit(RequestEvent('retry', method, route, sends, duration=delay, error=e))
+            except BaseException as e:
+                if breaker is not None and not recorded:
+                    breaker.record(route, None, probe)
+
+                attempt_span.record_exception(e)
+                attempt_span.end()
+
+                if sent is not None:
+                    # Including a hedge or a call that was cancelled.
+                    timings.finish()
+                    metrics.emit(RequestEvent('error', method, route, sends, duration=time.monotonic() - sent,
+                                              bytes_sent=upload.size if upload is not None else None, error=e,
+                                              timings=timings))
+
+                raise
+
+            if delay is not None:
+                # Outside of the response, so that its connection is released
+                # while waiting.
+                attempt += 1
+                with span.child('openrobot.backoff', {'openrobot.retry.delay': delay}):
+                    await asyncio.sleep(delay)
+            elif ratelimit_wait is not None:
+                # Outside of the response too.
+                with span.child('openrobot.ratelimit', {'openrobot.ratelimit.source': 'api',
+                                                        'openrobot.ratelimit.wait': ratelimit_wait}):
+                    await asyncio.sleep(ratelimit_wait)
 
         raise TooManyRequests(resp, js)
 
     # Methods to query to API:
 
     async def text_generation(self, text: str, *, max_length: typing.Optional[int] = None,
-                              num_return: typing.Optional[int] = 1) -> TextGenerationResult:
+                              num_return: typing.Optional[int] = 1, wait: bool = False,
+                              timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> TextGenerationResult:
         """|coro|
 
         Text Generation/Completion. This uses the /api/text-generation endpoint.
@@ -215,6 +775,16 @@ class AsyncClient:
             The maximum length of the generated text. Defaults to ``None``.
         num_return: Optional[:class:`int`]
             The number of generated texts to return. Defaults to 1.
+        wait: Optional[:class:`bool`]
+            Whether to wait for the task to finish before returning. See
+            :meth:`OpenRobotAPITaskResult.wait`. Defaults to ``False``.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -224,6 +794,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -231,11 +803,20 @@ class AsyncClient:
             The text generation result returned by the API.
         """
 
+        deadline = Deadline.coerce(deadline)
+
         js = await self._request('POST', '/api/text-generation',
-                                 data={'text': text, 'max_length': max_length, 'num_return': num_return})
-        return TextGenerationResult(js)
+                                 data={'text': text, 'max_length': max_length, 'num_return': num_return},
+                                 timeout=timeout, deadline=deadline)
+        result = TextGenerationResult(js, client=self, keep_raw=self.keep_raw)
+
+        if wait:
+            result = await result.wait(deadline.remaining() if deadline is not None else None)
 
-    async def text_generation_get(self, task_id: str) -> TextGenerationResult:
+        return result
+
+    async def text_generation_get(self, task_id: str, *,
+                                  timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> TextGenerationResult:
         """|coro|
 
         Gets the status of a text generation task. This uses the /api/text-generation/{task_id} endpoint.
@@ -244,6 +825,13 @@ class AsyncClient:
         ----------
         task_id: :class:`str`
             The task ID of the text generation task.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -253,6 +841,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -260,10 +850,11 @@ class AsyncClient:
             The text generation result returned by the API.
         """
 
-        js = await self._request('GET', f'/api/text-generation/{quote(task_id)}')
-        return TextGenerationResult(js)
+        js = await self._request('GET', f'/api/text-generation/{quote(task_id)}', timeout=timeout, deadline=deadline)
+        return TextGenerationResult(js, client=self, keep_raw=self.keep_raw)
 
-    async def sentiment(self, text: str) -> SentimentResult:
+    async def sentiment(self, text: str, *, wait: bool = False,
+                        timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SentimentResult:
         """|coro|
 
         Performs a Sentiment check on a text.
@@ -272,6 +863,16 @@ class AsyncClient:
         ----------
         text: :class:`str`
             The text to be checked.
+        wait: Optional[:class:`bool`]
+            Whether to wait for the task to finish before returning. See
+            :meth:`OpenRobotAPITaskResult.wait`. Defaults to ``False``.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -281,6 +882,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -288,10 +891,18 @@ class AsyncClient:
             The sentiment result returned by the API.
         """
 
-        js = await self._request('POST', '/api/sentiment', data={'text': text})
-        return SentimentResult(js)
+        deadline = Deadline.coerce(deadline)
+
+        js = await self._request('POST', '/api/sentiment', data={'text': text}, timeout=timeout, deadline=deadline)
+        result = SentimentResult(js, client=self, keep_raw=self.keep_raw)
 
-    async def sentiment_get(self, task_id: str) -> SentimentResult:
+        if wait:
+            result = await result.wait(deadline.remaining() if deadline is not None else None)
+
+        return result
+
+    async def sentiment_get(self, task_id: str, *,
+                            timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SentimentResult:
         """|coro|
 
         Gets the status of a sentiment task. This uses the /api/sentiment/{task_id} endpoint.
@@ -300,6 +911,13 @@ class AsyncClient:
         ----------
         task_id: :class:`str`
             The task ID of the sentiment task.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -309,6 +927,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -316,11 +936,12 @@ class AsyncClient:
             The sentiment result returned by the API.
         """
 
-        js = await self._request('GET', f'/api/sentiment/{quote(task_id)}')
-        return SentimentResult(js)
+        js = await self._request('GET', f'/api/sentiment/{quote(task_id)}', timeout=timeout, deadline=deadline)
+        return SentimentResult(js, client=self, keep_raw=self.keep_raw)
 
     async def summarization(self, text: str, *, max_length: typing.Optional[int] = None,
-                            min_length: typing.Optional[int] = 1) -> SummarizationResult:
+                            min_length: typing.Optional[int] = 1, wait: bool = False,
+                            timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SummarizationResult:
         """|coro|
 
         Summarizes a text. This uses the /api/summarization endpoint.
@@ -333,6 +954,16 @@ class AsyncClient:
             The maximum length of the summary. Defaults to ``None``.
         min_length: Optional[:class:`int`]
             The minimum length of the summary. Defaults to ``None``.
+        wait: Optional[:class:`bool`]
+            Whether to wait for the task to finish before returning. See
+            :meth:`OpenRobotAPITaskResult.wait`. Defaults to ``False``.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -342,6 +973,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -349,11 +982,20 @@ class AsyncClient:
             The summarization result returned by the API.
         """
 
+        deadline = Deadline.coerce(deadline)
+
         js = await self._request('POST', '/api/summarization',
-                                 data={'text': text, 'max_length': max_length, 'min_length': min_length})
-        return SummarizationResult(js)
+                                 data={'text': text, 'max_length': max_length, 'min_length': min_length},
+                                 timeout=timeout, deadline=deadline)
+        result = SummarizationResult(js, client=self, keep_raw=self.keep_raw)
+
+        if wait:
+            result = await result.wait(deadline.remaining() if deadline is not None else None)
 
-    async def summarization_get(self, task_id: str) -> SummarizationResult:
+        return result
+
+    async def summarization_get(self, task_id: str, *,
+                                timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SummarizationResult:
         """|coro|
 
         Gets the status of a summarization task. This uses the /api/summarization/{task_id} endpoint.
@@ -362,6 +1004,13 @@ class AsyncClient:
         ----------
         task_id: :class:`str`
             The task ID of the summarization task.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -371,6 +1020,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -378,10 +1029,11 @@ class AsyncClient:
             The summarization result returned by the API.
         """
 
-        js = await self._request('GET', f'/api/summarization/{quote(task_id)}')
-        return SummarizationResult(js)
+        js = await self._request('GET', f'/api/summarization/{quote(task_id)}', timeout=timeout, deadline=deadline)
+        return SummarizationResult(js, client=self, keep_raw=self.keep_raw)
 
-    async def lyrics(self, query: str) -> LyricResult:
+    async def lyrics(self, query: str, *,
+                     timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> LyricResult:
         """|coro|
         
         Gets the lyrics from the API.
@@ -390,6 +1042,13 @@ class AsyncClient:
         ----------
         query: :class:`str`
             Searches for the lyrics from the query.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -399,6 +1058,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -406,18 +1067,27 @@ class AsyncClient:
             The Lyrics Result returned by the API.
         """
 
-        js = await self._request('GET', f'/api/lyrics/{quote(query)}', return_on=[404, 200])
-        return LyricResult(js)
+        js = await self._request('GET', f'/api/lyrics/{quote(query)}', return_on=[404, 200], cache=True, coalesce=True,
+                                 timeout=timeout, deadline=deadline)
+        return LyricResult(js, keep_raw=self.keep_raw)
 
-    async def nsfw_check(self, source: typing.Union[bytes, io.BytesIO]) -> NSFWCheckResult:
+    async def nsfw_check(self, source: UploadSource, *,
+                         timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> NSFWCheckResult:
         """|coro|
         
         Queries an NSFW Check to the API.
 
         Parameters
         ----------
-        source: Union[:class:`bytes`, :class:`io.BytesIO`]
+        source: Union[:class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, :class:`memoryview`]
             The image to be checked.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -427,6 +1097,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -434,27 +1106,26 @@ class AsyncClient:
             The NSFW Check Result returned by the API.
         """
 
-        if isinstance(source, bytes):
-            source = io.BytesIO(source)
-
-        if not isinstance(source, io.BytesIO):
-            raise TypeError('source must be a bytes or BytesIO.')
-
-        data = aiohttp.FormData()
-        data.add_field('file', source)
-
-        js = await self._request('POST', '/api/nsfw-check', data=data)
-        return NSFWCheckResult(js)
+        js = await self._upload('/api/nsfw-check', Upload(source), timeout=timeout, deadline=deadline)
+        return NSFWCheckResult(js, keep_raw=self.keep_raw)
 
-    async def description(self, source: typing.Union[bytes, io.BytesIO]) -> DescriptionResult:
+    async def description(self, source: UploadSource, *,
+                          timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> DescriptionResult:
         """|coro|
 
         Gets the description from the API.
 
         Parameters
         ----------
-        source: Union[:class:`bytes`, :class:`io.BytesIO`]
+        source: Union[:class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, :class:`memoryview`]
             The image to be checked.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -464,6 +1135,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -471,28 +1144,27 @@ class AsyncClient:
             The description result returned by the API.
         """
 
-        if isinstance(source, bytes):
-            source = io.BytesIO(source)
+        js = await self._upload('/api/description', Upload(source), timeout=timeout, deadline=deadline)
 
-        if not isinstance(source, io.BytesIO):
-            raise TypeError('source must be a bytes or BytesIO.')
+        return DescriptionResult(js, keep_raw=self.keep_raw)
 
-        data = aiohttp.FormData()
-        data.add_field('file', source)
-
-        js = await self._request('POST', '/api/description', data=data)
-
-        return DescriptionResult(js)
-
-    async def celebrity(self, source: typing.Union[bytes, io.BytesIO]) -> typing.List[CelebrityResult]:
+    async def celebrity(self, source: UploadSource, *,
+                        timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.List[CelebrityResult]:
         """|coro|
         
         Detects the celebrities in the image.
 
         Parameters
         ----------
-        source: Union[:class:`bytes`, :class:`io.BytesIO`]
+        source: Union[:class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, :class:`memoryview`]
             The source of the image.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -502,6 +1174,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -509,27 +1183,26 @@ class AsyncClient:
             The celebrities detected.
         """
 
-        if isinstance(source, bytes):
-            source = io.BytesIO(source)
-
-        if not isinstance(source, io.BytesIO):
-            raise TypeError('source must be a bytes or BytesIO.')
+        js = await self._upload('/api/celebrity', Upload(source), timeout=timeout, deadline=deadline)
+        return [CelebrityResult(data, keep_raw=self.keep_raw) for data in js['celebrities']]
 
-        data = aiohttp.FormData()
-        data.add_field('file', source)
-
-        js = await self._request('POST', '/api/celebrity', data=data)
-        return [CelebrityResult(data) for data in js['celebrities']]
-
-    async def ocr(self, source: typing.Union[bytes, io.BytesIO]) -> OCRResult:
+    async def ocr(self, source: UploadSource, *,
+                  timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> OCRResult:
         """|coro|
         
         Reads text from an image.
 
         Parameters
         ----------
-        source: Union[:class:`bytes`, :class:`io.BytesIO`]
+        source: Union[:class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, :class:`memoryview`]
             The URL/Bytes of the image.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -539,6 +1212,8 @@ class AsyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -546,24 +1221,65 @@ class AsyncClient:
             The OCR/Text found.
         """
 
-        if isinstance(source, bytes):
-            source = io.BytesIO(source)
-
-        if not isinstance(source, io.BytesIO):
-            raise TypeError('source must be a bytes or BytesIO.')
-
-        data = aiohttp.FormData()
-        data.add_field('file', source)
+        js = await self._upload('/api/ocr', Upload(source), timeout=timeout, deadline=deadline)
 
-        js = await self._request('POST', '/api/ocr', data=data)
-
-        return OCRResult(js)
+        return OCRResult(js, keep_raw=self.keep_raw)
 
     @property
     def translate(self) -> Translate:
         """:class:`Translate`: The Translate client."""
         return Translate(self, True)
 
+    # Batch methods:
+
+    def map(self, method: typing.Union[str, typing.Callable[..., typing.Awaitable]],
+            inputs: typing.Union[typing.Iterable, typing.AsyncIterable], *, concurrency: int = 10, ordered: bool = True,
+            timeout: typing.Optional[float] = None, dedupe: typing.Optional[bool] = None) -> typing.AsyncIterator[BatchItem]:
+        """Runs a method over many inputs, with a bounded number of requests in flight.
+
+        The inputs are only pulled from ``inputs`` when a slot is free, so
+        this can be used with huge or endless (async) iterables.
+
+        Parameters
+        ----------
+        method: Union[:class:`str`, Callable[..., Awaitable]]
+            The method to call, such as ``'ocr'`` or ``client.ocr``.
+        inputs: Union[Iterable, AsyncIterable]
+            The inputs. Each input is passed as the only argument, unless
+            it is a :class:`tuple`, in which case it is unpacked.
+        concurrency: Optional[:class:`int`]
+            The maximum number of requests in flight. Defaults to ``10``.
+        ordered: Optional[:class:`bool`]
+            Whether to yield the results in the order of the inputs. If
+            this is ``False``, they are yielded as they complete. Defaults
+            to ``True``.
+        timeout: Optional[:class:`float`]
+            The number of seconds the whole batch may take. When it runs
+            out, the requests still in flight are cancelled and yielded
+            with an :exc:`asyncio.TimeoutError`, and the rest of the inputs
+            are not started. Defaults to ``None``.
+        dedupe: Optional[:class:`bool`]
+            Whether an input that is the same as a recent one (compared
+            by value, or by hash for :class:`bytes`) reuses its result
+            instead of being sent again. Defaults to ``coalesce``.
+
+        Returns
+        -------
+        AsyncIterator[:class:`BatchItem`]
+            The results. Errors are captured in :attr:`BatchItem.error`
+            instead of aborting the batch.
+        """
+
+        func = getattr(self, method) if isinstance(method, str) else method
+
+        return async_map(func, inputs, concurrency=concurrency, ordered=ordered, timeout=timeout,
+                         dedupe=self.coalesce if dedupe is None else dedupe)
+
+    @property
+    def batch(self) -> Batch:
+        """:class:`Batch`: Batch helpers for each endpoint."""
+        return Batch(self)
+
     # @property
     # def speech(self) -> Speech:
     #     """:class:`Speech`: The Speech client."""
@@ -4,10 +4,30 @@ import warnings
 import io
 import typing
 import time
+import threading
+import concurrent.futures
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from .error import *
 from .results import *
 from .translate import Translate
 from .speech import Speech
+from .ratelimit import RateLimiter
+from .cache import CacheEntry, ResponseCache
+from .store import ResultStore
+from .tasks import CompletionEstimator, PollBackoff, TaskPoller, wait_task
+from .batch import Batch, BatchItem, sync_map
+from .coalesce import SingleFlight, request_key
+from .upload import Upload, UploadSource
+from .preprocess import ImagePreprocessor
+from .retry import RetryPolicy
+from .breaker import CircuitBreaker
+from .hedge import HedgePolicy
+from .metrics import Metrics, RequestEvent
+from .tracing import Tracer, _NOOP_SPAN
+from .timing import RequestTimings
+from .timeout import Deadline, Timeout
 from .utils import *
 
 try:
@@ -19,6 +39,63 @@ except:
         quote = lambda s: s
         warnings.warn('urllib.parse.quote_plus and urllib.parse.quote cannot be found. Things might not be parsed well.')
 
+# The RequestTimings of the request being sent by each thread, for the
+# connections it opens.
+_timed = threading.local()
+
+
+class _TimedConnectionMixin:
+    # Times the DNS resolution and TCP connection.
+    def _new_conn(self):
+        timings = getattr(_timed, 'timings', None)
+        if timings is None:
+            return super()._new_conn()
+
+        timings.start('connect')
+        try:
+            return super()._new_conn()
+        finally:
+            timings.stop('connect')
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    # connect() is _new_conn() followed by the TLS handshake.
+    def connect(self):
+        timings = getattr(_timed, 'timings', None)
+        if timings is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        connect = timings.connect or 0.0
+
+        try:
+            super().connect()
+        finally:
+            timings.tls = max(0.0, time.perf_counter() - started - ((timings.connect or 0.0) - connect))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    # An HTTPAdapter whose connections measure the connect and TLS phases
+    # of a RequestTimings.
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool,
+                                                   'https': _TimedHTTPSConnectionPool}
+
+
 class SyncClient:
     """Sync Client for OpenRobot API.
 
@@ -38,14 +115,110 @@ class SyncClient:
         handle 429s. This does not affect anything if ``handle_ratelimit``
         is ``False``. If this is ``None``, it will go infinitely, and you
         might get Temp-Banned by Cloudflare. Defaults to ``5``.
+    session: Optional[:class:`requests.Session`]
+        The session to be used. If this is ``None``, the client will
+        create and own a pooled session on the first request. Defaults
+        to ``None``.
+    pool_connections: Optional[:class:`int`]
+        The number of connection pools (one per host) to cache. Defaults
+        to ``10``.
+    pool_maxsize: Optional[:class:`int`]
+        The maximum number of connections to keep alive per host. This
+        should be at least the number of threads sharing the client.
+        Defaults to ``10``.
+    pool_block: Optional[:class:`bool`]
+        Whether to block when no free connection is available instead
+        of opening a throw-away one. Defaults to ``False``.
+    keep_alive: Optional[:class:`bool`]
+        Whether to keep connections alive between requests. Defaults
+        to ``True``.
+    ratelimiter: Optional[:class:`RateLimiter`]
+        The rate limiter used to pace the requests before they are sent.
+        Defaults to ``None``.
+    max_workers: Optional[:class:`int`]
+        The number of threads used by :meth:`map`. The threads share the
+        client's connection pool. Defaults to ``pool_maxsize``.
+    poll_backoff: Optional[:class:`PollBackoff`]
+        How to poll tasks that are being waited for. Defaults to
+        :class:`PollBackoff` with its default values.
+    cache: Optional[:class:`ResponseCache`]
+        The cache used for the idempotent lookups: :meth:`lyrics`,
+        :class:`Translate` and the :class:`Speech` supports. Defaults to
+        ``None``.
+    store: Optional[:class:`ResultStore`]
+        The persistent store checked before uploading an image to the
+        image endpoints. Defaults to ``None``.
+    coalesce: Optional[:class:`bool`]
+        Whether identical lookups and image uploads made at the same time
+        share a single request, and whether :meth:`map` collapses
+        duplicate inputs. Defaults to ``False``.
+    preprocess: Optional[:class:`ImagePreprocessor`]
+        Checks and downscales the images before they are uploaded to the
+        image endpoints. Defaults to ``None``.
+    keep_raw: Optional[:class:`bool`]
+        Whether the results keep the raw data given by the API in their
+        ``raw`` attribute. Not keeping it more than halves the memory
+        used by each result, but their nested objects are built right
+        away instead of lazily. Defaults to ``True``.
+    json_loads: Optional[Callable[[:class:`bytes`], Any]]
+        The function used to decode the JSON responses, straight from
+        their bytes. Defaults to ``orjson.loads`` if orjson is installed
+        (e.g with the ``orjson`` extra), else :func:`json.loads`. Large
+        responses are only decoded faster with orjson.
+    retry: Optional[:class:`RetryPolicy`]
+        Which failed requests to retry, and how. Defaults to
+        :class:`RetryPolicy` with its default values, which retries the
+        5xx statuses, connection errors and timeouts of the idempotent
+        requests up to 3 times. The ``POST`` requests, such as the
+        uploads, are not retried.
+    timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+        How long each attempt of a request can take. A number is a total
+        timeout in seconds. Every method also takes a ``timeout``, which
+        overrides this one. Defaults to a total of 300 seconds, with 10
+        seconds to connect and 60 seconds between reads.
+    breaker: Optional[:class:`CircuitBreaker`]
+        The circuit breakers that stop sending requests to the routes that
+        keep failing, e.g ``CircuitBreaker()``. Defaults to ``None``.
+    hedge: Optional[:class:`HedgePolicy`]
+        Hedges the ``GET`` lookups that are slow to answer, by sending them
+        a second time. Defaults to ``None``.
+    metrics: Optional[:class:`Metrics`]
+        Counts the requests, and calls the hooks added to it. Passing the
+        same one to several clients counts them together. Defaults to a
+        new :class:`Metrics`.
+    tracer: Optional[:class:`Tracer`]
+        Traces every call, and the steps it took, as :class:`Span`\\s.
+        Defaults to ``None``.
 
     Attributes
     ----------
     token: :class:`str`
         The token used to authorize to the API.
+    session: Optional[:class:`requests.Session`]
+        The session used. ``None`` until the first request if not specified.
+    poller: :class:`TaskPoller`
+        The poller that tracks every task being waited for.
+    metrics: :class:`Metrics`
+        The counters of the requests, and their hooks.
     """
 
-    def __init__(self, token: str = 'I-Am-Testing', *, ignore_warning = False, handle_ratelimit: bool = True, tries: int = 5):
+    # Retried when the RetryPolicy does not say otherwise.
+    _RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+    # The errors a stale cached response is served instead of, with the
+    # 5xx statuses: the API failed or couldn't be reached, as opposed to
+    # refusing the request.
+    _STALE_IF_ERROR = (UnexpectedContentType, DeadlineExceeded, CircuitOpen, requests.RequestException)
+
+    def __init__(self, token: str = 'I-Am-Testing', *, ignore_warning = False, handle_ratelimit: bool = True, tries: int = 5,
+                 session: requests.Session = None, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                 keep_alive: bool = True, ratelimiter: RateLimiter = None,
+                 max_workers: typing.Optional[int] = None, poll_backoff: PollBackoff = None,
+                 cache: ResponseCache = None, store: ResultStore = None, coalesce: bool = False,
+                 preprocess: ImagePreprocessor = None, keep_raw: bool = True,
+                 json_loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = None,
+                 retry: RetryPolicy = None, timeout: typing.Union[float, Timeout, None] = None,
+                 breaker: CircuitBreaker = None, hedge: HedgePolicy = None,
+                 metrics: Metrics = None, tracer: Tracer = None):
         token = token or get_token_from_file()
         
         if not token:
@@ -59,8 +232,135 @@ class SyncClient:
 
         self.tries: int = tries
 
+        self.session: typing.Optional[requests.Session] = session if isinstance(session, requests.Session) else None
+        self._owns_session: bool = self.session is None
+
+        self.pool_connections: int = pool_connections
+        self.pool_maxsize: int = pool_maxsize
+        self.pool_block: bool = pool_block
+        self.keep_alive: bool = keep_alive
+
+        self.ratelimiter: typing.Optional[RateLimiter] = ratelimiter
+
+        self.poll_backoff: PollBackoff = poll_backoff or PollBackoff()
+        self.task_estimator: CompletionEstimator = CompletionEstimator()
+        self.poller: TaskPoller = TaskPoller(self)
+
+        self.cache: typing.Optional[ResponseCache] = cache
+        self.store: typing.Optional[ResultStore] = store
+
+        self.coalesce: bool = coalesce
+        self.preprocess: typing.Optional[ImagePreprocessor] = preprocess
+        self.keep_raw: bool = keep_raw
+        self.json_loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = json_loads
+        self.retry: RetryPolicy = retry or RetryPolicy()
+        self.timeout: Timeout = Timeout.coerce(timeout) or Timeout(300, connect=10, read=60)
+        self.breaker: typing.Optional[CircuitBreaker] = breaker
+        self.hedge: typing.Optional[HedgePolicy] = hedge
+        self.metrics: Metrics = metrics or Metrics()
+        self.tracer: typing.Optional[Tracer] = tracer
+        self._inflight: SingleFlight = SingleFlight()
+
+        self._session_lock: threading.Lock = threading.Lock()
+
+        self.max_workers: int = max_workers or pool_maxsize
+        self._executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._hedge_executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes the session and all of its pooled connections, and
+        shuts down the threads used by :meth:`map` and :attr:`poller`.
+
+        This does nothing to a session that was passed to the client.
+        """
+
+        self.poller.close()
+
+        with self._session_lock:
+            executors = [self._executor, self._hedge_executor]
+            self._executor = self._hedge_executor = None
+
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        with self._session_lock:
+            if self.session is not None and self._owns_session:
+                self.session.close()
+                self.session = None
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Returns the statistics of the client.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            The stats of the ``requests`` to each route (see
+            :meth:`Metrics.stats`), of the connection ``pool`` once the
+            session is made, of the ``retry`` policy, and of the ``breaker``
+            of each route, ``ratelimiter``, ``cache``, ``preprocess`` and
+            ``hedge`` if they are set, and the number of calls that were
+            ``coalesced`` into another one.
+
+        Example
+        -------
+        .. code-block:: python3
+
+            latency = client.stats()['requests']['routes']['/api/ocr']['latency']
+            print(f"OCR p99: {latency['p99']:.3f}s")
+        """
+
+        return {
+            'requests': self.metrics.stats(),
+            'pool': self._pool_stats(),
+            'retry': self.retry.stats(),
+            'breaker': self.breaker.stats() if self.breaker is not None else None,
+            'ratelimiter': self.ratelimiter.stats() if self.ratelimiter is not None else None,
+            'cache': self.cache.stats() if self.cache is not None else None,
+            'preprocess': self.preprocess.stats() if self.preprocess is not None else None,
+            'hedge': self.hedge.stats() if self.hedge is not None else None,
+            'coalesced': self._inflight.shared,
+        }
+
     # Important and internal methods, but should be used un-regularly by the User itself.
 
+    def _pool_stats(self) -> typing.Optional[typing.Dict[str, int]]:
+        # The connections of the pools of urllib3, which keeps up to
+        # pool_maxsize of them per host, idle or in use.
+        session = self.session
+        if session is None:
+            return None
+
+        stats = {'hosts': 0, 'in_use': 0, 'idle': 0, 'limit': 0}
+
+        for adapter in set(session.adapters.values()):
+            pools = getattr(getattr(adapter, 'poolmanager', None), 'pools', None)
+            if pools is None:
+                continue
+
+            for key in pools.keys():
+                pool = pools.get(key)
+                queue = getattr(pool, 'pool', None)
+                if queue is None:
+                    continue
+
+                # The queue is filled with None in place of the connections
+                # that were not made yet.
+                idle = sum(1 for conn in list(queue.queue) if conn is not None)
+
+                stats['hosts'] += 1
+                stats['idle'] += idle
+                stats['in_use'] += max(0, queue.maxsize - queue.qsize())
+                stats['limit'] += queue.maxsize
+
+        return stats
+
     def _get_authorization_headers(self, token: str = None, *, header = True):
         token = str(token or self.token)
         if header is False:
@@ -68,13 +368,83 @@ class SyncClient:
         else:
             return {'Authorization': token}
 
+    def _get_session(self) -> requests.Session:
+        session = self.session
+        if session is not None:
+            return session
+
+        with self._session_lock:
+            if self.session is None:
+                session = requests.Session()
+
+                adapter = _TimedHTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                                            pool_block=self.pool_block)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+
+                session.headers['Connection'] = 'keep-alive' if self.keep_alive else 'close'
+
+                self.session = session
+                self._owns_session = True
+
+            return self.session
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._session_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers,
+                                                                       thread_name_prefix='openrobot-api')
+
+            return self._executor
+
+    def _get_hedge_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        # Separate from the one of map(), whose threads wait for these. A
+        # hedged request uses up to two threads.
+        with self._session_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(self.max_workers * 2,
+                                                                             thread_name_prefix='openrobot-api-hedge')
+
+            return self._hedge_executor
+
+    def _upload(self, route: str, upload: Upload, **kwargs):
+        digest = upload.digest() if self.store is not None or self.coalesce else None
+
+        if digest is None:
+            return self._send_image(route, upload, kwargs)
+        elif self.coalesce:
+            return self._inflight.do((route, digest), lambda: self._stored_request(route, digest, upload, kwargs))
+
+        return self._stored_request(route, digest, upload, kwargs)
+
+    def _stored_request(self, route: str, digest: str, upload: Upload, kwargs: dict):
+        js = self.store.get(route, digest) if self.store is not None else None
+
+        if js is None:
+            js = self._send_image(route, upload, kwargs)
+
+            if self.store is not None:
+                self.store.put(route, digest, js)
+
+        return js
+
+    def _send_image(self, route: str, upload: Upload, kwargs: dict):
+        if self.preprocess is None:
+            return self._request('POST', route, upload=upload, **kwargs)
+
+        image = self.preprocess.process(upload)
+
+        return image.restore(route, self._request('POST', route, upload=image.upload, **kwargs))
+
+    def _wait_task(self, result, *, timeout: typing.Optional[float] = None):
+        return wait_task(self, result, timeout)
+
     def _request(self, method: str, url: str, **kwargs):
-        url = str(url)
+        url = route = str(url)
 
         headers = self._get_authorization_headers()
         if kwargs.get('headers') and isinstance(kwargs.get('headers'), dict):
-            hdr = kwargs.pop('headers')
-            kwargs['headers'].update(headers)
+            kwargs['headers'] = {**kwargs['headers'], **headers}
         else:
             kwargs['headers'] = headers
 
@@ -93,57 +463,310 @@ class SyncClient:
         else:
             raise TypeError('URL is not a valid HTTP/HTTPs URL.')
 
+        kwargs['timeout'] = Timeout.coerce(kwargs.get('timeout')) or self.timeout
+        kwargs['deadline'] = Deadline.coerce(kwargs.get('deadline'))
+
+        cache = kwargs.pop('cache', False) and self.cache is not None and method == 'GET' and not raw
+        coalesce = kwargs.pop('coalesce', False) and self.coalesce and not raw
+
+        span = kwargs['span'] = self._start_span(method, route)
+
+        with span:
+            if raw:
+                return self._perform(method, url, route, return_on, kwargs)[0]
+            elif coalesce:
+                key = request_key(method, url, kwargs.get('params'))
+                return self._inflight.do(key, lambda: self._fetch(method, url, route, return_on, kwargs, cache=cache))
+
+            return self._fetch(method, url, route, return_on, kwargs, cache=cache)
+
+    def _start_span(self, method: str, route: str):
+        if self.tracer is None:
+            return _NOOP_SPAN
+
+        return self.tracer.start_span('openrobot.request', attributes={'http.method': method,
+                                                                       'openrobot.route': get_route(route)})
+
+    def _fetch(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict, *, cache: bool):
+        if cache:
+            return self._cached_request(method, url, route, return_on, kwargs)
+
+        return self._send(method, url, route, return_on, kwargs)[1]
+
+    def _cached_request(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict):
+        key = self.cache.key(url, kwargs.get('params'))
+        entry, state = self.cache.lookup(key)
+
+        if state == 'fresh':
+            return entry.value
+        elif state == 'stale':
+            if self.cache.begin_revalidation(key):
+                # In the background, so without the caller's deadline, and
+                # outside of its span, which ends before this does.
+                self._get_executor().submit(self._revalidate_in_background, method, url, route, return_on,
+                                            {**kwargs, 'deadline': None, 'span': _NOOP_SPAN}, key, entry)
+
+            return entry.value
+
+        return self._revalidate(method, url, route, return_on, kwargs, key, entry)
+
+    def _revalidate_in_background(self, method: str, url: str, route: str, return_on: typing.List[int],
+                                  kwargs: dict, key: typing.Hashable, entry: CacheEntry):
+        # Only the caller of begin_revalidation ends it, so that a call that
+        # revalidates in the foreground doesn't let another refresh start.
+        try:
+            self._revalidate(method, url, route, return_on, kwargs, key, entry)
+        finally:
+            self.cache.end_revalidation(key)
+
+    def _revalidate(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict,
+                    key: typing.Hashable, entry: typing.Optional[CacheEntry]):
+        if entry is not None:
+            kwargs = {**kwargs, 'headers': {**kwargs['headers'], **self.cache.conditional_headers(entry)}}
+
+        try:
+            r, js = self._send(method, url, route, [*return_on, 304], kwargs)
+        except (OpenRobotAPIError, requests.RequestException) as e:
+            response = getattr(e, 'response', None)
+            failed = isinstance(e, self._STALE_IF_ERROR) or (response is not None and response.status_code >= 500)
+
+            if failed and self.cache.usable_on_error(entry):
+                return entry.value
+
+            raise
+
+        if r.status_code == 304 and entry is not None:
+            return self.cache.refresh(key, entry, r.headers)
+        elif r.status_code == 200:
+            return self.cache.store(key, js, r.headers)
+
+        return js
+
+    def _send(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict):
+        # Performs the request, hedging it if it is slow to answer.
+        hedge = self.hedge
+        if hedge is None or not hedge.applies(method, route):
+            return self._perform(method, url, route, return_on, kwargs)
+
+        delay = hedge.hedge_delay(route)
+        started = time.monotonic()
+
+        if delay is None:
+            result = self._perform(method, url, route, return_on, kwargs)
+            hedge.observe(route, time.monotonic() - started)
+            return result
+
+        executor = self._get_hedge_executor()
+        primary = executor.submit(self._perform, method, url, route, return_on, kwargs)
+
+        done, _ = concurrent.futures.wait([primary], timeout=delay)
+        if done or not hedge.allow(route):
+            result = primary.result()
+            hedge.observe(route, time.monotonic() - started)
+            return result
+
+        secondary = executor.submit(self._perform, method, url, route, return_on, kwargs)
+        pending = {primary, secondary}
+        error = None
+
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    # The other one can't be interrupted, its answer is dropped.
+                    hedge.observe(route, time.monotonic() - started, hedge_won=future is secondary)
+                    return future.result()
+
+                error = error or future.exception()
+
+        raise error
+
+    def _perform(self, method: str, url: str, route: str, return_on: typing.List[int], kwargs: dict):
         tries = int(self.tries) if self.tries is not None else None
 
+        session = self._get_session()
+        upload = kwargs.get('upload')
+
+        timeout = kwargs['timeout']
+        deadline = kwargs['deadline']
+        span = kwargs['span']
+        kwargs = {k: v for k, v in kwargs.items() if k not in ('deadline', 'span')}
+
+        breaker = self.breaker
+        policy = self.retry
+        metrics = self.metrics
+        exceptions = policy.exceptions if policy.exceptions is not None else self._RETRY_EXCEPTIONS
+        retrying = policy.applies(method)
+        attempt = 0
+        # The number of times the API ratelimited the request.
+        ratelimited = 0
+        sends = 0
+        started = time.monotonic()
+
+        if upload is not None and retrying:
+            upload.spool()
+
         while tries is None or tries > 0:
-            with requests.Session() as s:
-                r = s.request(method, url, **kwargs)
-
-                js = json_or_text(r, sync=True)
-
-                if not isinstance(js, dict):
-                    raise UnexpectedContentType(r, js)
-
-                if r.status_code in return_on:
-                    if raw:
-                        return r
-                    else:
-                        return js
-                if r.status_code == 403:
-                    raise Forbidden(r, js)
-                elif r.status_code == 400:
-                    raise BadRequest(r, js)
-                elif r.status_code == 500:
-                    raise InternalServerError(r, js)
-                elif r.status_code == 429:
-                    if not self.handle_ratelimit:
-                        raise TooManyRequests(r, js)
-
-                    try:
-                        time.sleep(int(r.headers['Retry-After']))
-                    except KeyError as e:
-                        raise KeyError('Retry-After header is not present.') from e # this probably won't trigger, but
-                        # either way we still need to handle it, right?
-
-                    if tries:
-                        tries -= 1
-                elif 200 <= r.status_code < 300:
-                    if raw:
-                        return r
-                    else:
-                        return js
-                else:
-                    cls = OpenRobotAPIError(js)
-                    cls.raw = js
-                    cls.response = r
-
-                    raise cls
+            if deadline is not None:
+                deadline.check()
+
+            probe = breaker.acquire(route) if breaker is not None else None
+            sent = None
+            timings = None
+            attempt_span = _NOOP_SPAN
+
+            try:
+                if self.ratelimiter is not None:
+                    with span.child('openrobot.ratelimit', {'openrobot.ratelimit.source': 'limiter'}) as wait_span:
+                        wait = self.ratelimiter.acquire(route, deadline=deadline)
+                        wait_span.set_attribute('openrobot.ratelimit.wait', wait)
+
+                    if wait > 0:
+                        metrics.emit(RequestEvent('ratelimit_wait', method, route, sends + 1, duration=wait))
+
+                kwargs['timeout'] = timeout.requests_timeout(deadline.remaining() if deadline is not None else None)
+
+                sends += 1
+                sent = time.monotonic()
+                metrics.emit(RequestEvent('request_start', method, route, sends))
+                attempt_span = span.child('openrobot.attempt', {'openrobot.attempt': sends})
+                timings = _timed.timings = RequestTimings()
+
+                try:
+                    r = session.request(method, url, **(upload.requests_kwargs(kwargs, attempt_span) if upload is not None else kwargs))
+                finally:
+                    _timed.timings = None
+            except exceptions as e:
+                if breaker is not None:
+                    breaker.record(route, False, probe)
+
+                attempt_span.record_exception(e)
+                attempt_span.end()
+
+                if sent is not None:
+                    timings.finish()
+                    metrics.emit(RequestEvent('error', method, route, sends, duration=time.monotonic() - sent,
+                                              bytes_sent=upload.size if upload is not None else None, error=e,
+                                              timings=timings))
+
+                delay = policy.next_delay(attempt, started, e,
+                                          remaining=deadline.remaining() if deadline is not None else None) if retrying else None
+                if delay is None:
+                    if deadline is not None:
+                        # The deadline is likely why it timed out.
+                        deadline.check(cause=e)
+
+                    raise
+
+                metrics.emit(RequestEvent('retry', method, route, sends, duration=delay, error=e))
+
+                attempt += 1
+                with span.child('openrobot.backoff', {'openrobot.retry.delay': delay}):
+                    time.sleep(delay)
+                continue
+            except BaseException as e:
+                if breaker is not None:
+                    breaker.record(route, None, probe)
+
+                attempt_span.record_exception(e)
+                attempt_span.end()
+
+                if sent is not None:
+                    timings.finish()
+                    metrics.emit(RequestEvent('error', method, route, sends, duration=time.monotonic() - sent,
+                                              bytes_sent=upload.size if upload is not None else None, error=e,
+                                              timings=timings))
+
+                raise
+
+            if breaker is not None:
+                breaker.record(route, not breaker.failed(r.status_code), probe)
+
+            # requests reads the body after the headers, which were received
+            # after r.elapsed.
+            timings.headers(r.elapsed.total_seconds())
+            timings.finish()
+
+            length = r.request.headers.get('Content-Length')
+            metrics.emit(RequestEvent('request_end', method, route, sends, status=r.status_code,
+                                      duration=time.monotonic() - sent,
+                                      bytes_sent=int(length) if length else upload.size if upload is not None else None,
+                                      bytes_received=len(r.content), timings=timings))
+
+            with attempt_span:
+                attempt_span.set_attribute('http.status_code', r.status_code)
+
+                if r.status_code == 304 and 304 in return_on:
+                    return r, None
+
+                with attempt_span.child('openrobot.decode', {'openrobot.response.size': len(r.content)}):
+                    js = json_or_text(r, sync=True, loads=self.json_loads)
+
+            if retrying and r.status_code in policy.statuses and r.status_code not in return_on:
+                delay = policy.next_delay(attempt, started, r.status_code, parse_retry_after(r.headers.get('Retry-After')),
+                                          remaining=deadline.remaining() if deadline is not None else None)
+                if delay is not None:
+                    metrics.emit(RequestEvent('retry', method, route, sends, status=r.status_code, duration=delay))
+
+                    attempt += 1
+                    with span.child('openrobot.backoff', {'openrobot.retry.delay': delay}):
+                        time.sleep(delay)
+                    continue
+
+            if not isinstance(js, dict):
+                raise UnexpectedContentType(r, js)
+
+            if r.status_code in return_on:
+                return r, js
+            elif r.status_code == 403:
+                raise Forbidden(r, js)
+            elif r.status_code == 400:
+                raise BadRequest(r, js)
+            elif r.status_code == 500:
+                raise InternalServerError(r, js)
+            elif r.status_code == 429:
+                if not self.handle_ratelimit:
+                    raise TooManyRequests(r, js)
+
+                retry_after = parse_retry_after(r.headers.get('Retry-After'))
+                if retry_after is None:
+                    # Without a (readable) Retry-After, back off like the retries do.
+                    retry_after = policy.delay(ratelimited)
+
+                ratelimited += 1
+
+                if deadline is not None:
+                    # Give up now if we can't wait that long anyway.
+                    deadline.check(retry_after, cause=TooManyRequests(r, js))
+
+                if self.ratelimiter is not None:
+                    # Hold back everyone else sharing the limiter too.
+                    self.ratelimiter.penalize(route, retry_after)
+
+                policy.count(429)
+                metrics.emit(RequestEvent('ratelimit_wait', method, route, sends, status=429, duration=retry_after))
+                with span.child('openrobot.ratelimit', {'openrobot.ratelimit.source': 'api',
+                                                        'openrobot.ratelimit.wait': retry_after}):
+                    time.sleep(retry_after)
+
+                if tries:
+                    tries -= 1
+            elif 200 <= r.status_code < 300:
+                return r, js
+            else:
+                cls = OpenRobotAPIError(js)
+                cls.raw = js
+                cls.response = r
+
+                raise cls
 
         raise TooManyRequests(r, js)
 
     # Methods to query to API:
 
-    def text_generation(self, text: str, *, max_length: typing.Optional[int] = None, num_return: typing.Optional[int] = 1) -> TextGenerationResult:
+    def text_generation(self, text: str, *, max_length: typing.Optional[int] = None, num_return: typing.Optional[int] = 1, wait: bool = False,
+                        timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> TextGenerationResult:
         """
         Text Generation/Completion. This uses the /api/text-generation endpoint.
 
@@ -155,6 +778,16 @@ class SyncClient:
             The maximum length of the generated text. Defaults to ``None``.
         num_return: Optional[:class:`int`]
             The number of generated texts to return. Defaults to 1.
+        wait: Optional[:class:`bool`]
+            Whether to wait for the task to finish before returning. See
+            :meth:`OpenRobotAPITaskResult.wait`. Defaults to ``False``.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -164,6 +797,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -171,10 +806,19 @@ class SyncClient:
             The text generation result returned by the API.
         """
 
-        js = self._request('POST', '/api/text-generation', data={'text': text, 'max_length': max_length, 'num_return': num_return})
-        return TextGenerationResult(js)
+        deadline = Deadline.coerce(deadline)
+
+        js = self._request('POST', '/api/text-generation', data={'text': text, 'max_length': max_length, 'num_return': num_return},
+                           timeout=timeout, deadline=deadline)
+        result = TextGenerationResult(js, client=self, keep_raw=self.keep_raw)
 
-    def text_generation_get(self, task_id: str) -> TextGenerationResult:
+        if wait:
+            result = result.wait(deadline.remaining() if deadline is not None else None)
+
+        return result
+
+    def text_generation_get(self, task_id: str, *,
+                            timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> TextGenerationResult:
         """
         Gets the status of a text generation task. This uses the /api/text-generation/{task_id} endpoint.
 
@@ -182,6 +826,13 @@ class SyncClient:
         ----------
         task_id: :class:`str`
             The task ID of the text generation task.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -191,6 +842,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -198,10 +851,11 @@ class SyncClient:
             The text generation result returned by the API.
         """
 
-        js = self._request('GET', f'/api/text-generation/{quote(task_id)}')
-        return TextGenerationResult(js)
+        js = self._request('GET', f'/api/text-generation/{quote(task_id)}', timeout=timeout, deadline=deadline)
+        return TextGenerationResult(js, client=self, keep_raw=self.keep_raw)
 
-    def sentiment(self, text: str) -> SentimentResult:
+    def sentiment(self, text: str, *, wait: bool = False,
+                  timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SentimentResult:
         """
         Performs a Sentiment check on a text.
 
@@ -209,6 +863,16 @@ class SyncClient:
         ----------
         text: :class:`str`
             The text to be checked.
+        wait: Optional[:class:`bool`]
+            Whether to wait for the task to finish before returning. See
+            :meth:`OpenRobotAPITaskResult.wait`. Defaults to ``False``.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -218,6 +882,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -225,10 +891,18 @@ class SyncClient:
             The sentiment result returned by the API.
         """
 
-        js = self._request('POST', '/api/sentiment', data={'text': text})
-        return SentimentResult(js)
+        deadline = Deadline.coerce(deadline)
+
+        js = self._request('POST', '/api/sentiment', data={'text': text}, timeout=timeout, deadline=deadline)
+        result = SentimentResult(js, client=self, keep_raw=self.keep_raw)
+
+        if wait:
+            result = result.wait(deadline.remaining() if deadline is not None else None)
 
-    def sentiment_get(self, task_id: str) -> SentimentResult:
+        return result
+
+    def sentiment_get(self, task_id: str, *,
+                      timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SentimentResult:
         """
         Gets the status of a sentiment task. This uses the /api/sentiment/{task_id} endpoint.
 
@@ -236,6 +910,13 @@ class SyncClient:
         ----------
         task_id: :class:`str`
             The task ID of the sentiment task.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -245,6 +926,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -252,10 +935,11 @@ class SyncClient:
             The sentiment result returned by the API.
         """
 
-        js = self._request('GET', f'/api/sentiment/{quote(task_id)}')
-        return SentimentResult(js)
+        js = self._request('GET', f'/api/sentiment/{quote(task_id)}', timeout=timeout, deadline=deadline)
+        return SentimentResult(js, client=self, keep_raw=self.keep_raw)
 
-    def summarization(self, text: str, *, max_length: typing.Optional[int] = None, min_length: typing.Optional[int] = 1) -> SummarizationResult:
+    def summarization(self, text: str, *, max_length: typing.Optional[int] = None, min_length: typing.Optional[int] = 1, wait: bool = False,
+                      timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SummarizationResult:
         """
         Summarizes a text. This uses the /api/summarization endpoint.
 
@@ -267,6 +951,16 @@ class SyncClient:
             The maximum length of the summary. Defaults to ``None``.
         min_length: Optional[:class:`int`]
             The minimum length of the summary. Defaults to ``None``.
+        wait: Optional[:class:`bool`]
+            Whether to wait for the task to finish before returning. See
+            :meth:`OpenRobotAPITaskResult.wait`. Defaults to ``False``.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -276,6 +970,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -283,10 +979,19 @@ class SyncClient:
             The summarization result returned by the API.
         """
 
-        js = self._request('POST', '/api/summarization', data={'text': text, 'max_length': max_length, 'min_length': min_length})
-        return SummarizationResult(js)
+        deadline = Deadline.coerce(deadline)
+
+        js = self._request('POST', '/api/summarization', data={'text': text, 'max_length': max_length, 'min_length': min_length},
+                           timeout=timeout, deadline=deadline)
+        result = SummarizationResult(js, client=self, keep_raw=self.keep_raw)
+
+        if wait:
+            result = result.wait(deadline.remaining() if deadline is not None else None)
+
+        return result
 
-    def summarization_get(self, task_id: str) -> SummarizationResult:
+    def summarization_get(self, task_id: str, *,
+                          timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> SummarizationResult:
         """
         Gets the status of a summarization task. This uses the /api/summarization/{task_id} endpoint.
 
@@ -294,6 +999,13 @@ class SyncClient:
         ----------
         task_id: :class:`str`
             The task ID of the summarization task.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -303,6 +1015,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -310,10 +1024,11 @@ class SyncClient:
             The summarization result returned by the API.
         """
 
-        js = self._request('GET', f'/api/summarization/{quote(task_id)}')
-        return SummarizationResult(js)
+        js = self._request('GET', f'/api/summarization/{quote(task_id)}', timeout=timeout, deadline=deadline)
+        return SummarizationResult(js, client=self, keep_raw=self.keep_raw)
 
-    def lyrics(self, query: str) -> LyricResult:
+    def lyrics(self, query: str, *,
+               timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> LyricResult:
         """
         Gets the lyrics from the API.
 
@@ -321,6 +1036,13 @@ class SyncClient:
         ----------
         query: :class:`str`
             Searches for the lyrics from the query.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -330,6 +1052,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -337,17 +1061,26 @@ class SyncClient:
             The Lyrics Result returned by the API.
         """
 
-        js = self._request('GET', f'/api/lyrics/{quote(query)}')
-        return LyricResult(js)
+        js = self._request('GET', f'/api/lyrics/{quote(query)}', cache=True, coalesce=True,
+                           timeout=timeout, deadline=deadline)
+        return LyricResult(js, keep_raw=self.keep_raw)
 
-    def nsfw_check(self, source: typing.Union[bytes, io.BytesIO]) -> NSFWCheckResult:
+    def nsfw_check(self, source: UploadSource, *,
+                   timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> NSFWCheckResult:
         """
         Queries an NSFW Check to the API.
 
         Parameters
         ----------
-        source: Union[:class:`bytes`, :class:`io.BytesIO`]
+        source: Union[:class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, :class:`memoryview`]
             The image to be checked.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -357,6 +1090,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -364,24 +1099,26 @@ class SyncClient:
             The NSFW Check Result returned by the API.
         """
 
-        if isinstance(source, io.BytesIO):
-            source = source.getvalue()
+        js = self._upload('/api/nsfw-check', Upload(source, field='upload_file'), timeout=timeout, deadline=deadline)
 
-        if not isinstance(source, bytes):
-            raise TypeError('source must be bytes or io.BytesIO')
+        return NSFWCheckResult(js, keep_raw=self.keep_raw)
 
-        js = self._request('POST', '/api/nsfw-check', files={'upload_file': source})
-
-        return NSFWCheckResult(js)
-
-    def celebrity(self, source: typing.Union[bytes, io.BytesIO]) -> typing.List[CelebrityResult]:
+    def celebrity(self, source: UploadSource, *,
+                  timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.List[CelebrityResult]:
         """
         Detects the celebrities in the image.
 
         Parameters
         ----------
-        source: Union[:class:`bytes`, :class:`io.BytesIO`]
+        source: Union[:class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, :class:`memoryview`]
             The source of the image.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -391,6 +1128,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -398,24 +1137,26 @@ class SyncClient:
             The celebrities detected.
         """
 
-        if isinstance(source, io.BytesIO):
-            source = source.getvalue()
-
-        if not isinstance(source, bytes):
-            raise TypeError('source must be bytes or io.BytesIO')
-
-        js = self._request('POST', '/api/celebrity', files={'upload_file': source})
+        js = self._upload('/api/celebrity', Upload(source, field='upload_file'), timeout=timeout, deadline=deadline)
 
-        return [CelebrityResult(data) for data in js['celebrities']]
+        return [CelebrityResult(data, keep_raw=self.keep_raw) for data in js['celebrities']]
 
-    def ocr(self, source: typing.Union[bytes, io.BytesIO]) -> OCRResult:
+    def ocr(self, source: UploadSource, *,
+            timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> OCRResult:
         """
         Reads text from an image.
 
         Parameters
         ----------
-        source: Union[:class:`bytes`, :class:`io.BytesIO`]
+        source: Union[:class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, :class:`memoryview`]
             The URL/Bytes of the image.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -425,6 +1166,8 @@ class SyncClient:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -432,21 +1175,66 @@ class SyncClient:
             The OCR/Text found.
         """
 
-        if isinstance(source, io.BytesIO):
-            source = source.getvalue()
+        js = self._upload('/api/ocr', Upload(source, field='upload_file'), timeout=timeout, deadline=deadline)
 
-        if not isinstance(source, bytes):
-            raise TypeError('source must be bytes or io.BytesIO')
-
-        js = self._request('POST', '/api/ocr', files={'upload_file': source})
-
-        return OCRResult(js)
+        return OCRResult(js, keep_raw=self.keep_raw)
 
     @property
-    def translate(self):
+    def translate(self) -> Translate:
         """:class:`Translate`: The Translate client."""
         return Translate(self, False)
 
+    # Batch methods:
+
+    def map(self, method: typing.Union[str, typing.Callable], inputs: typing.Iterable, *,
+            concurrency: typing.Optional[int] = None, ordered: bool = True,
+            timeout: typing.Optional[float] = None, dedupe: typing.Optional[bool] = None) -> typing.Iterator[BatchItem]:
+        """Runs a method over many inputs concurrently, on the client's thread pool.
+
+        The inputs are only pulled from ``inputs`` when a slot is free, so
+        this can be used with huge or endless iterables.
+
+        Parameters
+        ----------
+        method: Union[:class:`str`, Callable]
+            The method to call, such as ``'ocr'`` or ``client.ocr``.
+        inputs: Iterable
+            The inputs. Each input is passed as the only argument, unless
+            it is a :class:`tuple`, in which case it is unpacked.
+        concurrency: Optional[:class:`int`]
+            The maximum number of requests in flight. This can't be more
+            than ``max_workers``. Defaults to ``max_workers``.
+        ordered: Optional[:class:`bool`]
+            Whether to yield the results in the order of the inputs. If
+            this is ``False``, they are yielded as they complete. Defaults
+            to ``True``.
+        timeout: Optional[:class:`float`]
+            The number of seconds the whole batch may take. When it runs
+            out, the requests still in flight are yielded with a
+            :exc:`concurrent.futures.TimeoutError`, and the rest of the
+            inputs are not started. Defaults to ``None``.
+        dedupe: Optional[:class:`bool`]
+            Whether an input that is the same as a recent one (compared
+            by value, or by hash for :class:`bytes`) reuses its result
+            instead of being sent again. Defaults to ``coalesce``.
+
+        Returns
+        -------
+        Iterator[:class:`BatchItem`]
+            The results. Errors are captured in :attr:`BatchItem.error`
+            instead of aborting the batch.
+        """
+
+        func = getattr(self, method) if isinstance(method, str) else method
+
+        return sync_map(self._get_executor(), func, inputs, concurrency=min(concurrency or self.max_workers, self.max_workers),
+                        ordered=ordered, timeout=timeout, dedupe=self.coalesce if dedupe is None else dedupe)
+
+    @property
+    def batch(self) -> Batch:
+        """:class:`Batch`: Batch helpers for each endpoint."""
+        return Batch(self)
+
     # @property
     # def speech(self) -> Speech:
     #     """:class:`Speech`: The Speech client."""
@@ -0,0 +1,365 @@
+import asyncio
+import collections
+import concurrent.futures
+import time
+import typing
+
+from .coalesce import input_key
+
+# The number of recent distinct inputs remembered to collapse duplicates.
+DEDUPE_WINDOW = 1024
+
+
+class BatchItem:
+    """The result of a single input of a batch.
+
+    Errors are captured per item, so that one bad input does not abort
+    the whole batch.
+
+    Attributes
+    ----------
+    index: :class:`int`
+        The position of the input in the batch.
+    input: Any
+        The input that was passed.
+    result: Any
+        The result returned by the API. ``None`` if it failed.
+    error: Optional[:class:`BaseException`]
+        The exception raised for this input. ``None`` if it succeeded.
+    """
+
+    def __init__(self, index: int, input: typing.Any, result: typing.Any = None,
+                 error: typing.Optional[BaseException] = None):
+        self.index: int = index
+        self.input: typing.Any = input
+        self.result: typing.Any = result
+        self.error: typing.Optional[BaseException] = error
+
+    def __repr__(self):
+        if self.error is not None:
+            return f'<BatchItem index={self.index} error={self.error!r}>'
+
+        return f'<BatchItem index={self.index} result={self.result!r}>'
+
+    @property
+    def ok(self) -> bool:
+        """:class:`bool`: Whether the input succeeded."""
+        return self.error is None
+
+    def get(self) -> typing.Any:
+        """Returns the result, or raises the error if the input failed."""
+
+        if self.error is not None:
+            raise self.error
+
+        return self.result
+
+
+def _call(func: typing.Callable, input: typing.Any):
+    # Tuples are unpacked, so that e.g (text, to_lang) can be passed to translate.
+    if isinstance(input, tuple):
+        return func(*input)
+
+    return func(input)
+
+
+class _Seen:
+    # The futures of the most recent distinct inputs of a batch.
+
+    def __init__(self, enabled: bool):
+        self.enabled: bool = enabled
+        self._futures: typing.Dict[typing.Hashable, typing.Any] = collections.OrderedDict()
+
+    def get(self, input: typing.Any) -> typing.Tuple[typing.Optional[typing.Hashable], typing.Any]:
+        if not self.enabled:
+            return None, None
+
+        key = input_key(input)
+        if key is None:
+            return None, None
+
+        future = self._futures.get(key)
+        if future is not None:
+            self._futures.move_to_end(key)
+
+        return key, future
+
+    def add(self, key: typing.Optional[typing.Hashable], future: typing.Any):
+        if key is None:
+            return
+
+        self._futures[key] = future
+
+        if len(self._futures) > DEDUPE_WINDOW:
+            self._futures.popitem(last=False)
+
+
+async def _aiter(inputs: typing.Union[typing.Iterable, typing.AsyncIterable]) -> typing.AsyncIterator:
+    if hasattr(inputs, '__aiter__'):
+        async for input in inputs:
+            yield input
+    else:
+        for input in inputs:
+            yield input
+
+
+async def async_map(func: typing.Callable[..., typing.Awaitable], inputs: typing.Union[typing.Iterable, typing.AsyncIterable], *,
+                    concurrency: int = 10, ordered: bool = True, timeout: typing.Optional[float] = None,
+                    dedupe: bool = False) -> typing.AsyncIterator[BatchItem]:
+    """Runs ``func`` over ``inputs`` with at most ``concurrency`` calls in flight.
+
+    See :meth:`AsyncClient.map` for the parameters.
+    """
+
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1.')
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout is not None else None
+
+    source = _aiter(inputs)
+    exhausted = False
+    count = 0
+    seen = _Seen(dedupe)
+
+    # In submission order, so that the ordered mode can wait on the oldest.
+    pending: typing.Deque[typing.Tuple[int, typing.Any, asyncio.Future]] = collections.deque()
+
+    async def fill():
+        nonlocal exhausted, count
+
+        # Inputs are only pulled when there is a free slot, so huge (or
+        # endless) iterables are never loaded into memory.
+        while not exhausted and len(pending) < concurrency:
+            try:
+                input = await source.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+            else:
+                key, task = seen.get(input)
+
+                if task is None:
+                    try:
+                        task = asyncio.ensure_future(_call(func, input))
+                    except Exception as e:
+                        task = loop.create_future()
+                        task.set_exception(e)
+
+                    seen.add(key, task)
+
+                pending.append((count, input, task))
+                count += 1
+
+    def finish(entry) -> BatchItem:
+        index, input, task = entry
+
+        if task.cancelled():
+            return BatchItem(index, input, error=asyncio.CancelledError())
+
+        error = task.exception()
+        if error is not None:
+            return BatchItem(index, input, error=error)
+
+        return BatchItem(index, input, result=task.result())
+
+    try:
+        await fill()
+
+        while pending:
+            remaining = deadline - loop.time() if deadline is not None else None
+
+            if remaining is None or remaining > 0:
+                waiting = [pending[0][2]] if ordered else [entry[2] for entry in pending]
+                done, _ = await asyncio.wait(waiting, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                done = set()
+
+            if not done:
+                # Out of time: whatever is still in flight fails, and the
+                # rest of the inputs are never started. The calls that
+                # already finished keep their results.
+                unfinished = {entry[2] for entry in pending if not entry[2].done()}
+                for task in unfinished:
+                    task.cancel()
+
+                while pending:
+                    entry = pending.popleft()
+
+                    if entry[2] in unfinished:
+                        yield BatchItem(entry[0], entry[1],
+                                        error=asyncio.TimeoutError('The batch deadline was exceeded.'))
+                    else:
+                        yield finish(entry)
+
+                return
+
+            if ordered:
+                while pending and pending[0][2].done():
+                    yield finish(pending.popleft())
+            else:
+                for entry in [entry for entry in pending if entry[2] in done]:
+                    pending.remove(entry)
+
+                    yield finish(entry)
+
+            await fill()
+    finally:
+        tasks = [entry[2] for entry in pending]
+        for task in tasks:
+            task.cancel()
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def sync_map(executor: concurrent.futures.Executor, func: typing.Callable, inputs: typing.Iterable, *,
+             concurrency: int = 10, ordered: bool = True, timeout: typing.Optional[float] = None,
+             dedupe: bool = False) -> typing.Iterator[BatchItem]:
+    """Runs ``func`` over ``inputs`` on ``executor`` with at most ``concurrency`` calls in flight.
+
+    See :meth:`SyncClient.map` for the parameters.
+    """
+
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1.')
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    source = iter(inputs)
+    exhausted = False
+    count = 0
+    seen = _Seen(dedupe)
+
+    pending: typing.Deque[typing.Tuple[int, typing.Any, concurrent.futures.Future]] = collections.deque()
+
+    def fill():
+        nonlocal exhausted, count
+
+        while not exhausted and len(pending) < concurrency:
+            try:
+                input = next(source)
+            except StopIteration:
+                exhausted = True
+            else:
+                key, future = seen.get(input)
+
+                if future is None:
+                    future = executor.submit(_call, func, input)
+                    seen.add(key, future)
+
+                pending.append((count, input, future))
+                count += 1
+
+    def finish(entry) -> BatchItem:
+        index, input, future = entry
+
+        error = future.exception()
+        if error is not None:
+            return BatchItem(index, input, error=error)
+
+        return BatchItem(index, input, result=future.result())
+
+    try:
+        fill()
+
+        while pending:
+            remaining = deadline - time.monotonic() if deadline is not None else None
+
+            if remaining is None or remaining > 0:
+                waiting = [pending[0][2]] if ordered else [entry[2] for entry in pending]
+                done, _ = concurrent.futures.wait(waiting, timeout=remaining,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+            else:
+                done = set()
+
+            if not done:
+                # Calls that already started can't be stopped, they are
+                # left to finish in the background. The calls that already
+                # finished keep their results.
+                unfinished = {entry[2] for entry in pending if not entry[2].done()}
+                for future in unfinished:
+                    future.cancel()
+
+                while pending:
+                    entry = pending.popleft()
+
+                    if entry[2] in unfinished:
+                        yield BatchItem(entry[0], entry[1],
+                                        error=concurrent.futures.TimeoutError('The batch deadline was exceeded.'))
+                    else:
+                        yield finish(entry)
+
+                return
+
+            if ordered:
+                while pending and pending[0][2].done():
+                    yield finish(pending.popleft())
+            else:
+                for entry in [entry for entry in pending if entry[2] in done]:
+                    pending.remove(entry)
+
+                    yield finish(entry)
+
+            fill()
+    finally:
+        for entry in pending:
+            entry[2].cancel()
+
+
+class Batch:
+    """Batch helpers for a client.
+
+    Every method takes an iterable of inputs (or an async iterable,
+    with an :class:`AsyncClient`) and the same keyword arguments as
+    :meth:`SyncClient.map`/:meth:`AsyncClient.map`. It returns an
+    iterator of :class:`BatchItem`, or an async iterator if the client
+    is an :class:`AsyncClient`.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        async for item in client.batch.ocr(images, concurrency=8):
+            if item.ok:
+                print(item.index, item.result.text)
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def text_generation(self, texts, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``text_generation`` over ``texts``."""
+        return self._client.map(self._client.text_generation, texts, **kwargs)
+
+    def sentiment(self, texts, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``sentiment`` over ``texts``."""
+        return self._client.map(self._client.sentiment, texts, **kwargs)
+
+    def summarization(self, texts, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``summarization`` over ``texts``."""
+        return self._client.map(self._client.summarization, texts, **kwargs)
+
+    def lyrics(self, queries, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``lyrics`` over ``queries``."""
+        return self._client.map(self._client.lyrics, queries, **kwargs)
+
+    def nsfw_check(self, sources, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``nsfw_check`` over ``sources``."""
+        return self._client.map(self._client.nsfw_check, sources, **kwargs)
+
+    def description(self, sources, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``description`` over ``sources``. This is only available on an :class:`AsyncClient`."""
+        return self._client.map(self._client.description, sources, **kwargs)
+
+    def celebrity(self, sources, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``celebrity`` over ``sources``."""
+        return self._client.map(self._client.celebrity, sources, **kwargs)
+
+    def ocr(self, sources, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs ``ocr`` over ``sources``."""
+        return self._client.map(self._client.ocr, sources, **kwargs)
+
+    def translate(self, inputs, **kwargs) -> typing.Union[typing.Iterator[BatchItem], typing.AsyncIterator[BatchItem]]:
+        """Runs :class:`Translate` over ``inputs``, which are ``(text, to_lang)``
+        or ``(text, to_lang, from_lang)`` tuples."""
+        return self._client.map(self._client.translate, inputs, **kwargs)
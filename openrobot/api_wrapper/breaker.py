@@ -0,0 +1,234 @@
+import collections
+import threading
+import time
+import typing
+
+from .error import CircuitOpen
+from .utils import get_route
+
+# The number of buckets the failure-rate window is split in.
+_BUCKETS = 10
+
+
+class _Circuit:
+    # The state of the breaker of one route.
+    __slots__ = ('state', 'buckets', 'opened_at', 'probing', 'probe_successes', 'opened', 'rejected')
+
+    def __init__(self):
+        self.state: str = 'closed'
+        # [start, requests, failures]
+        self.buckets: typing.Deque[typing.List[float]] = collections.deque()
+        self.opened_at: float = 0.0
+        self.probing: int = 0
+        self.probe_successes: int = 0
+        self.opened: int = 0
+        self.rejected: int = 0
+
+    def counts(self, now: float, window: float) -> typing.Tuple[int, int]:
+        while self.buckets and self.buckets[0][0] <= now - window:
+            self.buckets.popleft()
+
+        return sum(b[1] for b in self.buckets), sum(b[2] for b in self.buckets)
+
+
+class CircuitBreaker:
+    """Stops sending requests to a route of the API that keeps failing.
+
+    Every route (e.g ``/api/ocr``) has its own breaker. It is closed at
+    first, and opens when too many of the recent requests to the route
+    failed with a 5xx status, a timeout or a connection error. While it is
+    open, requests to the route fail right away with :exc:`CircuitOpen`.
+    After ``cooldown`` it is half-open, and lets ``probes`` requests
+    through: it closes again if they all succeed, and opens again if any
+    of them fails.
+
+    Parameters
+    ----------
+    failure_rate: Optional[:class:`float`]
+        The ratio of failed requests, from ``0`` to ``1``, that opens the
+        breaker. Defaults to ``0.5``.
+    minimum_requests: Optional[:class:`int`]
+        The number of requests that have to be made in ``window`` before
+        the breaker can open. Defaults to ``20``.
+    window: Optional[:class:`float`]
+        The number of seconds the failure rate is computed over. Defaults
+        to ``30``.
+    cooldown: Optional[:class:`float`]
+        The number of seconds the breaker stays open before probing the
+        route again. Defaults to ``30``.
+    probes: Optional[:class:`int`]
+        The number of requests let through while half-open. Defaults to
+        ``1``.
+    statuses: Optional[Iterable[:class:`int`]]
+        The statuses counted as failures. Defaults to ``500``, ``502``,
+        ``503`` and ``504``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = SyncClient(token, breaker=CircuitBreaker(0.25, cooldown=60))
+    """
+
+    def __init__(self, failure_rate: float = 0.5, *, minimum_requests: int = 20, window: float = 30.0,
+                 cooldown: float = 30.0, probes: int = 1, statuses: typing.Iterable[int] = (500, 502, 503, 504)):
+        self.failure_rate: float = failure_rate
+        self.minimum_requests: int = minimum_requests
+        self.window: float = window
+        self.cooldown: float = cooldown
+        self.probes: int = max(1, probes)
+        self.statuses: typing.FrozenSet[int] = frozenset(statuses)
+
+        self._circuits: typing.Dict[str, _Circuit] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _circuit(self, route: str) -> _Circuit:
+        route = get_route(route)
+        circuit = self._circuits.get(route)
+
+        if circuit is None:
+            circuit = self._circuits[route] = _Circuit()
+
+        return circuit
+
+    def state(self, route: str) -> str:
+        """Returns the state of the breaker of a route: ``closed``, ``open``
+        or ``half-open``."""
+
+        with self._lock:
+            circuit = self._circuits.get(get_route(route))
+
+            if circuit is None:
+                return 'closed'
+            elif circuit.state == 'open' and time.monotonic() >= circuit.opened_at + self.cooldown:
+                return 'half-open'
+
+            return circuit.state
+
+    def acquire(self, route: str) -> bool:
+        """Checks whether a request to the route can be sent.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the request is a probe of a half-open breaker. This has
+            to be passed to :meth:`record`.
+
+        Raises
+        ------
+        :exc:`CircuitOpen`
+            The breaker of the route is open.
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            circuit = self._circuit(route)
+
+            if circuit.state == 'closed':
+                return False
+
+            if circuit.state == 'open':
+                if now < circuit.opened_at + self.cooldown:
+                    circuit.rejected += 1
+                    raise CircuitOpen(get_route(route), circuit.opened_at + self.cooldown - now)
+
+                circuit.state = 'half-open'
+                circuit.probing = 0
+                circuit.probe_successes = 0
+
+            if circuit.probing >= self.probes:
+                # The probes are still in flight.
+                circuit.rejected += 1
+                raise CircuitOpen(get_route(route), None)
+
+            circuit.probing += 1
+            return True
+
+    def record(self, route: str, success: typing.Optional[bool], probe: bool = False):
+        """Records the outcome of a request to the route. ``None`` means
+        that the request failed for a reason unrelated to the API, so it
+        only frees its probe slot."""
+
+        now = time.monotonic()
+
+        with self._lock:
+            circuit = self._circuit(route)
+
+            if probe and circuit.state == 'half-open':
+                circuit.probing -= 1
+
+            if success is None:
+                return
+
+            if circuit.state == 'half-open':
+                # The requests sent before the breaker opened don't count.
+                if not probe:
+                    return
+                elif not success:
+                    self._open(circuit, now)
+                else:
+                    circuit.probe_successes += 1
+
+                    if circuit.probe_successes >= self.probes:
+                        circuit.state = 'closed'
+                        circuit.buckets.clear()
+            elif circuit.state == 'closed':
+                if not circuit.buckets or circuit.buckets[-1][0] <= now - self.window / _BUCKETS:
+                    circuit.buckets.append([now, 0, 0])
+
+                bucket = circuit.buckets[-1]
+                bucket[1] += 1
+                bucket[2] += not success
+
+                requests, failures = circuit.counts(now, self.window)
+
+                if requests >= self.minimum_requests and failures >= self.failure_rate * requests:
+                    self._open(circuit, now)
+
+    @staticmethod
+    def _open(circuit: _Circuit, now: float):
+        circuit.state = 'open'
+        circuit.opened_at = now
+        circuit.opened += 1
+        circuit.buckets.clear()
+
+    def failed(self, status: int) -> bool:
+        """Returns whether a response with this status is a failure."""
+        return status in self.statuses
+
+    def reset(self, route: typing.Optional[str] = None):
+        """Closes the breaker of a route, or of every route."""
+
+        with self._lock:
+            if route is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(get_route(route), None)
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Returns, for each route, the ``state`` of its breaker, the
+        ``requests`` and ``failures`` in the current window, how many times
+        it ``opened`` and how many requests it ``rejected``."""
+
+        now = time.monotonic()
+
+        with self._lock:
+            stats = {}
+
+            for route, circuit in self._circuits.items():
+                requests, failures = circuit.counts(now, self.window)
+                state = circuit.state
+
+                if state == 'open' and now >= circuit.opened_at + self.cooldown:
+                    state = 'half-open'
+
+                stats[route] = {
+                    'state': state,
+                    'requests': requests,
+                    'failures': failures,
+                    'opened': circuit.opened,
+                    'rejected': circuit.rejected,
+                }
+
+            return stats
@@ -0,0 +1,236 @@
+import collections
+import threading
+import time
+import typing
+
+
+class CacheEntry:
+    """A cached response.
+
+    Attributes
+    ----------
+    value: Any
+        The decoded JSON of the response.
+    etag: Optional[:class:`str`]
+        The ``ETag`` of the response, used to revalidate it.
+    stored_at: :class:`float`
+        When the response was stored or last revalidated.
+    expires: :class:`float`
+        Until when the response is fresh.
+    stale_while_revalidate: :class:`float`
+        For how many seconds after ``expires`` the response can still be
+        used while it is revalidated in the background.
+    stale_if_error: :class:`float`
+        For how many seconds after ``expires`` the response can still be
+        used if revalidating it fails.
+    """
+
+    def __init__(self, value: typing.Any, etag: typing.Optional[str], stored_at: float, expires: float,
+                 stale_while_revalidate: float, stale_if_error: float):
+        self.value: typing.Any = value
+        self.etag: typing.Optional[str] = etag
+        self.stored_at: float = stored_at
+        self.expires: float = expires
+        self.stale_while_revalidate: float = stale_while_revalidate
+        self.stale_if_error: float = stale_if_error
+
+
+def parse_cache_control(header: typing.Optional[str]) -> typing.Dict[str, typing.Optional[str]]:
+    directives = {}
+
+    for directive in (header or '').split(','):
+        name, _, value = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    return directives
+
+
+class ResponseCache:
+    """An in-memory TTL/LRU cache for the responses of idempotent ``GET``
+    endpoints, such as lyrics, translate and the speech supports.
+
+    The ``Cache-Control`` and ``ETag`` headers of the API are honored
+    when present: ``max-age`` overrides ``ttl``, ``no-store`` responses
+    are not cached, and expired responses with an ``ETag`` are
+    revalidated with ``If-None-Match`` instead of being downloaded again.
+
+    The cached values are shared, so they should not be modified.
+
+    Parameters
+    ----------
+    maxsize: Optional[:class:`int`]
+        The maximum number of responses kept. The least recently used
+        ones are evicted first. Defaults to ``1024``.
+    ttl: Optional[:class:`float`]
+        The number of seconds a response is fresh for, if the API does not
+        say otherwise. Defaults to ``300``.
+    stale_while_revalidate: Optional[:class:`float`]
+        The number of seconds after it expired that a response is still
+        returned right away, while it is revalidated in the background.
+        Defaults to ``0``.
+    stale_if_error: Optional[:class:`float`]
+        The number of seconds after it expired that a response is still
+        returned if the API errors. Defaults to ``0``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = SyncClient(token, cache=ResponseCache(ttl=3600, stale_if_error=86400))
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, *, stale_while_revalidate: float = 0.0,
+                 stale_if_error: float = 0.0):
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.stale_while_revalidate: float = stale_while_revalidate
+        self.stale_if_error: float = stale_if_error
+
+        self._entries: typing.Dict[typing.Hashable, CacheEntry] = collections.OrderedDict()
+        self._revalidating: typing.Set[typing.Hashable] = set()
+        self._lock: threading.Lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stale_hits: int = 0
+        self.revalidations: int = 0
+        self.evictions: int = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> typing.Hashable:
+        return url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+
+    def lookup(self, key: typing.Hashable) -> typing.Tuple[typing.Optional[CacheEntry], typing.Optional[str]]:
+        """Looks up a response.
+
+        Returns
+        -------
+        Tuple[Optional[:class:`CacheEntry`], Optional[:class:`str`]]
+            The entry and its state: ``fresh``, ``stale`` (can be used
+            while it is revalidated) or ``expired``. ``(None, None)`` if
+            it is not cached.
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None, None
+
+            self._entries.move_to_end(key)
+
+            if now < entry.expires:
+                self.hits += 1
+                return entry, 'fresh'
+            elif now < entry.expires + entry.stale_while_revalidate:
+                self.stale_hits += 1
+                return entry, 'stale'
+
+            self.misses += 1
+            return entry, 'expired'
+
+    def conditional_headers(self, entry: typing.Optional[CacheEntry]) -> typing.Dict[str, str]:
+        if entry is not None and entry.etag:
+            return {'If-None-Match': entry.etag}
+
+        return {}
+
+    def _lifetime(self, headers: typing.Mapping[str, str]) -> typing.Optional[typing.Tuple[float, float, float]]:
+        directives = parse_cache_control(headers.get('Cache-Control'))
+
+        if 'no-store' in directives:
+            return None
+
+        def seconds(name: str, default: float) -> float:
+            try:
+                return float(directives[name])
+            except (KeyError, TypeError, ValueError):
+                return default
+
+        ttl = 0.0 if 'no-cache' in directives else seconds('max-age', self.ttl)
+
+        return (ttl, seconds('stale-while-revalidate', self.stale_while_revalidate),
+                seconds('stale-if-error', self.stale_if_error))
+
+    def store(self, key: typing.Hashable, value: typing.Any, headers: typing.Mapping[str, str], *,
+              etag: typing.Optional[str] = None) -> typing.Any:
+        """Stores a response, unless its headers forbid it. Returns ``value``."""
+
+        lifetime = self._lifetime(headers)
+
+        with self._lock:
+            if lifetime is None or self.maxsize <= 0:
+                self._entries.pop(key, None)
+                return value
+
+            now = time.monotonic()
+            ttl, swr, sie = lifetime
+
+            self._entries[key] = CacheEntry(value, etag or headers.get('ETag'), now, now + ttl, swr, sie)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def refresh(self, key: typing.Hashable, entry: CacheEntry, headers: typing.Mapping[str, str]) -> typing.Any:
+        """Marks an entry as fresh again after a ``304 Not Modified``. Returns its value."""
+
+        with self._lock:
+            self.revalidations += 1
+
+        return self.store(key, entry.value, headers, etag=headers.get('ETag') or entry.etag)
+
+    def usable_on_error(self, entry: typing.Optional[CacheEntry]) -> bool:
+        if entry is None:
+            return False
+
+        usable = time.monotonic() < entry.expires + entry.stale_if_error
+
+        if usable:
+            with self._lock:
+                self.stale_hits += 1
+
+        return usable
+
+    def begin_revalidation(self, key: typing.Hashable) -> bool:
+        # Returns False if the entry is already being revalidated.
+        with self._lock:
+            if key in self._revalidating:
+                return False
+
+            self._revalidating.add(key)
+            return True
+
+    def end_revalidation(self, key: typing.Hashable):
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def clear(self):
+        """Removes every response from the cache."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Returns the ``hits``, ``stale_hits``, ``misses``, ``revalidations``
+        and ``evictions`` counters, and the current ``size``."""
+
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+            }
@@ -0,0 +1,109 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import threading
+import typing
+
+
+def request_key(method: str, url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> typing.Hashable:
+    # Requests with the same key are interchangeable. Parameters that are
+    # None are not sent, so they don't make a request different.
+    return method.upper(), url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+
+
+def input_key(input: typing.Any) -> typing.Optional[typing.Hashable]:
+    # The key of a batch input, or None if it can't be compared without
+    # consuming it (e.g a file object).
+    if isinstance(input, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(input).digest()
+    elif isinstance(input, (str, int, float)):
+        # With the type, as 1, 1.0 and True are equal but may not be the
+        # same call.
+        return type(input).__name__, input
+    elif isinstance(input, tuple):
+        keys = tuple(input_key(x) for x in input)
+        return None if None in keys else keys
+
+    return None
+
+
+class SingleFlight:
+    """Coalesces identical calls made at the same time from many threads.
+
+    The first caller of a key makes the call, and everyone else calling
+    with the same key while it is in flight waits for it and gets the
+    same result (or exception).
+
+    Attributes
+    ----------
+    shared: :class:`int`
+        The number of calls that were served by another in-flight call.
+    """
+
+    def __init__(self):
+        self._calls: typing.Dict[typing.Hashable, concurrent.futures.Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        self.shared: int = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key: typing.Hashable, func: typing.Callable[[], typing.Any]) -> typing.Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+
+            if leader:
+                future = self._calls[key] = concurrent.futures.Future()
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """Coalesces identical calls made at the same time from many coroutines.
+
+    This works like :class:`SingleFlight`. The call runs in its own task,
+    so cancelling one of the callers does not cancel it for the others.
+
+    Attributes
+    ----------
+    shared: :class:`int`
+        The number of calls that were served by another in-flight call.
+    """
+
+    def __init__(self):
+        self._calls: typing.Dict[typing.Hashable, asyncio.Future] = {}
+
+        self.shared: int = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key: typing.Hashable, func: typing.Callable[[], typing.Awaitable]) -> typing.Any:
+        task = self._calls.get(key)
+
+        if task is not None:
+            self.shared += 1
+        else:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            # Retrieve the exception, in case every caller was cancelled.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        return await asyncio.shield(task)
@@ -1,6 +1,10 @@
 import typing
-import aiohttp
-import requests
+
+if typing.TYPE_CHECKING:
+    # Only for the annotations, so that importing the errors does not
+    # import both HTTP libraries.
+    import aiohttp
+    import requests
 
 
 class OpenRobotAPIError(Exception):
@@ -12,7 +16,7 @@ class Forbidden(OpenRobotAPIError):
 
     def __init__(self, resp, json_error):
         self.raw: dict = json_error
-        self.response: typing.Union[aiohttp.ClientResponse, requests.Response] = resp
+        self.response: 'typing.Union[aiohttp.ClientResponse, requests.Response]' = resp
         self.message: str = json_error['message']
         self.error_code: int = json_error['error']['code']
 
@@ -24,7 +28,7 @@ class BadRequest(OpenRobotAPIError):
 
     def __init__(self, resp, json_error):
         self.raw: dict = json_error
-        self.response: typing.Union[aiohttp.ClientResponse, requests.Response] = resp
+        self.response: 'typing.Union[aiohttp.ClientResponse, requests.Response]' = resp
         self.message: str = json_error['message']
         self.error_code: int = json_error['error']['code']
 
@@ -36,7 +40,7 @@ class InternalServerError(OpenRobotAPIError):
 
     def __init__(self, resp, json_error):
         self.raw: dict = json_error
-        self.response: typing.Union[aiohttp.ClientResponse, requests.Response] = resp
+        self.response: 'typing.Union[aiohttp.ClientResponse, requests.Response]' = resp
         self.message: str = json_error['message']
         self.error_code: int = json_error['error']['code']
 
@@ -48,7 +52,7 @@ class TooManyRequests(OpenRobotAPIError):
 
     def __init__(self, resp, json_error):
         self.raw: dict = json_error
-        self.response: typing.Union[aiohttp.ClientResponse, requests.Response] = resp
+        self.response: 'typing.Union[aiohttp.ClientResponse, requests.Response]' = resp
         self.message: str = json_error['message']
         self.error_code: int = json_error['error']['code']
         self.retry_after: int = resp.headers.get('Retry-After', None)
@@ -60,8 +64,8 @@ class UnexpectedContentType(OpenRobotAPIError):
     """An unexpected content type was given by the API."""
 
     def __init__(self, resp, response):
-        self.content_type = resp.content_type
-        self.response: typing.Union[aiohttp.ClientResponse, requests.Response] = resp
+        self.content_type: typing.Optional[str] = resp.headers.get('Content-Type')
+        self.response: 'typing.Union[aiohttp.ClientResponse, requests.Response]' = resp
         self.api_response = response
 
         super().__init__(f'Unexpected Content Type: {self.content_type}: {self.api_response}')
@@ -72,3 +76,57 @@ class NoTokenProvided(OpenRobotAPIError):
 
     def __init__(self):
         super().__init__('No token was provided.')
+
+
+class UnsupportedImage(OpenRobotAPIError):
+    """An image was rejected locally, before being sent to the API.
+
+    Attributes
+    ----------
+    reason: :class:`str`
+        Why the image was rejected.
+    """
+
+    def __init__(self, reason: str):
+        self.reason: str = reason
+
+        super().__init__(reason)
+
+
+class DeadlineExceeded(OpenRobotAPIError):
+    """A call could not be done before its deadline.
+
+    The error that could not be retried in time, such as a timeout or a
+    :exc:`TooManyRequests` with a ``Retry-After`` past the deadline, is
+    its ``__cause__``.
+
+    Attributes
+    ----------
+    deadline: :class:`Deadline`
+        The deadline that was exceeded.
+    """
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+
+        super().__init__(f'The deadline of {deadline.seconds} seconds was exceeded.')
+
+
+class CircuitOpen(OpenRobotAPIError):
+    """A request was not sent, because the circuit breaker of its route is
+    open after too many failures.
+
+    Attributes
+    ----------
+    route: :class:`str`
+        The route of the request, such as ``/api/ocr``.
+    retry_after: Optional[:class:`float`]
+        The number of seconds until the breaker lets a probe request
+        through, or ``None`` if it is already probing the route.
+    """
+
+    def __init__(self, route: str, retry_after: typing.Optional[float]):
+        self.route: str = route
+        self.retry_after: typing.Optional[float] = retry_after
+
+        super().__init__(f'The circuit breaker of {route} is open.')
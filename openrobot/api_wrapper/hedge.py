@@ -0,0 +1,134 @@
+import collections
+import threading
+import typing
+
+from .utils import get_route
+
+
+class HedgePolicy:
+    """When to hedge the ``GET`` lookups, such as :meth:`lyrics` and
+    :class:`Translate`.
+
+    If a request hasn't been answered after a delay, a second identical
+    request is sent, and whichever answers first is used. The delay is
+    the ``percentile`` of the latencies of the route, learned from the
+    previous requests, unless it is set. The hedges are capped to
+    ``max_rate`` of the requests, so that they only add a bounded load.
+
+    With an :class:`AsyncClient`, the slower request is cancelled. With a
+    :class:`SyncClient`, it can't be interrupted, so it finishes in the
+    background and its answer is dropped.
+
+    Parameters
+    ----------
+    delay: Optional[:class:`float`]
+        The number of seconds to wait before hedging. If this is ``None``,
+        it is learned for each route. Defaults to ``None``.
+    percentile: Optional[:class:`float`]
+        The percentile of the latencies used as the learned delay.
+        Defaults to ``0.95``.
+    min_samples: Optional[:class:`int`]
+        The number of latencies of a route needed before it is hedged,
+        if ``delay`` is not set. Defaults to ``20``.
+    samples: Optional[:class:`int`]
+        The number of recent latencies of each route kept to learn the
+        delay. Defaults to ``200``.
+    max_rate: Optional[:class:`float`]
+        The maximum ratio of requests that are hedged. Defaults to
+        ``0.1``.
+    routes: Optional[Iterable[:class:`str`]]
+        The routes to hedge, such as ``/api/lyrics``. If this is ``None``,
+        every ``GET`` request can be hedged. Defaults to ``None``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = AsyncClient(token, hedge=HedgePolicy(max_rate=0.05))
+    """
+
+    def __init__(self, delay: typing.Optional[float] = None, *, percentile: float = 0.95, min_samples: int = 20,
+                 samples: int = 200, max_rate: float = 0.1, routes: typing.Optional[typing.Iterable[str]] = None):
+        self.delay: typing.Optional[float] = delay
+        self.percentile: float = percentile
+        self.min_samples: int = min_samples
+        self.samples: int = samples
+        self.max_rate: float = max_rate
+        self.routes: typing.Optional[typing.FrozenSet[str]] = \
+            frozenset(get_route(r) for r in routes) if routes is not None else None
+
+        self._lock: threading.Lock = threading.Lock()
+        self._latencies: typing.Dict[str, typing.Deque[float]] = {}
+        self._stats: typing.Dict[str, typing.Dict[str, int]] = {}
+        # Each request earns max_rate of a hedge, up to one.
+        self._credit: float = 1.0
+
+    def applies(self, method: str, route: str) -> bool:
+        """Returns whether requests to the route can be hedged."""
+        return method == 'GET' and (self.routes is None or get_route(route) in self.routes)
+
+    def hedge_delay(self, route: str) -> typing.Optional[float]:
+        """Returns how long to wait before hedging a request to the route,
+        or ``None`` if it can't be hedged yet. This counts the request."""
+
+        route = get_route(route)
+
+        with self._lock:
+            self._credit = min(1.0, self._credit + self.max_rate)
+            self._route_stats(route)['requests'] += 1
+
+            if self.delay is not None:
+                return self.delay
+
+            latencies = self._latencies.get(route)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+
+            ordered = sorted(latencies)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+
+    def allow(self, route: str) -> bool:
+        """Returns whether a request to the route can be hedged now, without
+        going over ``max_rate``. This counts the hedge."""
+
+        with self._lock:
+            if self._credit < 1.0:
+                self._route_stats(get_route(route))['capped'] += 1
+                return False
+
+            self._credit -= 1.0
+            self._route_stats(get_route(route))['hedged'] += 1
+
+            return True
+
+    def observe(self, route: str, latency: float, *, hedge_won: bool = False):
+        """Records the latency of the first request to the route, and
+        whether the hedge answered first."""
+
+        route = get_route(route)
+
+        with self._lock:
+            latencies = self._latencies.get(route)
+            if latencies is None:
+                latencies = self._latencies[route] = collections.deque(maxlen=self.samples)
+
+            latencies.append(latency)
+
+            if hedge_won:
+                self._route_stats(route)['hedge_wins'] += 1
+
+    def _route_stats(self, route: str) -> typing.Dict[str, int]:
+        stats = self._stats.get(route)
+        if stats is None:
+            stats = self._stats[route] = {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'capped': 0}
+
+        return stats
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, int]]:
+        """Returns, for each route, the number of ``requests``, how many were
+        ``hedged``, how many times the hedge answered first
+        (``hedge_wins``), and how many hedges were ``capped`` by
+        ``max_rate``."""
+
+        with self._lock:
+            return {route: dict(stats) for route, stats in self._stats.items()}
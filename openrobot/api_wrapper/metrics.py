@@ -0,0 +1,509 @@
+import array
+import math
+import threading
+import time
+import typing
+import warnings
+
+from .timing import PHASES, RequestTimings
+from .utils import get_route
+
+# The events hooks can be added for.
+HOOK_EVENTS = ('request_start', 'request_end', 'retry', 'ratelimit_wait', 'error')
+
+# name: (type, help, labels)
+_METRICS = {
+    'requests_total': ('counter', 'Responses received from the API.', ('method', 'route', 'status')),
+    'request_errors_total': ('counter', 'Requests that failed without a response.', ('method', 'route', 'error')),
+    'retries_total': ('counter', 'Requests sent again after a failure.', ('route', 'reason')),
+    'ratelimit_waits_total': ('counter', 'Waits for the ratelimit, by the local limiter or a 429 of the API.',
+                              ('route', 'source')),
+    'ratelimit_wait_seconds_total': ('counter', 'Seconds spent waiting for the ratelimit.', ('route', 'source')),
+    'bytes_sent_total': ('counter', 'Bytes of request bodies sent.', ('route',)),
+    'bytes_received_total': ('counter', 'Bytes of response bodies received.', ('route',)),
+    'requests_in_flight': ('gauge', 'Requests sent and not answered yet.', ('route',)),
+    'request_phase_seconds_total': ('counter', 'Seconds spent in each phase of the requests.', ('route', 'phase')),
+    'connections_total': ('counter', 'Requests sent on a new or a reused connection.', ('route', 'reused')),
+}
+
+# The quantiles of the latencies reported by stats() and prometheus().
+_QUANTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p999', 0.999))
+
+# Each power of two of a LatencyHistogram is split in 2 ** (_SUB_BUCKET_BITS - 1)
+# linear buckets, so that they are at most 1/64th of the values they hold.
+_SUB_BUCKET_BITS = 7
+_HALF = 1 << (_SUB_BUCKET_BITS - 1)
+
+# The largest latency a LatencyHistogram holds, in microseconds (about 19
+# hours). Larger ones are counted as this.
+_MAX_VALUE = (1 << 36) - 1
+
+
+def _bucket(value: int) -> int:
+    # Values below 2 ** _SUB_BUCKET_BITS have a bucket each. Above that, the
+    # buckets double in width with every power of two.
+    if value < 2 * _HALF:
+        return value
+
+    shift = value.bit_length() - _SUB_BUCKET_BITS
+    return shift * _HALF + (value >> shift)
+
+
+def _bucket_range(index: int) -> typing.Tuple[int, int]:
+    # The values held by a bucket, from the first to the last.
+    if index < 2 * _HALF:
+        return index, index
+
+    shift = index // _HALF - 1
+    start = (index - shift * _HALF) << shift
+
+    return start, start + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """The distribution of latencies, in a fixed amount of memory.
+
+    Like an HDR histogram, the latencies are counted in microseconds, in
+    buckets that double in width with every power of two, each split in
+    64 linear buckets. The percentiles are within 1% of the recorded
+    latencies whatever their scale, in about 16 KiB, however many
+    latencies are recorded.
+
+    This is not thread-safe on its own. The histograms of a
+    :class:`Metrics` are used under its lock.
+    """
+
+    __slots__ = ('_counts', 'count', 'total', 'min', 'max')
+
+    _SIZE = _bucket(_MAX_VALUE) + 1
+
+    def __init__(self):
+        self._counts: array.array = array.array('Q', bytes(8 * self._SIZE))
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: typing.Optional[float] = None
+        self.max: typing.Optional[float] = None
+
+    def record(self, seconds: float):
+        """Records a latency, in seconds."""
+
+        seconds = max(0.0, seconds)
+
+        self._counts[_bucket(min(_MAX_VALUE, int(seconds * 1_000_000)))] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Adds the latencies recorded by another histogram to this one."""
+
+        if not other.count:
+            return
+
+        counts = self._counts
+        for i, n in enumerate(other._counts):
+            if n:
+                counts[i] += n
+
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, q: float) -> typing.Optional[float]:
+        """Returns the latency, in seconds, that ``q`` (from ``0`` to ``1``)
+        of the recorded ones are at most, or ``None`` if none were
+        recorded."""
+
+        if not self.count:
+            return None
+
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+
+        for i, n in enumerate(self._counts):
+            seen += n
+
+            if seen >= rank:
+                first, last = _bucket_range(i)
+                value = (first + last) / 2 / 1_000_000
+
+                return min(self.max, max(self.min, value))
+
+        return self.max
+
+    def stats(self) -> typing.Dict[str, typing.Optional[float]]:
+        """Returns the ``count`` of latencies, and their ``mean``, ``min``,
+        ``max``, ``p50``, ``p90``, ``p99`` and ``p999`` in seconds."""
+
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            **{name: self.percentile(q) for name, q in _QUANTILES},
+        }
+
+
+class _Throughput:
+    # The number of events in each of the last ``window`` seconds.
+    __slots__ = ('window', 'seconds', 'counts', 'created')
+
+    def __init__(self, window: int = 60):
+        self.window: int = window
+        self.seconds: typing.List[int] = [-1] * window
+        self.counts: typing.List[int] = [0] * window
+        self.created: float = time.monotonic()
+
+    def add(self, now: float):
+        second = int(now)
+        i = second % self.window
+
+        if self.seconds[i] != second:
+            self.seconds[i] = second
+            self.counts[i] = 0
+
+        self.counts[i] += 1
+
+    def rate(self, now: float) -> float:
+        # Per second, over the window or since it was created if that is
+        # shorter.
+        second = int(now)
+        total = sum(c for s, c in zip(self.seconds, self.counts) if second - s < self.window)
+
+        return total / max(1.0, min(float(self.window), now - self.created))
+
+
+class RequestEvent:
+    """What happened to a request, passed to the hooks of a :class:`Metrics`.
+
+    Attributes
+    ----------
+    event: :class:`str`
+        One of :data:`HOOK_EVENTS`.
+    method: :class:`str`
+        The HTTP method of the request.
+    route: :class:`str`
+        The endpoint, such as ``/api/lyrics/{query}``.
+    attempt: :class:`int`
+        The number of times the request was sent, including this one.
+    status: Optional[:class:`int`]
+        The status of the response, for ``request_end``, and of the
+        failed response for ``retry`` and ``ratelimit_wait``.
+    duration: Optional[:class:`float`]
+        The number of seconds the attempt took, for ``request_end`` and
+        ``error``, or that the client waits for, for ``retry`` and
+        ``ratelimit_wait``.
+    bytes_sent: Optional[:class:`int`]
+        The size of the request body, if it is known.
+    bytes_received: Optional[:class:`int`]
+        The size of the response body, for ``request_end``.
+    error: Optional[:class:`BaseException`]
+        The exception the attempt failed with, for ``error`` and ``retry``.
+    timings: Optional[:class:`RequestTimings`]
+        How long each phase of the attempt took, for ``request_end`` and
+        ``error``.
+    """
+
+    __slots__ = ('event', 'method', 'route', 'attempt', 'status', 'duration', 'bytes_sent', 'bytes_received', 'error',
+                 'timings')
+
+    def __init__(self, event: str, method: str, route: str, attempt: int, *, status: typing.Optional[int] = None,
+                 duration: typing.Optional[float] = None, bytes_sent: typing.Optional[int] = None,
+                 bytes_received: typing.Optional[int] = None, error: typing.Optional[BaseException] = None,
+                 timings: typing.Optional[RequestTimings] = None):
+        self.event: str = event
+        self.method: str = method
+        self.route: str = get_route(route)
+        self.attempt: int = attempt
+        self.status: typing.Optional[int] = status
+        self.duration: typing.Optional[float] = duration
+        self.bytes_sent: typing.Optional[int] = bytes_sent
+        self.bytes_received: typing.Optional[int] = bytes_received
+        self.error: typing.Optional[BaseException] = error
+        self.timings: typing.Optional[RequestTimings] = timings
+
+    def __repr__(self):
+        return (f'<RequestEvent event={self.event!r} method={self.method!r} route={self.route!r} '
+                f'attempt={self.attempt} status={self.status} duration={self.duration}>')
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    # Counters are exported in full, and not rounded like by :g.
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class Metrics:
+    """Counts what a client does, and calls hooks when it happens.
+
+    Every client has one, as its ``metrics`` attribute. It counts the
+    responses by status, the errors, retries, waits for the ratelimit,
+    bytes transferred, time spent in each phase of the requests and new
+    connections of each route, which can be exported in the
+    Prometheus text format with :meth:`prometheus`.
+
+    Hooks are called with a :class:`RequestEvent`, in the thread or event
+    loop that sends the request, so they should return quickly. An
+    exception raised by a hook is turned into a :class:`RuntimeWarning`.
+
+    Parameters
+    ----------
+    prefix: Optional[:class:`str`]
+        The prefix of the names of the exported metrics. Defaults to
+        ``openrobot_api``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = SyncClient(token)
+
+        @client.metrics.hook('retry')
+        def on_retry(event):
+            print(f'Retrying {event.route} after {event.status or event.error!r}')
+
+        ...
+
+        with open('/var/lib/node_exporter/openrobot.prom', 'w') as f:
+            f.write(client.metrics.prometheus())
+    """
+
+    def __init__(self, *, prefix: str = 'openrobot_api'):
+        self.prefix: str = prefix
+
+        self._lock: threading.Lock = threading.Lock()
+        self._hooks: typing.Dict[str, typing.List[typing.Callable[[RequestEvent], typing.Any]]] = \
+            {event: [] for event in HOOK_EVENTS}
+        self._values: typing.Dict[str, typing.Dict[typing.Tuple[str, ...], float]] = {name: {} for name in _METRICS}
+        self._latencies: typing.Dict[str, LatencyHistogram] = {}
+        self._throughput: typing.Dict[str, _Throughput] = {}
+
+    def add_hook(self, event: str, func: typing.Callable[[RequestEvent], typing.Any]):
+        """Calls ``func`` with a :class:`RequestEvent` every time ``event``
+        happens.
+
+        Raises
+        ------
+        :exc:`ValueError`
+            ``event`` is not one of :data:`HOOK_EVENTS`.
+        """
+
+        if event not in self._hooks:
+            raise ValueError(f'event must be one of {", ".join(HOOK_EVENTS)}, not {event!r}.')
+
+        with self._lock:
+            self._hooks[event] = [*self._hooks[event], func]
+
+    def remove_hook(self, event: str, func: typing.Callable[[RequestEvent], typing.Any]):
+        """Stops calling a hook added by :meth:`add_hook`."""
+
+        with self._lock:
+            self._hooks[event] = [f for f in self._hooks.get(event, ()) if f != func]
+
+    def hook(self, event: str) -> typing.Callable:
+        """A decorator that adds the function as a hook of ``event``."""
+
+        def decorator(func):
+            self.add_hook(event, func)
+            return func
+
+        return decorator
+
+    def emit(self, event: RequestEvent):
+        """Counts an event, and calls its hooks."""
+
+        with self._lock:
+            self._count(event)
+            # add_hook replaces the list, so this one can be used unlocked.
+            hooks = self._hooks[event.event]
+
+        for func in hooks:
+            try:
+                func(event)
+            except Exception as e:
+                warnings.warn(f'The {event.event} hook {func!r} raised {e!r}.', RuntimeWarning)
+
+    def _inc(self, name: str, labels: typing.Tuple[str, ...], value: float = 1):
+        values = self._values[name]
+        values[labels] = values.get(labels, 0) + value
+
+    def _count(self, event: RequestEvent):
+        route = event.route
+
+        if event.event == 'request_start':
+            self._inc('requests_in_flight', (route,))
+        elif event.event in ('request_end', 'error'):
+            self._inc('requests_in_flight', (route,), -1)
+
+            if event.event == 'request_end':
+                self._inc('requests_total', (event.method, route, str(event.status)))
+
+                if route not in self._latencies:
+                    self._latencies[route] = LatencyHistogram()
+                    self._throughput[route] = _Throughput()
+
+                self._latencies[route].record(event.duration)
+                self._throughput[route].add(time.monotonic())
+            else:
+                self._inc('request_errors_total', (event.method, route, type(event.error).__name__))
+
+            if event.bytes_sent:
+                self._inc('bytes_sent_total', (route,), event.bytes_sent)
+            if event.bytes_received:
+                self._inc('bytes_received_total', (route,), event.bytes_received)
+
+            timings = event.timings
+            if timings is not None:
+                for phase in PHASES:
+                    value = getattr(timings, phase)
+                    if value is not None:
+                        self._inc('request_phase_seconds_total', (route, phase), value)
+
+                if timings.reused is not None:
+                    self._inc('connections_total', (route, 'true' if timings.reused else 'false'))
+        elif event.event == 'retry':
+            reason = str(event.status) if event.status is not None else type(event.error).__name__
+            self._inc('retries_total', (route, reason))
+        elif event.event == 'ratelimit_wait':
+            source = 'api' if event.status == 429 else 'limiter'
+            self._inc('ratelimit_waits_total', (route, source))
+            self._inc('ratelimit_wait_seconds_total', (route, source), event.duration or 0.0)
+
+    def get(self, name: str, **labels: str) -> float:
+        """Returns the value of a metric, such as ``requests_total``, summed
+        over the labels that are not given.
+
+        Example
+        -------
+        .. code-block:: python3
+
+            client.metrics.get('requests_total', route='/api/ocr', status='200')
+        """
+
+        if name not in _METRICS:
+            raise ValueError(f'Unknown metric {name!r}.')
+
+        names = _METRICS[name][2]
+
+        with self._lock:
+            return sum(value for key, value in self._values[name].items()
+                       if all(labels.get(n, v) == v for n, v in zip(names, key)))
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Returns the stats of the requests to each route under ``routes``,
+        and to all of them under ``total``.
+
+        These are the number of ``requests`` answered, the ``errors``
+        (5xx statuses and requests that failed without a response, other
+        than the cancelled ones), the ``error_rate`` among all of them,
+        the number of requests ``in_flight``, the ``throughput`` in
+        responses per second over the last minute, and the ``latency``
+        of the responses (see :meth:`LatencyHistogram.stats`).
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            # [responses, 5xx responses, failed without a response, in flight]
+            counts: typing.Dict[str, typing.List[int]] = {}
+
+            for (_, route, status), n in self._values['requests_total'].items():
+                c = counts.setdefault(route, [0, 0, 0, 0])
+                c[0] += int(n)
+                if int(status) >= 500:
+                    c[1] += int(n)
+
+            for (_, route, error), n in self._values['request_errors_total'].items():
+                if error != 'CancelledError':
+                    counts.setdefault(route, [0, 0, 0, 0])[2] += int(n)
+
+            for (route,), n in self._values['requests_in_flight'].items():
+                counts.setdefault(route, [0, 0, 0, 0])[3] += int(n)
+
+            routes = {route: self._route_stats(route, *c, now) for route, c in counts.items()}
+
+            latency = LatencyHistogram()
+            for histogram in self._latencies.values():
+                latency.merge(histogram)
+
+            total = self._totals(counts.values())
+            total['throughput'] = sum(r['throughput'] for r in routes.values())
+            total['latency'] = latency.stats()
+
+            return {'total': total, 'routes': routes}
+
+    def _route_stats(self, route: str, responses: int, server_errors: int, failed: int, in_flight: int,
+                     now: float) -> typing.Dict[str, typing.Any]:
+        throughput = self._throughput.get(route)
+        histogram = self._latencies.get(route)
+
+        return {
+            **self._totals([[responses, server_errors, failed, in_flight]]),
+            'throughput': throughput.rate(now) if throughput is not None else 0.0,
+            'latency': (histogram or LatencyHistogram()).stats(),
+        }
+
+    @staticmethod
+    def _totals(counts: typing.Iterable[typing.List[int]]) -> typing.Dict[str, typing.Any]:
+        responses, server_errors, failed, in_flight = (sum(c) for c in zip([0, 0, 0, 0], *counts))
+        sent = responses + failed
+
+        return {
+            'requests': responses,
+            'errors': server_errors + failed,
+            'error_rate': (server_errors + failed) / sent if sent else 0.0,
+            'in_flight': in_flight,
+        }
+
+    def reset(self):
+        """Sets every counter and histogram back to ``0``. The requests in
+        flight are still counted."""
+
+        with self._lock:
+            for name, values in self._values.items():
+                if _METRICS[name][0] == 'counter':
+                    values.clear()
+
+            self._latencies.clear()
+            self._throughput.clear()
+
+    def prometheus(self) -> str:
+        """Returns every metric in the Prometheus text exposition format,
+        e.g to be written to a file read by the textfile collector of the
+        node exporter, or served by a web framework that is already
+        running.
+        """
+
+        lines = []
+
+        with self._lock:
+            for name, (kind, help, names) in _METRICS.items():
+                full = f'{self.prefix}_{name}'
+                lines.append(f'# HELP {full} {help}')
+                lines.append(f'# TYPE {full} {kind}')
+
+                for key, value in sorted(self._values[name].items()):
+                    labels = ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, key))
+                    lines.append(f'{full}{{{labels}}} {_format(value)}')
+
+            # The latencies, as a summary, since the buckets of the histograms
+            # are too many to be exported.
+            full = f'{self.prefix}_request_duration_seconds'
+            lines.append(f'# HELP {full} Latency of the responses from the API.')
+            lines.append(f'# TYPE {full} summary')
+
+            for route, histogram in sorted(self._latencies.items()):
+                route = _escape(route)
+
+                for _, q in _QUANTILES:
+                    lines.append(f'{full}{{route="{route}",quantile="{q}"}} {_format(histogram.percentile(q))}')
+
+                lines.append(f'{full}_sum{{route="{route}"}} {_format(histogram.total)}')
+                lines.append(f'{full}_count{{route="{route}"}} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,251 @@
+import io
+import threading
+import typing
+import warnings
+
+from .error import UnsupportedImage
+from .upload import Upload
+
+# The magic numbers of the image formats the API accepts.
+_SIGNATURES = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+    (b'BM', 'BMP'),
+    (b'II*\x00', 'TIFF'),
+    (b'MM\x00*', 'TIFF'),
+)
+
+
+def sniff_format(head: bytes) -> typing.Optional[str]:
+    """Returns the format of an image from its first bytes, such as
+    ``JPEG`` or ``PNG``, or ``None`` if it is not recognized."""
+
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WEBP'
+
+    for signature, format in _SIGNATURES:
+        if head.startswith(signature):
+            return format
+
+    return None
+
+
+class PreprocessedImage:
+    """An image after it went through an :class:`ImagePreprocessor`.
+
+    Attributes
+    ----------
+    upload: :class:`Upload`
+        What is sent to the API. This is the original image if it did not
+        need to be changed.
+    format: Optional[:class:`str`]
+        The format of the original image.
+    original_size: Optional[Tuple[:class:`int`, :class:`int`]]
+        The width and height of the original image.
+    size: Optional[Tuple[:class:`int`, :class:`int`]]
+        The width and height of the image that is sent.
+    bytes_saved: :class:`int`
+        How many bytes smaller the image that is sent is.
+    """
+
+    def __init__(self, upload: Upload, format: typing.Optional[str] = None,
+                 original_size: typing.Optional[typing.Tuple[int, int]] = None,
+                 size: typing.Optional[typing.Tuple[int, int]] = None, bytes_saved: int = 0):
+        self.upload: Upload = upload
+        self.format: typing.Optional[str] = format
+        self.original_size: typing.Optional[typing.Tuple[int, int]] = original_size
+        self.size: typing.Optional[typing.Tuple[int, int]] = size or original_size
+        self.bytes_saved: int = bytes_saved
+
+    @property
+    def resized(self) -> bool:
+        """:class:`bool`: Whether the image was downscaled."""
+        return self.size != self.original_size
+
+    def restore(self, route: str, js: typing.Any) -> typing.Any:
+        """Maps the pixel coordinates of a response back to the original
+        image. The response is not modified, a new one is returned."""
+
+        if not self.resized or route != '/api/celebrity' or not isinstance(js, dict):
+            return js
+
+        scale_x = self.original_size[0] / self.size[0]
+        scale_y = self.original_size[1] / self.size[1]
+
+        def scale(rectangle):
+            return {
+                **rectangle,
+                'left': rectangle['left'] * scale_x,
+                'top': rectangle['top'] * scale_y,
+                'width': rectangle['width'] * scale_x,
+                'height': rectangle['height'] * scale_y,
+            }
+
+        celebrities = [{**celebrity, 'face_rectangle': scale(celebrity['face_rectangle'])}
+                       for celebrity in js.get('celebrities', [])]
+
+        return {**js, 'celebrities': celebrities}
+
+
+class ImagePreprocessor:
+    """Shrinks the images sent to the image endpoints before uploading them.
+
+    The format of an image is checked from its first bytes, and images
+    that are too big or in a format the API does not accept are rejected
+    with :exc:`UnsupportedImage` without a request being made. Images
+    larger than ``max_dimension`` are then downscaled and re-encoded.
+    The face rectangles returned by ``celebrity`` are mapped back to the
+    pixels of the original image.
+
+    This requires Pillow, which is installed by the ``images`` extra.
+
+    Parameters
+    ----------
+    max_dimension: Optional[:class:`int`]
+        The maximum width and height of the images that are sent. ``None``
+        never downscales. Defaults to ``1600``.
+    quality: Optional[:class:`int`]
+        The JPEG quality of the re-encoded images. Defaults to ``85``.
+    max_bytes: Optional[:class:`int`]
+        The maximum size of the original images. Defaults to 50 MiB.
+    max_pixels: Optional[:class:`int`]
+        The maximum number of pixels of the original images, checked from
+        their header before they are decoded. If this is ``None``, it is
+        Pillow's ``Image.MAX_IMAGE_PIXELS`` (about 89 million pixels),
+        over which Pillow considers an image a decompression bomb.
+        Defaults to ``None``.
+    formats: Optional[Iterable[:class:`str`]]
+        The accepted formats. Defaults to ``JPEG``, ``PNG``, ``GIF``,
+        ``BMP``, ``TIFF`` and ``WEBP``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = SyncClient(token, preprocess=ImagePreprocessor(max_dimension=1024))
+    """
+
+    def __init__(self, max_dimension: typing.Optional[int] = 1600, *, quality: int = 85,
+                 max_bytes: int = 50 * 1024 * 1024, max_pixels: typing.Optional[int] = None,
+                 formats: typing.Iterable[str] = ('JPEG', 'PNG', 'GIF', 'BMP', 'TIFF', 'WEBP')):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError('Pillow is required to pre-process images. Install the images extra, '
+                              'or run `pip install Pillow`.') from None
+
+        self.max_dimension: typing.Optional[int] = max_dimension
+        self.quality: int = quality
+        self.max_bytes: int = max_bytes
+        self.max_pixels: typing.Optional[int] = max_pixels if max_pixels is not None else Image.MAX_IMAGE_PIXELS
+        self.formats: typing.FrozenSet[str] = frozenset(f.upper() for f in formats)
+
+        self._lock: threading.Lock = threading.Lock()
+
+        self.images: int = 0
+        self.resized: int = 0
+        self.rejected: int = 0
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+
+    def _reject(self, reason: str):
+        with self._lock:
+            self.rejected += 1
+
+        raise UnsupportedImage(reason)
+
+    def process(self, upload: Upload) -> PreprocessedImage:
+        """Checks and shrinks an image. This blocks while the image is
+        decoded and encoded.
+
+        Images that can't be read without consuming them (e.g an async
+        iterable) are only checked for their size, if it is known.
+
+        Raises
+        ------
+        :exc:`UnsupportedImage`
+            The image is too big or in a format that is not accepted.
+        """
+
+        if upload.size is not None and upload.size > self.max_bytes:
+            self._reject(f'The image is {upload.size} bytes, over the limit of {self.max_bytes} bytes.')
+
+        head = upload.peek(16)
+        if head is None:
+            return PreprocessedImage(upload)
+
+        format = sniff_format(head)
+        if format is None or format not in self.formats:
+            self._reject(f'Unsupported image format: {format or "unknown"}.')
+
+        from PIL import Image
+
+        with upload.open() as f:
+            try:
+                # This only reads the header. Pillow's warning about large
+                # images is left to max_pixels, which is checked right after.
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+                    image = Image.open(f)
+
+                original_size = image.size
+
+                if self.max_pixels is not None and image.width * image.height > self.max_pixels:
+                    self._reject(f'The image has {image.width * image.height} pixels, over the limit of {self.max_pixels}.')
+
+                if self.max_dimension is None or max(image.size) <= self.max_dimension:
+                    self._count(upload.size, upload.size, False)
+                    return PreprocessedImage(upload, format, original_size)
+
+                # JPEGs can be decoded at a fraction of their size directly,
+                # which is much faster than decoding them fully first.
+                image.draft(None, (self.max_dimension, self.max_dimension))
+                image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                self._reject(f'The image can\'t be read: {e}')
+
+            out = io.BytesIO()
+
+            if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+                image.save(out, 'PNG', optimize=True)
+            else:
+                if image.mode not in ('RGB', 'L'):
+                    image = image.convert('RGB')
+
+                # Keeps the orientation, so that the API sees the same image.
+                image.save(out, 'JPEG', quality=self.quality, optimize=True, exif=image.info.get('exif', b''))
+
+        size = out.getbuffer().nbytes
+
+        if upload.size is not None and size >= upload.size:
+            # Not worth it, the original is sent instead.
+            self._count(upload.size, upload.size, False)
+            return PreprocessedImage(upload, format, original_size)
+
+        self._count(upload.size, size, True)
+
+        return PreprocessedImage(Upload(out.getbuffer(), field=upload.field, filename=upload.filename), format,
+                                 original_size, image.size, (upload.size or size) - size)
+
+    def _count(self, bytes_in: typing.Optional[int], bytes_out: typing.Optional[int], resized: bool):
+        with self._lock:
+            self.images += 1
+            self.resized += resized
+            self.bytes_in += bytes_in or 0
+            self.bytes_out += bytes_out or 0
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Returns the ``images``, ``resized`` and ``rejected`` counters, and
+        the ``bytes_in``, ``bytes_out`` and ``bytes_saved`` by downscaling."""
+
+        with self._lock:
+            return {
+                'images': self.images,
+                'resized': self.resized,
+                'rejected': self.rejected,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'bytes_saved': self.bytes_in - self.bytes_out,
+            }
@@ -0,0 +1,522 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import typing
+from .timeout import Deadline
+from .utils import get_route
+
+
+class SQLiteBackend:
+    """A rate limit backend shared by every process on a host.
+
+    The buckets are stored in a local SQLite file and updated in an
+    ``IMMEDIATE`` transaction, so gunicorn/Celery workers and any
+    other processes using the same file are paced as a whole instead
+    of each overshooting the quota on its own.
+
+    Parameters
+    ----------
+    path: Optional[:class:`str`]
+        The path of the SQLite file. Every process that should share the
+        limits must use the same path. Defaults to
+        ``~/.openrobot/api/ratelimit.sqlite3``, which only the current user
+        can read and write, so that other users of the host can't lock it
+        to stall the processes using it.
+    timeout: Optional[:class:`float`]
+        The number of seconds to wait for another process to release the
+        file lock. Defaults to ``5``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        backend = SQLiteBackend('/var/run/openrobot/ratelimit.sqlite3')
+        limiter = RateLimiter(10, backend=backend)
+    """
+
+    def __init__(self, path: typing.Optional[str] = None, *, timeout: float = 5.0):
+        self.path: str = path or self._default_path()
+        self.timeout: float = timeout
+
+        self._local: threading.local = threading.local()
+
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, last REAL NOT NULL)')
+
+    @staticmethod
+    def _default_path() -> str:
+        # Next to the credentials of OpenRobot-CLI, in a directory and a file
+        # only the user has access to.
+        directory = os.path.join(os.path.expanduser('~/.openrobot'), 'api')
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        path = os.path.join(directory, 'ratelimit.sqlite3')
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+
+        return path
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, and must
+        # not be reused by a forked child.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        return conn
+
+    def _update(self, key: str, rate: float, burst: int, func: typing.Callable[[float], float]) -> float:
+        conn = self._connect()
+        # Wall clock time, as monotonic clocks can't be compared between processes.
+        now = time.time()
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, last FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = float(burst) if row is None else min(float(burst), row[0] + max(0.0, now - row[1]) * rate)
+
+            tokens = func(tokens)
+
+            conn.execute('INSERT OR REPLACE INTO buckets (key, tokens, last) VALUES (?, ?, ?)', (key, tokens, now))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+        return tokens
+
+    def reserve(self, key: str, rate: float, burst: int, cost: float = 1) -> float:
+        """Reserves ``cost`` tokens from the bucket ``key``.
+
+        Returns
+        -------
+        :class:`float`
+            The number of seconds the caller has to wait.
+        """
+
+        tokens = self._update(key, rate, burst, lambda tokens: tokens - cost)
+
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    def refund(self, key: str, rate: float, burst: int, cost: float = 1):
+        """Gives back ``cost`` tokens reserved from the bucket ``key``."""
+
+        self._update(key, rate, burst, lambda tokens: min(float(burst), tokens + cost))
+
+    def drain(self, key: str, rate: float, burst: int, seconds: float):
+        """Empties the bucket ``key`` so that nothing is let through for ``seconds``."""
+
+        self._update(key, rate, burst, lambda tokens: min(tokens, -seconds * rate))
+
+
+class TokenBucket:
+    """A token bucket.
+
+    Requests reserve a token and are told how long they have to wait
+    for it. The bucket is allowed to go into debt, so every caller gets
+    its own place in the queue and callers never have to retry.
+
+    Parameters
+    ----------
+    rate: :class:`float`
+        The number of requests allowed per ``per`` seconds.
+    per: Optional[:class:`float`]
+        The period in seconds ``rate`` applies to. Defaults to ``1``.
+    burst: Optional[:class:`int`]
+        The maximum number of requests that can be made at once after
+        the bucket has been idle. Defaults to ``rate`` (at least ``1``).
+    backend: Optional[:class:`SQLiteBackend`]
+        Where the bucket's state is kept. If this is ``None``, it is kept
+        in this process. Defaults to ``None``.
+    key: Optional[:class:`str`]
+        The name of the bucket in ``backend``. Defaults to ``None``.
+
+    Attributes
+    ----------
+    rate: :class:`float`
+        The number of requests allowed per ``per`` seconds.
+    per: :class:`float`
+        The period in seconds ``rate`` applies to.
+    burst: :class:`int`
+        The size of the bucket.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, *, burst: typing.Optional[int] = None,
+                 backend: typing.Optional[SQLiteBackend] = None, key: typing.Optional[str] = None):
+        if rate <= 0 or per <= 0:
+            raise ValueError('rate and per must be greater than 0.')
+
+        self.rate: float = float(rate)
+        self.per: float = float(per)
+        self.burst: int = int(burst if burst is not None else max(1, rate))
+
+        self._tokens: float = float(self.burst)
+        self._last: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+        self._backend: typing.Optional[SQLiteBackend] = backend
+        # The rate is part of the key, so that processes configured with
+        # different limits don't share a bucket by accident.
+        self._key: str = f'{key or "bucket"}:{self.rate}/{self.per}:{self.burst}'
+
+    @property
+    def refill_rate(self) -> float:
+        """:class:`float`: The number of tokens added per second."""
+        return self.rate / self.per
+
+    def reserve(self, cost: float = 1) -> float:
+        """Reserves ``cost`` tokens.
+
+        Returns
+        -------
+        :class:`float`
+            The number of seconds the caller has to wait before its
+            reservation is valid. ``0`` if it can go right away.
+        """
+
+        if self._backend is not None:
+            return self._backend.reserve(self._key, self.refill_rate, self.burst, cost)
+
+        with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(float(self.burst), self._tokens + (now - self._last) * self.refill_rate)
+            self._last = now
+            self._tokens -= cost
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self.refill_rate
+
+    def refund(self, cost: float = 1):
+        """Gives back ``cost`` tokens reserved with :meth:`reserve`, e.g for
+        a request that was not sent after all."""
+
+        if self._backend is not None:
+            return self._backend.refund(self._key, self.refill_rate, self.burst, cost)
+
+        with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(float(self.burst), self._tokens + (now - self._last) * self.refill_rate + cost)
+            self._last = now
+
+    def drain(self, seconds: float):
+        """Empties the bucket so that nothing is let through for ``seconds``.
+
+        This is used when the API responds with a 429 anyway, e.g because
+        it is shared with someone else.
+        """
+
+        if self._backend is not None:
+            return self._backend.drain(self._key, self.refill_rate, self.burst, seconds)
+
+        with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(float(self.burst), self._tokens + (now - self._last) * self.refill_rate,
+                               -seconds * self.refill_rate)
+            self._last = now
+
+
+class _Reservation:
+    # A reservation made in the executor for a coroutine. If the coroutine
+    # is cancelled before it is made, it is given back right away.
+
+    def __init__(self, limiter: 'RateLimiter', route: str):
+        self.limiter: RateLimiter = limiter
+        self.route: str = route
+
+        self._lock: threading.Lock = threading.Lock()
+        self._made: bool = False
+        self._abandoned: bool = False
+
+    def make(self) -> float:
+        delay = self.limiter.reserve(self.route)
+
+        with self._lock:
+            self._made = True
+            abandoned = self._abandoned
+
+        if abandoned:
+            self.limiter.release(self.route)
+
+        return delay
+
+    def abandon(self) -> bool:
+        # Returns whether the reservation was already made, in which case
+        # the caller has to give it back.
+        with self._lock:
+            self._abandoned = True
+            return self._made
+
+
+class RateLimiter:
+    """A client-side rate limiter.
+
+    This paces the requests before they are sent, so the API's
+    ratelimit (and its 429s) is never hit in the first place. It is
+    safe to share between threads and coroutines, and between a
+    :class:`SyncClient` and an :class:`AsyncClient`.
+
+    Parameters
+    ----------
+    rate: Optional[:class:`float`]
+        The number of requests allowed per ``per`` seconds across all
+        endpoints. If this is ``None``, only the per-endpoint limits
+        apply. Defaults to ``None``.
+    per: Optional[:class:`float`]
+        The period in seconds ``rate`` applies to. Defaults to ``1``.
+    burst: Optional[:class:`int`]
+        The global burst size. Defaults to ``rate``.
+    endpoints: Optional[Dict[:class:`str`, Union[:class:`float`, Tuple[:class:`float`, :class:`float`], :class:`TokenBucket`]]]
+        Per-endpoint limits, keyed by the route such as ``/api/ocr``.
+        A value can be a rate per second, a ``(rate, per)`` tuple or a
+        :class:`TokenBucket`. Defaults to ``None``.
+    backend: Optional[:class:`SQLiteBackend`]
+        Shares the limits with every other process using the same
+        backend. If this is ``None``, the limits only apply to this
+        process. Defaults to ``None``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        limiter = RateLimiter(10, endpoints={'/api/ocr': (1, 2)})
+        client = SyncClient(token, ratelimiter=limiter)
+    """
+
+    def __init__(self, rate: typing.Optional[float] = None, per: float = 1.0, *, burst: typing.Optional[int] = None,
+                 endpoints: typing.Optional[typing.Dict[str, typing.Any]] = None,
+                 backend: typing.Optional[SQLiteBackend] = None):
+        self.backend: typing.Optional[SQLiteBackend] = backend
+
+        self._global: typing.Optional[TokenBucket] = TokenBucket(rate, per, burst=burst, backend=backend,
+                                                                 key='*') if rate is not None else None
+        self._endpoints: typing.Dict[str, TokenBucket] = {}
+
+        for endpoint, limit in (endpoints or {}).items():
+            if isinstance(limit, TokenBucket):
+                self._endpoints[self._normalize(endpoint)] = limit
+            elif isinstance(limit, (tuple, list)):
+                self.limit(endpoint, *limit)
+            else:
+                self.limit(endpoint, limit)
+
+        self._stats_lock: threading.Lock = threading.Lock()
+        self._stats: typing.Dict[str, typing.Dict[str, float]] = {}
+        self._waiting: int = 0
+
+    @staticmethod
+    def _normalize(endpoint: str) -> str:
+        endpoint = '/' + str(endpoint).strip('/')
+        if not endpoint.startswith('/api/') and endpoint != '/api':
+            endpoint = '/api' + endpoint
+
+        return endpoint
+
+    def limit(self, endpoint: str, rate: float, per: float = 1.0, *, burst: typing.Optional[int] = None):
+        """Sets the limit of an endpoint.
+
+        Parameters
+        ----------
+        endpoint: :class:`str`
+            The route, such as ``/api/ocr`` or ``/api/lyrics``. This also
+            applies to all the sub-routes, e.g ``/api/lyrics/{query}``.
+        rate: :class:`float`
+            The number of requests allowed per ``per`` seconds.
+        per: Optional[:class:`float`]
+            The period in seconds ``rate`` applies to. Defaults to ``1``.
+        burst: Optional[:class:`int`]
+            The burst size. Defaults to ``rate``.
+        """
+
+        endpoint = self._normalize(endpoint)
+        self._endpoints[endpoint] = TokenBucket(rate, per, burst=burst, backend=self.backend, key=endpoint)
+
+    def _find(self, route: str) -> typing.Optional[str]:
+        route = route.split('?', 1)[0].rstrip('/')
+
+        while route:
+            if route in self._endpoints:
+                return route
+
+            route = route.rsplit('/', 1)[0]
+
+        return None
+
+    def reserve(self, route: str) -> float:
+        """Reserves a request for a route without waiting.
+
+        Returns
+        -------
+        :class:`float`
+            The number of seconds the request has to wait before it can
+            be sent.
+        """
+
+        delay = self._global.reserve() if self._global is not None else 0.0
+
+        endpoint = self._find(route)
+        if endpoint is not None:
+            delay = max(delay, self._endpoints[endpoint].reserve())
+
+        self._record(endpoint or get_route(route), delay)
+
+        return delay
+
+    def release(self, route: str):
+        """Gives back a request reserved with :meth:`reserve` that won't be
+        sent, so that the requests after it don't wait for it."""
+
+        if self._global is not None:
+            self._global.refund()
+
+        endpoint = self._find(route)
+        if endpoint is not None:
+            self._endpoints[endpoint].refund()
+
+    def penalize(self, route: str, retry_after: float):
+        """Holds back every request to the route for ``retry_after`` seconds.
+
+        The clients call this when they get a 429 despite the limiter,
+        so that the other threads, coroutines and (with a shared
+        ``backend``) processes wait as well instead of hitting it too.
+        """
+
+        if self._global is not None:
+            self._global.drain(retry_after)
+
+        endpoint = self._find(route)
+        if endpoint is not None:
+            self._endpoints[endpoint].drain(retry_after)
+
+    def _record(self, endpoint: str, delay: float):
+        with self._stats_lock:
+            stats = self._stats.setdefault(endpoint, {'requests': 0, 'delayed': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+
+            stats['requests'] += 1
+            if delay > 0:
+                stats['delayed'] += 1
+                stats['total_wait'] += delay
+                stats['max_wait'] = max(stats['max_wait'], delay)
+
+    def _enter_wait(self, delta: int):
+        with self._stats_lock:
+            self._waiting += delta
+
+    def acquire(self, route: str, *, deadline: typing.Optional[Deadline] = None) -> float:
+        """Waits until a request to the route is allowed to be sent.
+
+        If the wait would go past ``deadline``, :exc:`DeadlineExceeded` is
+        raised right away instead. The request is given back if it is not
+        sent, i.e on this error or when the wait is interrupted.
+
+        Returns
+        -------
+        :class:`float`
+            The number of seconds that was waited.
+        """
+
+        delay = self.reserve(route)
+
+        try:
+            if deadline is not None:
+                deadline.check(delay)
+
+            if delay > 0:
+                self._enter_wait(1)
+                try:
+                    time.sleep(delay)
+                finally:
+                    self._enter_wait(-1)
+        except BaseException:
+            self.release(route)
+            raise
+
+        return delay
+
+    async def acquire_async(self, route: str, *, deadline: typing.Optional[Deadline] = None) -> float:
+        """|coro|
+
+        Waits until a request to the route is allowed to be sent.
+
+        If the wait would go past ``deadline``, :exc:`DeadlineExceeded` is
+        raised right away instead. The request is given back if it is not
+        sent, i.e on this error or when the wait is interrupted.
+
+        Returns
+        -------
+        :class:`float`
+            The number of seconds that was waited.
+        """
+
+        if self.backend is not None:
+            # Don't block the event loop while another process holds the file lock.
+            reservation = _Reservation(self, route)
+            try:
+                delay = await asyncio.get_running_loop().run_in_executor(None, reservation.make)
+            except asyncio.CancelledError:
+                if reservation.abandon():
+                    self._release_soon(route)
+                raise
+        else:
+            delay = self.reserve(route)
+
+        try:
+            if deadline is not None:
+                deadline.check(delay)
+
+            if delay > 0:
+                self._enter_wait(1)
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    self._enter_wait(-1)
+        except BaseException:
+            self._release_soon(route)
+            raise
+
+        return delay
+
+    def _release_soon(self, route: str):
+        # Gives the request back from a coroutine, in the executor if it is
+        # in the backend, without waiting as the coroutine may be cancelled.
+        if self.backend is None:
+            self.release(route)
+        else:
+            asyncio.get_running_loop().run_in_executor(None, self.release, route)
+
+    @property
+    def waiting(self) -> int:
+        """:class:`int`: The number of requests currently waiting in the queue."""
+        return self._waiting
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Returns how long requests waited in the limiter's queue.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            ``requests``, ``delayed``, ``total_wait`` and ``max_wait``
+            (in seconds) in total and for each endpoint under
+            ``endpoints``, and the number of requests ``waiting`` right
+            now.
+        """
+
+        with self._stats_lock:
+            endpoints = {k: dict(v) for k, v in self._stats.items()}
+
+            total = {'requests': 0, 'delayed': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+            for stats in endpoints.values():
+                total['requests'] += stats['requests']
+                total['delayed'] += stats['delayed']
+                total['total_wait'] += stats['total_wait']
+                total['max_wait'] = max(total['max_wait'], stats['max_wait'])
+
+            return {**total, 'waiting': self._waiting, 'endpoints': endpoints}
@@ -1,21 +1,120 @@
+import time
 import typing
 
 
+class _lazy:
+    # An attribute built from the raw JSON the first time it is accessed,
+    # then cached in the _<name> slot. Nested objects are built this way,
+    # so that e.g reading only the status of many results stays cheap.
+    # It can still be assigned, like the attributes were before.
+
+    def __init__(self, func: typing.Callable[[typing.Any], typing.Any]):
+        self.func = func
+        self.slot: str = '_' + func.__name__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.func(instance)
+            setattr(instance, self.slot, value)
+
+            return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, value)
+
+
 class OpenRobotAPIBaseResult:
     """
     The base result of the API.
     
     Attributes
     ----------
-    raw: :class:`dict`
-        The raw data given by the API.
+    raw: Optional[:class:`dict`]
+        The raw data given by the API. ``None`` if the client was
+        created with ``keep_raw=False``.
     """
 
-    def __init__(self, js):
+    __slots__ = ('raw',)
+
+    # The names of the lazy attributes, built right away when the raw
+    # data is not kept.
+    _lazy_attributes: typing.Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        cls._lazy_attributes = tuple(name for klass in cls.__mro__ for name, value in vars(klass).items()
+                                     if isinstance(value, _lazy))
+
+    def __init__(self, js, *, keep_raw: bool = True):
         self.raw = js
 
+        if not keep_raw:
+            for name in self._lazy_attributes:
+                getattr(self, name)
+
+            self.raw = None
+
+
+class OpenRobotAPITaskResult(OpenRobotAPIBaseResult):
+    """
+    The base result of a task-based endpoint, whose result may not be
+    ready yet.
+    """
+
+    __slots__ = ('_client', '_submitted')
+
+    _task_method: str = ''
 
-class TextGenerationResult(OpenRobotAPIBaseResult):
+    def __init__(self, js, *, client=None, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
+
+        self._client = client
+        self._submitted: float = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        """:class:`bool`: Whether the task has finished, i.e its status is
+        ``COMPLETED`` or ``FAILED``."""
+        return self.status not in ('STARTED', 'PENDING')
+
+    def wait(self, timeout: typing.Optional[float] = None):
+        """|maybecoro|
+
+        Waits for the task to finish, by polling it with exponential
+        backoff. The first poll is made around when tasks of this
+        endpoint usually finish.
+
+        This function is a coroutine if the result came from an
+        :class:`AsyncClient`, else it would be a synchronous method.
+
+        Parameters
+        ----------
+        timeout: Optional[:class:`float`]
+            The maximum number of seconds to wait for. Defaults to ``None``.
+
+        Raises
+        ------
+        :exc:`TimeoutError`
+            The task did not finish in ``timeout`` seconds.
+
+        Returns
+        -------
+        The finished result, of the same type as this one.
+        """
+
+        if self._client is None:
+            raise RuntimeError('This result is not bound to a client.')
+
+        return self._client._wait_task(self, timeout=timeout)
+
+
+class TextGenerationResult(OpenRobotAPITaskResult):
     """
     The result of the /api/text-generation endpoint.
 
@@ -39,18 +138,24 @@ class TextGenerationResult(OpenRobotAPIBaseResult):
         The timestamp at which the request was made.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('task_id', 'text', 'max_length', 'num_return', 'status', 'timestamp', '_result')
+
+    _task_method = 'text_generation'
+
+    def __init__(self, js, *, client=None, keep_raw: bool = True):
+        super().__init__(js, client=client, keep_raw=keep_raw)
 
         self.task_id: str = js["task_id"]
         self.text: str = js["text"]
         self.max_length: int = js["max_length"]
         self.num_return: int = js["num_return"]
         self.status: str = js["status"]
-        self.result: typing.Optional[typing.List[str]] = [x["generated_text"] for x in js["result"]] if js[
-            "result"] else None
         self.timestamp: float = js["timestamp"]
 
+    @_lazy
+    def result(self) -> typing.Optional[typing.List[str]]:
+        return [x["generated_text"] for x in self.raw["result"]] if self.raw["result"] else None
+
 
 class SentimentResultReturned:
     """
@@ -64,12 +169,14 @@ class SentimentResultReturned:
         The score of the sentiment.
     """
 
+    __slots__ = ('label', 'score')
+
     def __init__(self, js):
         self.label: str = js["label"]
         self.score: float = js["score"]
 
 
-class SentimentResult(OpenRobotAPIBaseResult):
+class SentimentResult(OpenRobotAPITaskResult):
     """
     The resullt of the /api/sentiment endpoint.
 
@@ -89,17 +196,24 @@ class SentimentResult(OpenRobotAPIBaseResult):
         The timestamp at which the request was made.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('task_id', 'text', 'status', 'timestamp', '_result')
+
+    _task_method = 'sentiment'
+
+    def __init__(self, js, *, client=None, keep_raw: bool = True):
+        super().__init__(js, client=client, keep_raw=keep_raw)
 
         self.task_id: str = js["task_id"]
         self.text: str = js["text"]
         self.status: str = js["status"]
-        self.result: typing.List[SentimentResultReturned] = [SentimentResultReturned(x) for x in js["result"]]
         self.timestamp: float = js["timestamp"]
 
+    @_lazy
+    def result(self) -> typing.List[SentimentResultReturned]:
+        return [SentimentResultReturned(x) for x in self.raw["result"]]
+
 
-class SummarizationResult(OpenRobotAPIBaseResult):
+class SummarizationResult(OpenRobotAPITaskResult):
     """
     The result of the /api/summarization endpoint.
 
@@ -123,8 +237,12 @@ class SummarizationResult(OpenRobotAPIBaseResult):
         The timestamp at which the request was made.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('task_id', 'text', 'max_length', 'num_return', 'status', 'result', 'timestamp')
+
+    _task_method = 'summarization'
+
+    def __init__(self, js, *, client=None, keep_raw: bool = True):
+        super().__init__(js, client=client, keep_raw=keep_raw)
 
         self.task_id: str = js["task_id"]
         self.text: str = js["text"]
@@ -147,6 +265,8 @@ class LyricImages:
         The track image. ``None`` if not found.
     """
 
+    __slots__ = ('background', 'track')
+
     def __init__(self, js):
         self.background: typing.Optional[str] = js.get('background')
         self.track: typing.Optional[str] = js.get('track')
@@ -168,14 +288,18 @@ class LyricResult(OpenRobotAPIBaseResult):
         Represents The Lyric's Track Images.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('title', 'artist', 'lyrics', '_images')
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.title: str = js['title']
         self.artist: str = js['artist']
         self.lyrics: str = js['lyrics']
 
-        self.images = LyricImages(js.get('images', {}))
+    @_lazy
+    def images(self) -> LyricImages:
+        return LyricImages(self.raw.get('images', {}))
 
 
 class NSFWCheckAdult:
@@ -190,6 +314,8 @@ class NSFWCheckAdult:
         The adult score for the image from 0 to 1.
     """
 
+    __slots__ = ('is_adult', 'adult_score')
+
     def __init__(self, js):
         self.is_adult: bool = js['is_adult']
         self.adult_score: float = js['adult_score']
@@ -207,6 +333,8 @@ class NSFWCheckRacy:
         The racy score for the image from 0 to 1.
     """
 
+    __slots__ = ('is_racy', 'racy_score')
+
     def __init__(self, js):
         self.is_racy: bool = js['is_racy']
         self.racy_score: float = js['racy_score']
@@ -224,6 +352,8 @@ class NSFWCheckGore:
         The gore score for the image from 0 to 1.
     """
 
+    __slots__ = ('is_gore', 'gore_score')
+
     def __init__(self, js):
         self.is_gore: bool = js['is_gore']
         self.gore_score: float = js['gore_score']
@@ -243,13 +373,24 @@ class NSFWCheckResult(OpenRobotAPIBaseResult):
         Checks if the image is gore content.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('image_url', '_adult', '_racy', '_gore')
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.image_url = js['image_url']
-        self.adult = NSFWCheckAdult(js['adult'])
-        self.racy = NSFWCheckRacy(js['racy'])
-        self.gore = NSFWCheckGore(js['gore'])
+
+    @_lazy
+    def adult(self) -> NSFWCheckAdult:
+        return NSFWCheckAdult(self.raw['adult'])
+
+    @_lazy
+    def racy(self) -> NSFWCheckRacy:
+        return NSFWCheckRacy(self.raw['racy'])
+
+    @_lazy
+    def gore(self) -> NSFWCheckGore:
+        return NSFWCheckGore(self.raw['gore'])
 
 
 class DescriptionCaption:
@@ -264,6 +405,8 @@ class DescriptionCaption:
         The confidence of the caption.
     """
 
+    __slots__ = ('text', 'confidence')
+
     def __init__(self, js):
         self.text: str = js['text']
         self.confidence: float = js['confidence']
@@ -281,11 +424,16 @@ class DescriptionResult(OpenRobotAPIBaseResult):
         The captions generated for the image
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('tags', '_captions')
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.tags = js['tags']
-        self.captions = [DescriptionCaption(x) for x in js['captions']]
+
+    @_lazy
+    def captions(self) -> typing.List[DescriptionCaption]:
+        return [DescriptionCaption(x) for x in self.raw['captions']]
 
 
 class CelebrityFaceRectangle:
@@ -304,6 +452,8 @@ class CelebrityFaceRectangle:
         Height measured from the top-left point of the face, in pixels.
     """
 
+    __slots__ = ('left', 'top', 'width', 'height')
+
     def __init__(self, js):
         self.left: typing.Union[int, float] = js['left']
         self.top: typing.Union[int, float] = js['top']
@@ -325,12 +475,17 @@ class CelebrityResult(OpenRobotAPIBaseResult):
         The face rectangle of the Celebrity.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('name', 'confidence', '_face_rectangle')
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.name: str = js['name']
         self.confidence: typing.Union[int, float] = js['confidence']
-        self.face_rectangle: CelebrityFaceRectangle = CelebrityFaceRectangle(js['face_rectangle'])
+
+    @_lazy
+    def face_rectangle(self) -> CelebrityFaceRectangle:
+        return CelebrityFaceRectangle(self.raw['face_rectangle'])
 
 
 class SpeechToTextResult(OpenRobotAPIBaseResult):
@@ -346,8 +501,10 @@ class SpeechToTextResult(OpenRobotAPIBaseResult):
         seconds.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('text', 'duration')
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.text: str = js['text']
         self.duration: typing.Union[int, float] = js['duration']
@@ -363,8 +520,10 @@ class TextToSpeechResult(OpenRobotAPIBaseResult):
         The URL of the speech
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('url',)
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.url: str = js['url']
 
@@ -381,6 +540,8 @@ class TextToSpeechSupportLanguage:
         The human-readable language name.
     """
 
+    __slots__ = ('code', 'name')
+
     def __init__(self, js):
         self.code: str = js.get('code')
         self.name: str = js.get('name')
@@ -402,6 +563,8 @@ class TextToSpeechSupportVoice:
         The Voice's name.
     """
 
+    __slots__ = ('gender', 'id', 'language', 'name')
+
     def __init__(self, js):
         self.gender: str = js.get('Gender')
         self.id: str = js.get('Id')
@@ -422,11 +585,16 @@ class TextToSpeechSupportResult(OpenRobotAPIBaseResult):
         The supported voices for Text To Speech.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('languages', '_voices')
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.languages: typing.List[str] = js['languages']
-        self.voices: typing.List[TextToSpeechSupportVoice] = [TextToSpeechSupportVoice(voice) for voice in js['voices']]
+
+    @_lazy
+    def voices(self) -> typing.List[TextToSpeechSupportVoice]:
+        return [TextToSpeechSupportVoice(voice) for voice in self.raw['voices']]
 
 
 class OCRResult(OpenRobotAPIBaseResult):
@@ -439,8 +607,10 @@ class OCRResult(OpenRobotAPIBaseResult):
         The OCR Result.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('text',)
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.text: str = js['text']
 
@@ -461,8 +631,10 @@ class TranslateResult(OpenRobotAPIBaseResult):
         The original text.
     """
 
-    def __init__(self, js):
-        super().__init__(js)
+    __slots__ = ('to', 'text', 'source', 'before')
+
+    def __init__(self, js, *, keep_raw: bool = True):
+        super().__init__(js, keep_raw=keep_raw)
 
         self.to: str = js[0]['to']
         self.text: str = js[0]['text']
@@ -0,0 +1,157 @@
+import random
+import threading
+import time
+import typing
+
+# The methods that can be sent again without changing the outcome.
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+
+class RetryPolicy:
+    """Which failed requests to retry, and how.
+
+    A request is retried when the API answers with one of ``statuses``,
+    or when sending it raises one of ``exceptions`` (e.g the connection
+    dropped or timed out). The delays grow exponentially with full
+    jitter, so that clients that failed together don't retry together,
+    and a ``Retry-After`` header sent with the error is honored.
+
+    Only the idempotent methods are retried by default, as a ``POST``
+    (e.g an upload to :meth:`ocr`) that failed might still have been
+    handled, and sending it again would submit it twice.
+
+    429s are not affected by this, they are handled by the
+    ``handle_ratelimit`` and ``tries`` options of the client.
+
+    Parameters
+    ----------
+    max_attempts: Optional[:class:`int`]
+        The maximum number of times a request is sent, including the
+        first one. ``1`` never retries. Defaults to ``3``.
+    statuses: Optional[Iterable[:class:`int`]]
+        The statuses to retry. Defaults to ``500``, ``502``, ``503`` and
+        ``504``.
+    exceptions: Optional[Iterable[Type[:class:`BaseException`]]]
+        The exceptions to retry. If this is ``None``, the connection
+        errors and timeouts of the client's HTTP library are retried.
+        Defaults to ``None``.
+    initial: Optional[:class:`float`]
+        The maximum delay in seconds before the first retry. Defaults to
+        ``0.5``.
+    maximum: Optional[:class:`float`]
+        The maximum delay in seconds before any retry. Defaults to ``30``.
+    multiplier: Optional[:class:`float`]
+        How much the maximum delay grows after each retry. Defaults to
+        ``2``.
+    budget: Optional[:class:`float`]
+        The number of seconds after the first attempt a request can be
+        retried for. A retry that would start after it is not made. If
+        this is ``None``, there is no limit. Defaults to ``60``.
+    methods: Optional[Iterable[:class:`str`]]
+        The HTTP methods to retry. If this is ``None``, every request is
+        retried, including the ``POST`` requests. Defaults to
+        :data:`IDEMPOTENT_METHODS`.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = SyncClient(token, retry=RetryPolicy(5, statuses=[500, 503], budget=120))
+
+        # Retry the uploads and the other POST requests too.
+        client = SyncClient(token, retry=RetryPolicy(methods=None))
+    """
+
+    def __init__(self, max_attempts: int = 3, *, statuses: typing.Iterable[int] = (500, 502, 503, 504),
+                 exceptions: typing.Optional[typing.Iterable[typing.Type[BaseException]]] = None,
+                 initial: float = 0.5, maximum: float = 30.0, multiplier: float = 2.0,
+                 budget: typing.Optional[float] = 60.0,
+                 methods: typing.Optional[typing.Iterable[str]] = IDEMPOTENT_METHODS):
+        self.max_attempts: int = max(1, int(max_attempts))
+        self.statuses: typing.FrozenSet[int] = frozenset(statuses)
+        self.exceptions: typing.Optional[typing.Tuple[typing.Type[BaseException], ...]] = \
+            tuple(exceptions) if exceptions is not None else None
+        self.initial: float = initial
+        self.maximum: float = maximum
+        self.multiplier: float = multiplier
+        self.budget: typing.Optional[float] = budget
+        self.methods: typing.Optional[typing.FrozenSet[str]] = \
+            frozenset(m.upper() for m in methods) if methods is not None else None
+
+        self._lock: threading.Lock = threading.Lock()
+
+        self.retries: int = 0
+        self.gave_up: int = 0
+        self._reasons: typing.Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """:class:`bool`: Whether requests can be retried at all."""
+        return self.max_attempts > 1
+
+    def applies(self, method: str) -> bool:
+        """Returns whether requests with the method can be retried."""
+        return self.enabled and (self.methods is None or method.upper() in self.methods)
+
+    def delay(self, attempt: int) -> float:
+        """Returns the delay before the retry ``attempt`` (starting from ``0``)."""
+
+        return random.uniform(0, min(self.maximum, self.initial * self.multiplier ** attempt))
+
+    def next_delay(self, attempt: int, started: float, reason: typing.Union[int, BaseException],
+                   retry_after: typing.Optional[float] = None, *,
+                   remaining: typing.Optional[float] = None) -> typing.Optional[float]:
+        """Returns how long to wait before retrying a request that failed,
+        or ``None`` if it should not be retried anymore.
+
+        Parameters
+        ----------
+        attempt: :class:`int`
+            The number of retries already made for the request.
+        started: :class:`float`
+            When the first attempt started, from :func:`time.monotonic`.
+        reason: Union[:class:`int`, :class:`BaseException`]
+            The status or the exception the attempt failed with.
+        retry_after: Optional[:class:`float`]
+            The ``Retry-After`` sent with the error, in seconds.
+        remaining: Optional[:class:`float`]
+            The number of seconds left before the deadline of the call.
+        """
+
+        delay = self.delay(attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if attempt + 1 >= self.max_attempts or (
+                self.budget is not None and time.monotonic() + delay - started > self.budget) or (
+                remaining is not None and delay >= remaining):
+            with self._lock:
+                self.gave_up += 1
+
+            return None
+
+        self.count(reason)
+
+        return delay
+
+    def count(self, reason: typing.Union[int, BaseException]):
+        """Counts a retried attempt."""
+
+        key = str(reason) if isinstance(reason, int) else type(reason).__name__
+
+        with self._lock:
+            self.retries += 1
+            self._reasons[key] = self._reasons.get(key, 0) + 1
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Returns the number of ``retries`` made, how many of them were made
+        for each status or exception under ``reasons``, and how many
+        requests failed because they could not be retried anymore
+        (``gave_up``)."""
+
+        with self._lock:
+            return {
+                'retries': self.retries,
+                'gave_up': self.gave_up,
+                'reasons': dict(self._reasons),
+            }
@@ -1,8 +1,15 @@
 import typing
-import io
-import aiohttp
 from .results import SpeechToTextResult, TextToSpeechResult, TextToSpeechSupportResult
 from .error import OpenRobotAPIError
+from .upload import Upload, UploadSource
+from .timeout import Deadline, Timeout
+
+
+def _upload(source: UploadSource, field: str) -> Upload:
+    try:
+        return Upload(source, field=field)
+    except TypeError:
+        raise OpenRobotAPIError('source must be a URL, bytes, a buffer, a path or a binary file.') from None
 
 class Speech:
     """
@@ -14,7 +21,7 @@ class Speech:
 
         self._is_async = is_async
 
-    def speech_to_text(self, source: typing.Union[str, io.BytesIO], language_code: str) -> typing.Union[typing.Coroutine[None, None, SpeechToTextResult], SpeechToTextResult]:
+    def speech_to_text(self, source: typing.Union[str, UploadSource], language_code: str, *, timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.Union[typing.Coroutine[None, None, SpeechToTextResult], SpeechToTextResult]:
         """|maybecoro|
         
         Speech to text.
@@ -24,15 +31,22 @@ class Speech:
 
         Parameters
         ----------
-        source: Union[:class:`str`, :class:`io.BytesIO`]
-            The source of the speech. This can be either a URL or a 
-            :class:`io.BytesIO` object.
+        source: Union[:class:`str`, :class:`bytes`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO]
+            The source of the speech. This can be either a URL or the
+            audio file, which is streamed to the API. See :class:`Upload`.
         language_code: :class:`str`
             The language code of the speech.
         voice_id: :class:`str`
             The voice id of the speech.
         engine: :class:`str`
             The engine of the speech.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -42,6 +56,8 @@ class Speech:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -52,32 +68,22 @@ class Speech:
         if self._is_async:
             async def _text_to_speech() -> TextToSpeechResult:
                 if isinstance(source, str):
-                    js = await self._client._request('POST', '/api/speech/speech-to-text', params={'url': source, 'language_code': language_code})
-                elif isinstance(source, io.BytesIO):
-                    data = aiohttp.FormData()
-                    data.add_field('file', source)
-
-                    js = await self._client._request('POST', '/api/speech/speech-to-text', data=data)
+                    js = await self._client._request('POST', '/api/speech/speech-to-text', params={'url': source, 'language_code': language_code}, timeout=timeout, deadline=deadline)
                 else:
-                    raise OpenRobotAPIError('source must be a URL or BytesIO.')
+                    js = await self._client._request('POST', '/api/speech/speech-to-text', upload=_upload(source, 'file'), timeout=timeout, deadline=deadline)
 
-                return SpeechToTextResult(js)
+                return SpeechToTextResult(js, keep_raw=self._client.keep_raw)
 
             return _text_to_speech()
         else:
             if isinstance(source, str):
-                js = self._client._request('POST', '/api/speech/speech-to-text', params={'url': source, 'language_code': language_code})
-            elif isinstance(source, io.BytesIO):
-                data = aiohttp.FormData()
-                data.add_field('file', source)
-
-                js = self._client._request('POST', '/api/speech/speech-to-text', files={'upload_file': getattr(source, 'getvalue', lambda: source)()}, params={'language_code': language_code})
+                js = self._client._request('POST', '/api/speech/speech-to-text', params={'url': source, 'language_code': language_code}, timeout=timeout, deadline=deadline)
             else:
-                raise OpenRobotAPIError('source must be a URL or BytesIO.')
+                js = self._client._request('POST', '/api/speech/speech-to-text', upload=_upload(source, 'upload_file'), params={'language_code': language_code}, timeout=timeout, deadline=deadline)
 
-            return SpeechToTextResult(js)
+            return SpeechToTextResult(js, keep_raw=self._client.keep_raw)
 
-    def speech_to_text_support(self) -> typing.Union[typing.Coroutine[None, None, typing.Dict[str, typing.Any]], typing.Dict[str, typing.Any]]:
+    def speech_to_text_support(self, *, timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.Union[typing.Coroutine[None, None, typing.Dict[str, typing.Any]], typing.Dict[str, typing.Any]]:
         """|maybecoro|
         
         Returns the supported details for Speech To Text.
@@ -85,6 +91,16 @@ class Speech:
         This function is a coroutine if the client is an 
         :class:`AsyncClient` object, else it would be a synchronous method.
 
+        Parameters
+        ----------
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
+
         Raises
         ------
         :exc:`Forbidden`
@@ -93,6 +109,8 @@ class Speech:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -102,17 +120,17 @@ class Speech:
 
         if self._is_async:
             async def _speech_to_text_support() -> typing.Dict[str, typing.Any]:
-                js = await self._client._request('GET', '/api/speech/speech-to-text/supports')
+                js = await self._client._request('GET', '/api/speech/speech-to-text/supports', cache=True, coalesce=True, timeout=timeout, deadline=deadline)
 
                 return js
 
             return _speech_to_text_support()
         else:
-            js = self._client._request('GET', '/api/speech/speech-to-text/supports')
+            js = self._client._request('GET', '/api/speech/speech-to-text/supports', cache=True, coalesce=True, timeout=timeout, deadline=deadline)
 
             return js
         
-    def text_to_speech(self, text: str, language_code: str, voice_id: str, *, engine: typing.Optional[str] = 'standard') -> typing.Union[typing.Coroutine[None, None, TextToSpeechResult], TextToSpeechResult]:
+    def text_to_speech(self, text: str, language_code: str, voice_id: str, *, engine: typing.Optional[str] = 'standard', timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.Union[typing.Coroutine[None, None, TextToSpeechResult], TextToSpeechResult]:
         """|maybecoro|
         
         Text to speech.
@@ -130,6 +148,13 @@ class Speech:
             The voice id of the speech.
         engine: Optional[:class:`str`]
             The engine of the speech.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -139,6 +164,8 @@ class Speech:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -148,17 +175,17 @@ class Speech:
 
         if self._is_async:
             async def _text_to_speech() -> TextToSpeechResult:
-                js = await self._client._request('GET', '/api/speech/text-to-speech', params={'text': text, 'language_code': language_code, 'voice_id': voice_id, 'engine': engine})
+                js = await self._client._request('GET', '/api/speech/text-to-speech', params={'text': text, 'language_code': language_code, 'voice_id': voice_id, 'engine': engine}, timeout=timeout, deadline=deadline)
 
-                return TextToSpeechResult(js)
+                return TextToSpeechResult(js, keep_raw=self._client.keep_raw)
 
             return _text_to_speech()
         else:
-            js = self._client._request('GET', '/api/speech/text-to-speech', params={'text': text, 'language_code': language_code, 'voice_id': voice_id, 'engine': engine})
+            js = self._client._request('GET', '/api/speech/text-to-speech', params={'text': text, 'language_code': language_code, 'voice_id': voice_id, 'engine': engine}, timeout=timeout, deadline=deadline)
 
-            return TextToSpeechResult(js)
+            return TextToSpeechResult(js, keep_raw=self._client.keep_raw)
 
-    def text_to_speech_support(self, language_code: str, *, engine: typing.Optional[str] = 'standard') -> typing.Union[typing.Coroutine[None, None, TextToSpeechSupportResult], TextToSpeechSupportResult]:
+    def text_to_speech_support(self, language_code: str, *, engine: typing.Optional[str] = 'standard', timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.Union[typing.Coroutine[None, None, TextToSpeechSupportResult], TextToSpeechSupportResult]:
         """|maybecoro|
 
         Returns the supported details for Text To Speech.
@@ -172,6 +199,13 @@ class Speech:
             The language code to get the supported details for.
         engine: Optional[:class:`str`]
             The engine of the speech.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -181,6 +215,8 @@ class Speech:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -190,12 +226,12 @@ class Speech:
 
         if self._is_async:
             async def _text_to_speech_support() -> TextToSpeechSupportResult:
-                js = await self._client._request('GET', '/api/speech/text-to-speech/supports', params={'language_code': language_code, 'engine': engine})
+                js = await self._client._request('GET', '/api/speech/text-to-speech/supports', params={'language_code': language_code, 'engine': engine}, cache=True, coalesce=True, timeout=timeout, deadline=deadline)
 
-                return TextToSpeechSupportResult(js)
+                return TextToSpeechSupportResult(js, keep_raw=self._client.keep_raw)
 
             return _text_to_speech_support()
         else:
-            js = self._client._request('GET', '/api/speech/text-to-speech/supports', params={'language_code': language_code, 'engine': engine})
+            js = self._client._request('GET', '/api/speech/text-to-speech/supports', params={'language_code': language_code, 'engine': engine}, cache=True, coalesce=True, timeout=timeout, deadline=deadline)
 
-            return TextToSpeechSupportResult(js)
\ No newline at end of file
+            return TextToSpeechSupportResult(js, keep_raw=self._client.keep_raw)
\ No newline at end of file
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing
+import zlib
+
+
+class ResultStore:
+    """A persistent store for the results of the image endpoints.
+
+    The results are stored as compressed JSON in a SQLite file, keyed by
+    the endpoint and the SHA-256 of the image, so sending the same image
+    again (even after a restart, or from another host sharing the file)
+    doesn't upload it again. When the file grows over ``max_bytes``, the
+    least recently used results are evicted.
+
+    This is used by ``nsfw_check``, ``ocr``, ``celebrity`` and
+    ``description``.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the SQLite file.
+    max_bytes: Optional[:class:`int`]
+        The maximum size of the stored (compressed) results. Defaults to
+        256 MiB.
+    timeout: Optional[:class:`float`]
+        The number of seconds to wait for another process to release the
+        file lock. Defaults to ``5``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = SyncClient(token, store=ResultStore('/mnt/shared/openrobot-results.sqlite3'))
+    """
+
+    def __init__(self, path: str, *, max_bytes: int = 256 * 1024 * 1024, timeout: float = 5.0):
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.timeout: float = timeout
+
+        self._local: threading.local = threading.local()
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: typing.Dict[str, typing.Dict[str, int]] = {}
+
+        conn = self._connect()
+        conn.execute('CREATE TABLE IF NOT EXISTS results (endpoint TEXT NOT NULL, digest TEXT NOT NULL, '
+                     'value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL, '
+                     'PRIMARY KEY (endpoint, digest))')
+        conn.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, and must
+        # not be reused by a forked child.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        return conn
+
+    @staticmethod
+    def digest(data: typing.Union[bytes, bytearray, memoryview]) -> str:
+        """Returns the key of an image."""
+        return hashlib.sha256(data).hexdigest()
+
+    def _count(self, endpoint: str, name: str):
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {'hits': 0, 'misses': 0})
+            counters[name] += 1
+
+    def get(self, endpoint: str, digest: str) -> typing.Optional[typing.Any]:
+        """Returns the stored result of an image, or ``None``.
+
+        Parameters
+        ----------
+        endpoint: :class:`str`
+            The route, such as ``/api/ocr``.
+        digest: :class:`str`
+            The key of the image, see :meth:`digest`.
+        """
+
+        conn = self._connect()
+
+        row = conn.execute('SELECT value FROM results WHERE endpoint = ? AND digest = ?', (endpoint, digest)).fetchone()
+
+        if row is None:
+            self._count(endpoint, 'misses')
+            return None
+
+        self._count(endpoint, 'hits')
+        conn.execute('UPDATE results SET accessed = ? WHERE endpoint = ? AND digest = ?', (time.time(), endpoint, digest))
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, endpoint: str, digest: str, value: typing.Any):
+        """Stores the result of an image, evicting the least recently used
+        results if the store is full."""
+
+        blob = zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+        conn = self._connect()
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('INSERT OR REPLACE INTO results (endpoint, digest, value, size, accessed) VALUES (?, ?, ?, ?, ?)',
+                         (endpoint, digest, blob, len(blob), time.time()))
+
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+            while total > self.max_bytes:
+                rows = conn.execute('SELECT endpoint, digest, size FROM results ORDER BY accessed LIMIT 64').fetchall()
+                if not rows:
+                    break
+
+                for row in rows:
+                    conn.execute('DELETE FROM results WHERE endpoint = ? AND digest = ?', row[:2])
+                    total -= row[2]
+
+                    if total <= self.max_bytes:
+                        break
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def clear(self):
+        """Removes every stored result."""
+        self._connect().execute('DELETE FROM results')
+
+    def report(self) -> typing.Dict[str, typing.Any]:
+        """Returns the hit ratio of this process, and the size of the store.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            ``hits``, ``misses`` and ``hit_ratio`` in total and for each
+            endpoint under ``endpoints``, and the number of stored
+            ``entries`` and their ``size`` in bytes.
+        """
+
+        entries, size = self._connect().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+
+        def ratio(counters):
+            total = counters['hits'] + counters['misses']
+            return counters['hits'] / total if total else 0.0
+
+        for counters in endpoints.values():
+            counters['hit_ratio'] = ratio(counters)
+
+        total = {
+            'hits': sum(c['hits'] for c in endpoints.values()),
+            'misses': sum(c['misses'] for c in endpoints.values()),
+        }
+
+        return {**total, 'hit_ratio': ratio(total), 'entries': entries, 'size': size, 'endpoints': endpoints}
@@ -0,0 +1,481 @@
+import asyncio
+import collections
+import concurrent.futures
+import heapq
+import itertools
+import random
+import threading
+import time
+import typing
+
+class PollBackoff:
+    """How often to poll a task that has not finished yet.
+
+    The delays grow exponentially with jitter, so that a task that takes
+    long isn't polled too often, and so that many tasks submitted at
+    once don't poll in lockstep.
+
+    Parameters
+    ----------
+    initial: Optional[:class:`float`]
+        The first delay in seconds. Defaults to ``0.5``.
+    maximum: Optional[:class:`float`]
+        The maximum delay in seconds. Defaults to ``10``.
+    multiplier: Optional[:class:`float`]
+        How much the delay grows after each poll. Defaults to ``2``.
+    jitter: Optional[:class:`bool`]
+        Whether to randomize each delay between half of it and all of
+        it. Defaults to ``True``.
+    """
+
+    def __init__(self, initial: float = 0.5, maximum: float = 10.0, multiplier: float = 2.0, jitter: bool = True):
+        self.initial: float = initial
+        self.maximum: float = maximum
+        self.multiplier: float = multiplier
+        self.jitter: bool = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Returns the delay before the poll ``attempt`` (starting from ``0``)."""
+
+        delay = min(self.maximum, self.initial * self.multiplier ** attempt)
+
+        if self.jitter:
+            delay = random.uniform(delay / 2, delay)
+
+        return delay
+
+
+class CompletionEstimator:
+    """Learns how long the tasks of each endpoint take to complete.
+
+    The first poll of a task is scheduled for when the task is expected
+    to complete, instead of right away.
+
+    Parameters
+    ----------
+    window: Optional[:class:`int`]
+        The number of recent tasks remembered per endpoint. Defaults to
+        ``50``.
+    """
+
+    def __init__(self, window: int = 50):
+        self.window: int = window
+
+        self._durations: typing.Dict[str, typing.Deque[float]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def observe(self, endpoint: str, duration: float):
+        """Records that a task of ``endpoint`` took ``duration`` seconds."""
+
+        with self._lock:
+            self._durations.setdefault(endpoint, collections.deque(maxlen=self.window)).append(duration)
+
+    def estimate(self, endpoint: str) -> typing.Optional[float]:
+        """Returns the median completion time of ``endpoint``, or ``None``
+        if no task of it was seen yet."""
+
+        with self._lock:
+            durations = sorted(self._durations.get(endpoint, ()))
+
+        if not durations:
+            return None
+
+        return durations[len(durations) // 2]
+
+
+class _PendingTask:
+    # A task tracked by a poller. The first poll lands near the expected
+    # completion time, then it backs off from the start.
+
+    def __init__(self, client, result, future):
+        self.result = result
+        self.future = future
+        # The last time the task was known to be pending.
+        self.pending_at: float = result._submitted
+
+        self.backoff: PollBackoff = client.poll_backoff
+        self.estimate: typing.Optional[float] = client.task_estimator.estimate(result._task_method)
+        self.attempt: int = 0
+
+        self.next_poll: float = self.schedule()
+
+    def schedule(self) -> float:
+        now = time.monotonic()
+
+        if self.attempt == 0 and self.estimate is not None:
+            delay = max(0.0, self.result._submitted + self.estimate - now)
+        else:
+            delay = self.backoff.delay(self.attempt - (self.estimate is not None))
+
+        self.attempt += 1
+
+        return now + delay
+
+    def update(self, client, polled, sent: float) -> bool:
+        # Returns whether the task is done, given the result of the poll
+        # sent at ``sent``.
+        polled._submitted = self.result._submitted
+        polled._client = client
+
+        self.result = polled
+
+        if polled.done:
+            # It finished somewhere between the last poll that saw it pending
+            # and this one. Counting it as finished at this poll would make
+            # every duration at least the estimate the poll was scheduled
+            # with, so the estimate could never go down.
+            finished = (self.pending_at + time.monotonic()) / 2
+            client.task_estimator.observe(polled._task_method, finished - polled._submitted)
+            return True
+
+        self.pending_at = sent
+        self.next_poll = self.schedule()
+        return False
+
+
+class TaskPoller:
+    """Polls every pending task of a :class:`SyncClient` from one thread.
+
+    Instead of each waiting task running its own polling loop, the
+    tasks are kept in a heap ordered by when they are due. A due task is
+    polled as soon as one of the ``concurrency`` polls in flight is
+    free, over the client's pooled connections, and is scheduled again
+    on its own when its poll returns, so a slow poll doesn't hold back
+    the other tasks.
+
+    Parameters
+    ----------
+    client: :class:`SyncClient`
+        The client to poll with.
+    concurrency: Optional[:class:`int`]
+        The number of polls in flight at once. Defaults to ``10``.
+    wave_size: Optional[:class:`int`]
+        The maximum number of polls started at once. Defaults to ``100``.
+    interval: Optional[:class:`float`]
+        The minimum number of seconds between starting two groups of
+        polls. Defaults to ``0``.
+    """
+
+    def __init__(self, client, *, concurrency: int = 10, wave_size: int = 100, interval: float = 0.0):
+        self._client = client
+
+        self.concurrency: int = concurrency
+        self.wave_size: int = wave_size
+        self.interval: float = interval
+
+        self._heap: typing.List[typing.Tuple[float, int, _PendingTask]] = []
+        self._counter: typing.Iterator[int] = itertools.count()
+        self._condition: threading.Condition = threading.Condition()
+        self._thread: typing.Optional[threading.Thread] = None
+        # The number of polls in flight.
+        self._polling: int = 0
+        # Not the client's executor, whose threads may be the ones waiting.
+        self._executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: The number of tasks being tracked."""
+        return sum(1 for _, _, entry in self._heap if not entry.future.done()) + self._polling
+
+    def submit(self, result) -> concurrent.futures.Future:
+        """Tracks a task until it is done.
+
+        Parameters
+        ----------
+        result: :class:`OpenRobotAPITaskResult`
+            The task, as returned by e.g :meth:`SyncClient.sentiment`.
+
+        Returns
+        -------
+        :class:`concurrent.futures.Future`
+            A future that resolves to the finished result. Cancelling it
+            stops the task from being polled.
+        """
+
+        future = concurrent.futures.Future()
+
+        if result.done:
+            future.set_result(result)
+            return future
+
+        entry = _PendingTask(self._client, result, future)
+
+        with self._condition:
+            heapq.heappush(self._heap, (entry.next_poll, next(self._counter), entry))
+
+            if self._thread is None:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(self.concurrency,
+                                                                           thread_name_prefix='openrobot-api-poller')
+
+                self._thread = threading.Thread(target=self._run, name='openrobot-api-poller', daemon=True)
+                self._thread.start()
+            else:
+                self._condition.notify()
+
+        return future
+
+    def close(self):
+        """Stops polling and fails every pending task."""
+
+        with self._condition:
+            heap, self._heap = self._heap, []
+            executor, self._executor = self._executor, None
+            self._condition.notify()
+
+        for _, _, entry in heap:
+            entry.future.cancel()
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _next_polls(self) -> typing.Optional[typing.List[_PendingTask]]:
+        # Waits until a task is due and a poll can be started, and returns
+        # the tasks to poll. None if there is nothing left to poll.
+        with self._condition:
+            while True:
+                while self._heap and self._heap[0][2].future.done():
+                    heapq.heappop(self._heap)
+
+                if not self._heap and not self._polling:
+                    # The thread is started again by the next submit.
+                    self._thread = None
+                    return None
+
+                now = time.monotonic()
+                free = min(self.wave_size, self.concurrency - self._polling)
+
+                if free > 0 and self._heap:
+                    if self._heap[0][0] <= now:
+                        break
+
+                    self._condition.wait(self._heap[0][0] - now)
+                else:
+                    # Until a poll returns.
+                    self._condition.wait()
+
+            polls = []
+            while self._heap and self._heap[0][0] <= now and len(polls) < free:
+                entry = heapq.heappop(self._heap)[2]
+                if not entry.future.done():
+                    polls.append(entry)
+
+            self._polling += len(polls)
+
+            return polls
+
+    def _poll(self, entry: _PendingTask):
+        get = getattr(self._client, f'{entry.result._task_method}_get')
+        sent = time.monotonic()
+
+        done = True
+
+        try:
+            polled = get(entry.result.task_id)
+        except Exception as e:
+            if not entry.future.done():
+                entry.future.set_exception(e)
+        else:
+            if entry.update(self._client, polled, sent):
+                if not entry.future.done():
+                    entry.future.set_result(polled)
+            else:
+                done = False
+        finally:
+            with self._condition:
+                self._polling -= 1
+
+                if not done:
+                    heapq.heappush(self._heap, (entry.next_poll, next(self._counter), entry))
+
+                self._condition.notify()
+
+    def _run(self):
+        while True:
+            polls = self._next_polls()
+            if polls is None:
+                return
+
+            for started, entry in enumerate(polls):
+                try:
+                    self._executor.submit(self._poll, entry)
+                except (AttributeError, RuntimeError):
+                    # Closed while the polls were being started.
+                    with self._condition:
+                        self._polling -= len(polls) - started
+                        self._thread = None
+                    return
+
+            if self.interval:
+                time.sleep(self.interval)
+
+
+class AsyncTaskPoller:
+    """Polls every pending task of an :class:`AsyncClient` from one
+    background task.
+
+    This works like :class:`TaskPoller`, but the polls run concurrently
+    on the event loop.
+
+    Parameters
+    ----------
+    client: :class:`AsyncClient`
+        The client to poll with.
+    concurrency: Optional[:class:`int`]
+        The number of polls in flight at once. Defaults to ``10``.
+    wave_size: Optional[:class:`int`]
+        The maximum number of polls started at once. Defaults to ``100``.
+    interval: Optional[:class:`float`]
+        The minimum number of seconds between starting two groups of
+        polls. Defaults to ``0``.
+    """
+
+    def __init__(self, client, *, concurrency: int = 10, wave_size: int = 100, interval: float = 0.0):
+        self._client = client
+
+        self.concurrency: int = concurrency
+        self.wave_size: int = wave_size
+        self.interval: float = interval
+
+        self._heap: typing.List[typing.Tuple[float, int, _PendingTask]] = []
+        self._counter: typing.Iterator[int] = itertools.count()
+        self._wakeup: typing.Optional[asyncio.Event] = None
+        self._runner: typing.Optional[asyncio.Task] = None
+        # The polls in flight.
+        self._polling: typing.Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: The number of tasks being tracked."""
+        return sum(1 for _, _, entry in self._heap if not entry.future.done()) + len(self._polling)
+
+    def submit(self, result) -> asyncio.Future:
+        """Tracks a task until it is done.
+
+        Parameters
+        ----------
+        result: :class:`OpenRobotAPITaskResult`
+            The task, as returned by e.g :meth:`AsyncClient.sentiment`.
+
+        Returns
+        -------
+        :class:`asyncio.Future`
+            A future that resolves to the finished result. Cancelling it
+            stops the task from being polled.
+        """
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if result.done:
+            future.set_result(result)
+            return future
+
+        entry = _PendingTask(self._client, result, future)
+        heapq.heappush(self._heap, (entry.next_poll, next(self._counter), entry))
+
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+
+        self._wakeup.set()
+
+        if self._runner is None or self._runner.done():
+            self._runner = loop.create_task(self._run())
+
+        return future
+
+    async def close(self):
+        """|coro|
+
+        Stops polling and fails every pending task.
+        """
+
+        heap, self._heap = self._heap, []
+        for _, _, entry in heap:
+            entry.future.cancel()
+
+        tasks = list(self._polling)
+        if self._runner is not None:
+            tasks.append(self._runner)
+            self._runner = None
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _poll(self, entry: _PendingTask):
+        get = getattr(self._client, f'{entry.result._task_method}_get')
+        sent = time.monotonic()
+
+        try:
+            polled = await get(entry.result.task_id)
+        except Exception as e:
+            if not entry.future.done():
+                entry.future.set_exception(e)
+            return
+
+        if entry.update(self._client, polled, sent):
+            if not entry.future.done():
+                entry.future.set_result(polled)
+        else:
+            heapq.heappush(self._heap, (entry.next_poll, next(self._counter), entry))
+
+    def _polled(self, task: asyncio.Task):
+        self._polling.discard(task)
+        self._wakeup.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            while self._heap and self._heap[0][2].future.done():
+                heapq.heappop(self._heap)
+
+            if not self._heap and not self._polling:
+                return
+
+            now = time.monotonic()
+            free = min(self.wave_size, self.concurrency - len(self._polling))
+
+            if free <= 0 or not self._heap or self._heap[0][0] > now:
+                # Until a task is due, or a poll returns.
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(),
+                                           self._heap[0][0] - now if free > 0 and self._heap else None)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            while self._heap and self._heap[0][0] <= now and free > 0:
+                entry = heapq.heappop(self._heap)[2]
+                if not entry.future.done():
+                    task = loop.create_task(self._poll(entry))
+                    task.add_done_callback(self._polled)
+                    self._polling.add(task)
+                    free -= 1
+
+            if self.interval:
+                await asyncio.sleep(self.interval)
+
+
+def wait_task(client, result, timeout: typing.Optional[float] = None):
+    # Waits for a task of a SyncClient through its poller.
+    future = client.poller.submit(result)
+
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f'Task {result.task_id} did not complete in time.') from None
+
+
+async def wait_task_async(client, result, timeout: typing.Optional[float] = None):
+    # Waits for a task of an AsyncClient through its poller.
+    future = client.poller.submit(result)
+
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f'Task {result.task_id} did not complete in time.') from None
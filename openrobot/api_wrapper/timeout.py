@@ -0,0 +1,122 @@
+import time
+import typing
+
+from .error import DeadlineExceeded
+
+
+def _least(*values: typing.Optional[float]) -> typing.Optional[float]:
+    values = [v for v in values if v is not None]
+    return min(values) if values else None
+
+
+class Timeout:
+    """How long a single attempt of a request can take.
+
+    Parameters
+    ----------
+    total: Optional[:class:`float`]
+        The maximum number of seconds for the whole attempt, from
+        connecting to reading the end of the response. ``None`` means no
+        limit. requests has no such timeout, so with a :class:`SyncClient`
+        this only caps ``connect`` and ``read``. Defaults to ``None``.
+    connect: Optional[:class:`float`]
+        The maximum number of seconds to connect to the API. Defaults to
+        ``None``.
+    read: Optional[:class:`float`]
+        The maximum number of seconds to wait for the API to send more of
+        its response. Defaults to ``None``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = SyncClient(token, timeout=Timeout(30, connect=5))
+        client.ocr(image, timeout=120)
+    """
+
+    def __init__(self, total: typing.Optional[float] = None, *, connect: typing.Optional[float] = None,
+                 read: typing.Optional[float] = None):
+        self.total: typing.Optional[float] = total
+        self.connect: typing.Optional[float] = connect
+        self.read: typing.Optional[float] = read
+
+    def __repr__(self):
+        return f'<Timeout total={self.total} connect={self.connect} read={self.read}>'
+
+    @classmethod
+    def coerce(cls, timeout: typing.Union[float, 'Timeout', None]) -> typing.Optional['Timeout']:
+        # A number is a total timeout.
+        if timeout is None or isinstance(timeout, Timeout):
+            return timeout
+
+        return cls(float(timeout))
+
+    def requests_timeout(self, remaining: typing.Optional[float] = None) -> typing.Optional[typing.Tuple[typing.Optional[float], typing.Optional[float]]]:
+        # The (connect, read) timeout of a requests attempt, with at most
+        # ``remaining`` seconds left before the deadline.
+        connect = _least(self.connect, self.total, remaining)
+        read = _least(self.read, self.total, remaining)
+
+        return (connect, read) if connect is not None or read is not None else None
+
+    def aiohttp_timeout(self, remaining: typing.Optional[float] = None):
+        # The aiohttp.ClientTimeout of an attempt, with at most ``remaining``
+        # seconds left before the deadline.
+        import aiohttp
+
+        return aiohttp.ClientTimeout(total=_least(self.total, remaining), sock_connect=self.connect,
+                                     sock_read=self.read)
+
+
+class Deadline:
+    """The time by which a call has to be done, including its retries and
+    the time it waits for the ratelimit.
+
+    Passing the same deadline to several calls makes them share it, e.g
+    to answer a request of your own in time.
+
+    Parameters
+    ----------
+    seconds: :class:`float`
+        The number of seconds from now until the deadline.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        deadline = Deadline(10)
+        lyrics = client.lyrics(query, deadline=deadline)
+        translated = client.translate(lyrics.lyrics, 'fr', deadline=deadline)
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds: float = seconds
+        self.expires: float = time.monotonic() + seconds
+
+    def __repr__(self):
+        return f'<Deadline seconds={self.seconds} remaining={self.remaining():.3f}>'
+
+    @classmethod
+    def coerce(cls, deadline: typing.Union[float, 'Deadline', None]) -> typing.Optional['Deadline']:
+        # A number is a number of seconds from now.
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+
+        return cls(float(deadline))
+
+    def remaining(self) -> float:
+        """Returns the number of seconds left, or ``0`` if it passed."""
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """:class:`bool`: Whether the deadline passed."""
+        return time.monotonic() >= self.expires
+
+    def check(self, wait: float = 0.0, *, cause: typing.Optional[BaseException] = None):
+        """Raises :exc:`DeadlineExceeded` if the deadline passed, or would
+        pass while waiting for ``wait`` seconds. ``cause`` is the error
+        that would have been waited out."""
+
+        if wait >= self.expires - time.monotonic():
+            raise DeadlineExceeded(self) from cause
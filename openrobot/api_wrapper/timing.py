@@ -0,0 +1,224 @@
+import logging
+import random
+import threading
+import time
+import typing
+
+# The phases of a RequestTimings, in the order they happen.
+PHASES = ('queue', 'dns', 'connect', 'tls', 'ttfb', 'body')
+
+_log = logging.getLogger('openrobot.api_wrapper')
+
+
+class RequestTimings:
+    """How long each phase of an attempt took, in seconds.
+
+    A phase is ``None`` if it did not happen, e.g there is no ``connect``
+    when a pooled connection is reused, or if the client can't measure it.
+    The phases are measured by the connections of the session made by
+    the client, so only ``ttfb``, ``body`` and ``total`` are measured with
+    a session that was passed to it.
+
+    Attributes
+    ----------
+    queue: Optional[:class:`float`]
+        Waiting for a free connection of the pool. Only measured by an
+        :class:`AsyncClient`.
+    dns: Optional[:class:`float`]
+        Resolving the host of the API. Only measured by an
+        :class:`AsyncClient`, as a :class:`SyncClient` counts it in
+        ``connect``.
+    connect: Optional[:class:`float`]
+        Opening a new connection. With an :class:`AsyncClient`, this
+        includes the TLS handshake, as aiohttp doesn't tell them apart.
+    tls: Optional[:class:`float`]
+        The TLS handshake of a new connection. Only measured by a
+        :class:`SyncClient`.
+    ttfb: Optional[:class:`float`]
+        From when the connection was ready until the headers of the
+        response were received: sending the request and its body, and the
+        API handling it.
+    body: Optional[:class:`float`]
+        Reading the body of the response.
+    total: Optional[:class:`float`]
+        The whole attempt.
+    reused: Optional[:class:`bool`]
+        Whether the attempt reused a pooled connection, if that is known.
+    """
+
+    __slots__ = ('queue', 'dns', 'connect', 'tls', 'ttfb', 'body', 'total', 'reused', '_start', '_ready', '_headers',
+                 '_started')
+
+    def __init__(self):
+        self.queue: typing.Optional[float] = None
+        self.dns: typing.Optional[float] = None
+        self.connect: typing.Optional[float] = None
+        self.tls: typing.Optional[float] = None
+        self.ttfb: typing.Optional[float] = None
+        self.body: typing.Optional[float] = None
+        self.total: typing.Optional[float] = None
+        self.reused: typing.Optional[bool] = None
+
+        self._start: float = time.perf_counter()
+        self._ready: typing.Optional[float] = None
+        self._headers: typing.Optional[float] = None
+        # The phases in progress, and when they started.
+        self._started: typing.Dict[str, float] = {}
+
+    def __repr__(self):
+        phases = ' '.join(f'{name}={value:.4f}' for name, value in self.as_dict().items()
+                          if isinstance(value, float))
+        return f'<RequestTimings {phases} reused={self.reused}>'
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        """Returns the phases, ``total`` and ``reused`` as a :class:`dict`."""
+        return {name: getattr(self, name) for name in (*PHASES, 'total', 'reused')}
+
+    # The clients measure the phases with these.
+
+    def start(self, phase: str):
+        self._started[phase] = time.perf_counter()
+
+    def stop(self, phase: str):
+        started = self._started.pop(phase, None)
+
+        if started is not None:
+            setattr(self, phase, (getattr(self, phase) or 0.0) + time.perf_counter() - started)
+
+    def ready(self):
+        # The connection is ready to send the request.
+        self._ready = time.perf_counter()
+
+    def headers(self, elapsed: typing.Optional[float] = None):
+        # The headers of the response were received, ``elapsed`` seconds
+        # after the start if it is not now.
+        self._headers = self._start + elapsed if elapsed is not None else time.perf_counter()
+
+    def finish(self):
+        now = time.perf_counter()
+        self.total = now - self._start
+
+        # Both include the DNS resolution.
+        if self.connect is not None and self.dns is not None:
+            self.connect = max(0.0, self.connect - self.dns)
+
+        if self.reused is None and self._headers is not None:
+            self.reused = self.connect is None
+
+        if self._headers is not None:
+            if self._ready is not None:
+                ready = self._ready
+            else:
+                ready = self._start + sum(getattr(self, phase) or 0.0 for phase in ('queue', 'dns', 'connect', 'tls'))
+
+            self.ttfb = max(0.0, self._headers - ready)
+            self.body = max(0.0, now - self._headers)
+
+
+class SlowRequestLog:
+    """A hook that logs the attempts slower than ``threshold``, one line
+    each, with the phases they took (see :class:`RequestTimings`).
+
+    It tells whether slow calls are slow because new connections are made
+    (``connect``, ``tls``, ``reused=false``) or because of the API
+    (``ttfb``). The lines are sampled and capped, so that logging them
+    stays cheap when everything is slow.
+
+    The line is logfmt, e.g ``slow request method=POST route=/api/ocr
+    status=200 attempt=1 total=2.315 connect=0.021 tls=0.044 ttfb=2.231
+    body=0.019 reused=false``. The same values are passed to the log
+    record as its ``openrobot`` attribute, for structured log handlers.
+
+    Parameters
+    ----------
+    threshold: Optional[:class:`float`]
+        The number of seconds over which an attempt is logged. Defaults to
+        ``1``.
+    sample_rate: Optional[:class:`float`]
+        The ratio of slow attempts that are logged, from ``0`` to ``1``.
+        Defaults to ``1``.
+    max_per_minute: Optional[:class:`int`]
+        The maximum number of lines logged per minute. The next line
+        logged tells how many were dropped. If this is ``None``, there is
+        no limit. Defaults to ``60``.
+    logger: Optional[:class:`logging.Logger`]
+        The logger used. Defaults to the ``openrobot.api_wrapper`` logger.
+    level: Optional[:class:`int`]
+        The level of the lines. Defaults to :data:`logging.WARNING`.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = AsyncClient(token)
+        client.metrics.add_hook('request_end', SlowRequestLog(2.0, sample_rate=0.25))
+        client.metrics.add_hook('error', SlowRequestLog(2.0))
+    """
+
+    def __init__(self, threshold: float = 1.0, *, sample_rate: float = 1.0, max_per_minute: typing.Optional[int] = 60,
+                 logger: typing.Optional[logging.Logger] = None, level: int = logging.WARNING):
+        self.threshold: float = threshold
+        self.sample_rate: float = sample_rate
+        self.max_per_minute: typing.Optional[int] = max_per_minute
+        self.logger: logging.Logger = logger or _log
+        self.level: int = level
+
+        self._lock: threading.Lock = threading.Lock()
+        self._minute: int = 0
+        self._logged: int = 0
+        self._dropped: int = 0
+
+    def __call__(self, event):
+        if event.duration is None or event.duration < self.threshold:
+            return
+        elif self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        elif not self.logger.isEnabledFor(self.level):
+            return
+
+        with self._lock:
+            minute = int(time.monotonic() // 60)
+            if minute != self._minute:
+                self._minute = minute
+                self._logged = 0
+
+            if self.max_per_minute is not None and self._logged >= self.max_per_minute:
+                self._dropped += 1
+                return
+
+            self._logged += 1
+            dropped, self._dropped = self._dropped, 0
+
+        fields = {
+            'method': event.method,
+            'route': event.route,
+            'status': event.status,
+            'error': type(event.error).__name__ if event.error is not None else None,
+            'attempt': event.attempt,
+        }
+
+        timings = event.timings
+        if timings is not None:
+            fields.update(timings.as_dict())
+        else:
+            fields['total'] = event.duration
+
+        if dropped:
+            fields['dropped'] = dropped
+
+        fields = {k: v for k, v in fields.items() if v is not None}
+        self.logger.log(self.level, 'slow request %s', ' '.join(f'{k}={_logfmt(v)}' for k, v in fields.items()),
+                        extra={'openrobot': fields})
+
+
+def _logfmt(value: typing.Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif isinstance(value, float):
+        return f'{value:.3f}'
+
+    value = str(value)
+    if ' ' in value or '"' in value or '=' in value:
+        return '"' + value.replace('"', '\\"') + '"'
+
+    return value
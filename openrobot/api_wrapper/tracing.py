@@ -0,0 +1,310 @@
+import collections
+import random
+import threading
+import time
+import typing
+
+
+class Span:
+    """A timed step of a call to the API.
+
+    Every call is a ``openrobot.request`` span. Its children are:
+
+    - ``openrobot.ratelimit``: a wait for the :class:`RateLimiter`, or for
+      the ``Retry-After`` of a 429 (``openrobot.ratelimit.source`` is
+      ``limiter`` or ``api``).
+    - ``openrobot.attempt``: an attempt to send the request, until its
+      response is decoded. Its own children are ``openrobot.upload``
+      (sending the body of an image or audio upload), ``openrobot.download``
+      (reading the body of the response, only with an :class:`AsyncClient`,
+      as requests reads it before returning the response) and
+      ``openrobot.decode`` (decoding the response).
+    - ``openrobot.backoff``: the wait before retrying a failed attempt.
+
+    Spans are made by a :class:`Tracer`, and are not meant to be made
+    directly. Once ended, a span can't be changed anymore.
+
+    Attributes
+    ----------
+    name: :class:`str`
+        The name of the span, such as ``openrobot.attempt``.
+    parent: Optional[:class:`Span`]
+        The span this one is a step of.
+    trace_id: :class:`int`
+        The ID shared by every span of a call.
+    span_id: :class:`int`
+        The ID of the span.
+    attributes: Dict[:class:`str`, Any]
+        What the span is about, such as ``http.status_code``.
+    start_time: :class:`float`
+        When the span started, as a Unix timestamp.
+    duration: Optional[:class:`float`]
+        How many seconds the span lasted, or ``None`` until it ended.
+    error: Optional[:class:`BaseException`]
+        The exception the step failed with.
+    """
+
+    __slots__ = ('name', 'tracer', 'parent', 'trace_id', 'span_id', 'attributes', 'start_time', 'duration', 'error',
+                 '_start', '_otel')
+
+    # Whether the span is kept. Spans of a client without a tracer are not.
+    recording = True
+
+    def __init__(self, tracer: 'Tracer', name: str, parent: typing.Optional['Span'] = None,
+                 attributes: typing.Optional[typing.Dict[str, typing.Any]] = None, otel: typing.Any = None):
+        self.name: str = name
+        self.tracer: Tracer = tracer
+        self.parent: typing.Optional[Span] = parent
+        self.attributes: typing.Dict[str, typing.Any] = dict(attributes or {})
+        self.start_time: float = time.time()
+        self.duration: typing.Optional[float] = None
+        self.error: typing.Optional[BaseException] = None
+
+        self._start: float = time.perf_counter()
+        self._otel: typing.Any = otel
+
+        context = otel.get_span_context() if otel is not None else None
+
+        if context is not None and context.is_valid:
+            # The same IDs as the OpenTelemetry span, to find one from the other.
+            self.trace_id: int = context.trace_id
+            self.span_id: int = context.span_id
+        else:
+            self.trace_id = parent.trace_id if parent is not None else random.getrandbits(128)
+            self.span_id = random.getrandbits(64)
+
+    def __repr__(self):
+        return f'<Span name={self.name!r} duration={self.duration} attributes={self.attributes!r}>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # A generator that was closed early is not an error.
+        if exc is not None and not isinstance(exc, GeneratorExit):
+            self.record_exception(exc)
+
+        self.end()
+
+    @property
+    def parent_id(self) -> typing.Optional[int]:
+        """Optional[:class:`int`]: The ID of the parent span."""
+        return self.parent.span_id if self.parent is not None else None
+
+    @property
+    def ended(self) -> bool:
+        """:class:`bool`: Whether the span ended."""
+        return self.duration is not None
+
+    def child(self, name: str, attributes: typing.Optional[typing.Dict[str, typing.Any]] = None) -> 'Span':
+        """Starts a span that is a step of this one."""
+        return self.tracer.start_span(name, self, attributes)
+
+    def set_attribute(self, key: str, value: typing.Any):
+        """Sets an attribute of the span."""
+
+        if self.ended:
+            return
+
+        self.attributes[key] = value
+
+        if self._otel is not None:
+            self._otel.set_attribute(key, value)
+
+    def record_exception(self, exc: BaseException):
+        """Marks the span as failed with an exception."""
+
+        if self.ended or self.error is not None:
+            return
+
+        self.error = exc
+
+        if self._otel is not None:
+            from opentelemetry.trace import Status, StatusCode
+
+            self._otel.record_exception(exc)
+            self._otel.set_status(Status(StatusCode.ERROR, f'{type(exc).__name__}: {exc}'))
+
+    def end(self):
+        """Ends the span, and exports it. This does nothing if it already
+        ended."""
+
+        if self.ended:
+            return
+
+        self.duration = time.perf_counter() - self._start
+
+        if self._otel is not None:
+            self._otel.end()
+
+        if self.tracer.exporter is not None:
+            self.tracer.exporter.export(self)
+
+
+class _NoopSpan:
+    # The span of a client without a tracer, so that the clients don't have
+    # to check whether they have one.
+    __slots__ = ()
+
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def child(self, name, attributes=None):
+        return self
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+    def end(self):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class InMemoryExporter:
+    """Keeps the spans that ended in memory, e.g for tests or to find out
+    where the time of a slow batch went.
+
+    Parameters
+    ----------
+    max_spans: Optional[:class:`int`]
+        The number of spans kept. The oldest ones are dropped once there
+        are more. If this is ``None``, there is no limit. Defaults to
+        ``10000``.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        exporter = InMemoryExporter()
+        client = SyncClient(token, tracer=Tracer(exporter))
+
+        client.map('ocr', images)
+
+        for name, stats in exporter.breakdown().items():
+            print(f"{name}: {stats['total']:.2f}s in {stats['count']} spans")
+    """
+
+    def __init__(self, max_spans: typing.Optional[int] = 10000):
+        self.max_spans: typing.Optional[int] = max_spans
+
+        self._spans: typing.Deque[Span] = collections.deque(maxlen=max_spans)
+        self._lock: threading.Lock = threading.Lock()
+
+    def export(self, span: Span):
+        """Keeps a span that ended."""
+
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, name: typing.Optional[str] = None) -> typing.List[Span]:
+        """Returns the spans kept, in the order they ended, or only the ones
+        named ``name``."""
+
+        with self._lock:
+            return [span for span in self._spans if name is None or span.name == name]
+
+    def children(self, span: Span) -> typing.List[Span]:
+        """Returns the children of a span that were kept."""
+        return [s for s in self.spans() if s.parent is span]
+
+    def breakdown(self) -> typing.Dict[str, typing.Dict[str, float]]:
+        """Returns, for each span name, the number of spans (``count``) and
+        their ``total``, ``mean`` and ``max`` duration in seconds."""
+
+        stats = {}
+
+        for span in self.spans():
+            s = stats.get(span.name)
+            if s is None:
+                s = stats[span.name] = {'count': 0, 'total': 0.0, 'mean': 0.0, 'max': 0.0}
+
+            s['count'] += 1
+            s['total'] += span.duration
+            s['max'] = max(s['max'], span.duration)
+
+        for s in stats.values():
+            s['mean'] = s['total'] / s['count']
+
+        return stats
+
+    def clear(self):
+        """Drops every span kept."""
+
+        with self._lock:
+            self._spans.clear()
+
+
+class Tracer:
+    """Traces the calls a client makes to the API as :class:`Span`\\s.
+
+    When OpenTelemetry is installed, every span is also an OpenTelemetry
+    span, made by the tracer named ``openrobot.api_wrapper`` of the global
+    tracer provider. The span of a call is a child of the OpenTelemetry
+    span that is current when it is made, e.g the one of the request of
+    a web app.
+
+    Parameters
+    ----------
+    exporter: Optional[:class:`InMemoryExporter`]
+        Where the spans are sent once they end. This can be any object with
+        an ``export(span)`` method. Defaults to ``None``.
+    opentelemetry: Optional[:class:`bool`]
+        Whether to make OpenTelemetry spans too. If this is ``None``, they
+        are made if ``opentelemetry-api`` is installed. Defaults to
+        ``None``.
+
+    Raises
+    ------
+    :exc:`ImportError`
+        ``opentelemetry`` is ``True``, but OpenTelemetry is not installed.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        client = AsyncClient(token, tracer=Tracer(InMemoryExporter()))
+    """
+
+    def __init__(self, exporter: typing.Optional[InMemoryExporter] = None, *,
+                 opentelemetry: typing.Optional[bool] = None):
+        self.exporter: typing.Optional[InMemoryExporter] = exporter
+
+        self._otel: typing.Any = None
+
+        if opentelemetry or opentelemetry is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                if opentelemetry:
+                    raise ImportError('opentelemetry-api is required to make OpenTelemetry spans. Install it with '
+                                      '`pip install opentelemetry-api`.') from None
+            else:
+                self._otel = trace.get_tracer('openrobot.api_wrapper')
+
+    def start_span(self, name: str, parent: typing.Optional[Span] = None,
+                   attributes: typing.Optional[typing.Dict[str, typing.Any]] = None) -> Span:
+        """Starts a span. It has to be ended, by :meth:`Span.end` or by
+        using it as a context manager."""
+
+        # OpenTelemetry doesn't take None values.
+        attributes = {k: v for k, v in attributes.items() if v is not None} if attributes else None
+        otel = None
+
+        if self._otel is not None:
+            from opentelemetry import trace
+
+            # None uses the current context.
+            context = trace.set_span_in_context(parent._otel) if parent is not None and parent._otel is not None else None
+            otel = self._otel.start_span(name, context=context, attributes=attributes)
+
+        return Span(self, name, parent, attributes, otel)
@@ -1,5 +1,6 @@
 import typing
 from .results import TranslateResult
+from .timeout import Deadline, Timeout
 
 class Translate:
     """
@@ -11,7 +12,7 @@ class Translate:
 
         self._is_async = is_async
 
-    def __call__(self, text: str, to_lang: str, from_lang: typing.Optional[str] = 'auto') -> typing.Union[typing.Coroutine[None, None, TranslateResult], TranslateResult]:
+    def __call__(self, text: str, to_lang: str, from_lang: typing.Optional[str] = 'auto', *, timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.Union[typing.Coroutine[None, None, TranslateResult], TranslateResult]:
         """|maybecoro|
         
         Translates a text.
@@ -28,6 +29,13 @@ class Translate:
         from_lang: Optional[:class:`str`]
             The text's original language. Defaults to
             ``auto``.
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
 
         Raises
         ------
@@ -37,6 +45,8 @@ class Translate:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -51,9 +61,9 @@ class Translate:
                     'text': text,
                     'to_lang': to_lang,
                     'from_lang': from_lang
-                })
+                }, cache=True, coalesce=True, timeout=timeout, deadline=deadline)
                 
-                return TranslateResult(js)
+                return TranslateResult(js, keep_raw=self._client.keep_raw)
 
             return _do_translate()
         else:
@@ -61,11 +71,11 @@ class Translate:
                 'text': text,
                 'to_lang': to_lang,
                 'from_lang': from_lang
-            })
+            }, cache=True, coalesce=True, timeout=timeout, deadline=deadline)
             
-            return TranslateResult(js)
+            return TranslateResult(js, keep_raw=self._client.keep_raw)
 
-    def languages(self) -> typing.Union[typing.Coroutine[None, None, typing.Dict[str, str]], typing.Dict[str, str]]:
+    def languages(self, *, timeout: typing.Union[float, Timeout] = None, deadline: typing.Union[float, Deadline] = None) -> typing.Union[typing.Coroutine[None, None, typing.Dict[str, str]], typing.Dict[str, str]]:
         """|maybecoro|
 
         Gets the translate's supported languages, with the
@@ -74,6 +84,16 @@ class Translate:
         This function is a coroutine if the client is an 
         :class:`AsyncClient` object, else it would be a synchronous method.
 
+        Parameters
+        ----------
+        timeout: Optional[Union[:class:`float`, :class:`Timeout`]]
+            How long each attempt of the request can take. Defaults to the
+            client's ``timeout``.
+        deadline: Optional[Union[:class:`float`, :class:`Deadline`]]
+            The time by which the call has to be done, including its
+            retries and ratelimit waits. A number is a number of seconds
+            from now. Defaults to ``None``.
+
         Raises
         ------
         :exc:`Forbidden`
@@ -82,6 +102,8 @@ class Translate:
             API Returned a 400 HTTP Status Code.
         :exc:`InternalServerError`
             API Returned a 500 HTTP Status Code.
+        :exc:`DeadlineExceeded`
+            The call could not be done before ``deadline``.
 
         Returns
         -------
@@ -92,10 +114,10 @@ class Translate:
 
         if self._is_async:
             async def _languages() -> typing.Dict[str, str]:
-                js = await self._client._request('GET', '/api/translate/languages')
+                js = await self._client._request('GET', '/api/translate/languages', cache=True, coalesce=True, timeout=timeout, deadline=deadline)
                 return js
 
             return _languages()
         else:
-            js = self._client._request('/api/translate/languages')
+            js = self._client._request('GET', '/api/translate/languages', cache=True, coalesce=True, timeout=timeout, deadline=deadline)
             return js
\ No newline at end of file
@@ -0,0 +1,351 @@
+import asyncio
+import contextlib
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+import typing
+import uuid
+
+# The size of the chunks read from files and sent to the socket.
+CHUNK_SIZE = 64 * 1024
+
+# The number of bytes of a spooled upload kept in memory, before they are
+# moved to a temporary file.
+SPOOL_SIZE = 8 * 1024 * 1024
+
+UploadSource = typing.Union[bytes, bytearray, memoryview, mmap.mmap, 'os.PathLike[str]', typing.BinaryIO,
+                            typing.AsyncIterable[bytes]]
+
+
+class Upload:
+    """A file to upload to an image or speech endpoint.
+
+    The file is streamed to the API in chunks, straight from the buffer
+    or the file it is in, without reading it all into memory or copying
+    it first.
+
+    Parameters
+    ----------
+    source: Union[:class:`bytes`, :class:`bytearray`, :class:`memoryview`, :class:`mmap.mmap`, :class:`io.BytesIO`, :class:`os.PathLike`, BinaryIO, AsyncIterable[:class:`bytes`]]
+        The file. Open files are read from their current position, and
+        rewound to it if the upload has to be sent again. Files that
+        can't be rewound and async iterables can only be sent once,
+        unless they are spooled (see :meth:`spool`). An async iterable
+        can only be sent by an :class:`AsyncClient`.
+    field: Optional[:class:`str`]
+        The name of the multipart field. Defaults to ``file``.
+    filename: Optional[:class:`str`]
+        The file name sent to the API. Defaults to the name of the file,
+        or ``field``.
+
+    Attributes
+    ----------
+    size: Optional[:class:`int`]
+        The number of bytes, if it is known beforehand.
+    """
+
+    def __init__(self, source: UploadSource, *, field: str = 'file', filename: typing.Optional[str] = None):
+        self.field: str = field
+        self.size: typing.Optional[int] = None
+
+        self._source: typing.Any = source
+        self._start: typing.Optional[int] = None
+        self._sent: bool = False
+        self._digest: typing.Optional[str] = None
+        self._spool: typing.Optional[typing.BinaryIO] = None
+
+        name = None
+
+        if hasattr(source, 'getbuffer'):
+            # io.BytesIO, without copying its contents.
+            self._kind = 'buffer'
+            self._source = source.getbuffer()
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._kind = 'buffer'
+            self._source = memoryview(source)
+        elif isinstance(source, os.PathLike):
+            self._kind = 'path'
+            self.size = os.stat(source).st_size
+            name = os.path.basename(os.fspath(source))
+        elif hasattr(source, 'read'):
+            self._kind = 'file'
+            name = getattr(source, 'name', None)
+
+            try:
+                self._start = source.tell() if source.seekable() else None
+            except (AttributeError, OSError):
+                self._start = None
+
+            if self._start is not None:
+                try:
+                    self.size = os.fstat(source.fileno()).st_size - self._start
+                except (AttributeError, OSError, io.UnsupportedOperation):
+                    self.size = source.seek(0, os.SEEK_END) - self._start
+                    source.seek(self._start)
+        elif hasattr(source, '__aiter__'):
+            self._kind = 'aiter'
+        else:
+            raise TypeError('source must be bytes, a buffer, a path, a binary file or an async iterable of bytes.')
+
+        if self._kind == 'buffer':
+            if self._source.format != 'B' or self._source.ndim != 1:
+                self._source = self._source.cast('B')
+
+            self.size = self._source.nbytes
+
+        self.filename: str = filename or (os.path.basename(name) if isinstance(name, str) and name else None) or field
+
+    @property
+    def in_memory(self) -> bool:
+        """:class:`bool`: Whether the file is in a buffer, so that reading
+        it does not block."""
+        return self._kind == 'buffer'
+
+    @property
+    def replayable(self) -> bool:
+        """:class:`bool`: Whether the file can be sent more than once."""
+        return self._kind in ('buffer', 'path') or self._start is not None
+
+    def digest(self) -> typing.Optional[str]:
+        """Returns the SHA-256 of the file, or ``None`` if it can't be read
+        without consuming it. This blocks if the file is not in memory."""
+
+        if self._digest is None and self.replayable:
+            sha = hashlib.sha256()
+
+            for chunk in self.chunks():
+                sha.update(chunk)
+
+            self._digest = sha.hexdigest()
+
+        return self._digest
+
+    def peek(self, size: int) -> typing.Optional[bytes]:
+        """Returns the first ``size`` bytes of the file, or ``None`` if they
+        can't be read without consuming it."""
+
+        if not self.replayable:
+            return None
+        elif self._kind == 'buffer':
+            return bytes(self._source[:size])
+
+        with self.open() as f:
+            return f.read(size)
+
+    @contextlib.contextmanager
+    def open(self) -> typing.Iterator[typing.BinaryIO]:
+        """Opens the file for reading, from the start.
+
+        A file that was passed is not closed, but rewound when it is read
+        again.
+        """
+
+        if not self.replayable:
+            raise ValueError('This upload can only be read once.')
+        elif self._kind == 'buffer':
+            with io.BytesIO(self._source) as f:
+                yield f
+        elif self._kind == 'path':
+            with open(self._source, 'rb') as f:
+                yield f
+        else:
+            self._source.seek(self._start)
+            yield self._source
+
+    def spool(self):
+        """Keeps a copy of the bytes that are sent, so that an upload that
+        can't be read again can still be sent again (e.g to retry it)
+        without reading the source again. The copy is kept in memory up to
+        :data:`SPOOL_SIZE` bytes, and in a temporary file after that.
+
+        This does nothing to uploads that can be read again.
+        """
+
+        if not self.replayable and self._spool is None:
+            self._spool = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+
+    def _claim(self):
+        if not self.replayable and self._spool is None:
+            if self._sent:
+                raise ValueError('This upload can only be sent once.')
+
+            self._sent = True
+
+    def chunks(self) -> typing.Iterator[typing.Union[bytes, memoryview]]:
+        """Yields the file in chunks, from the start."""
+
+        if self._kind == 'aiter':
+            raise TypeError('An async iterable can only be uploaded by an AsyncClient.')
+        elif self._kind == 'buffer':
+            view = self._source
+            for i in range(0, view.nbytes, CHUNK_SIZE):
+                yield view[i:i + CHUNK_SIZE]
+        elif self._kind == 'path':
+            with open(self._source, 'rb') as f:
+                yield from iter(lambda: f.read(CHUNK_SIZE), b'')
+        elif self._start is not None:
+            self._source.seek(self._start)
+
+            yield from iter(lambda: self._source.read(CHUNK_SIZE), b'')
+        else:
+            yield from self._spooled(iter(lambda: self._source.read(CHUNK_SIZE), b''))
+
+    def _spooled(self, chunks: typing.Iterator[bytes]) -> typing.Iterator[bytes]:
+        # Sends what was already read from the source again, then reads the
+        # rest of it, keeping a copy. The previous attempt might have
+        # stopped before the end.
+        if self._spool is None:
+            yield from chunks
+            return
+
+        spool = self._spool
+        end = spool.seek(0, os.SEEK_END)
+        spool.seek(0)
+
+        while spool.tell() < end:
+            yield spool.read(min(CHUNK_SIZE, end - spool.tell()))
+
+        for chunk in chunks:
+            spool.write(chunk)
+            yield chunk
+
+    async def achunks(self) -> typing.AsyncIterator[typing.Union[bytes, memoryview]]:
+        """Yields the file in chunks, from the start. Files are read in the
+        default executor, so that the event loop is not blocked."""
+
+        if self._kind == 'aiter' and self._spool is None:
+            async for chunk in self._source:
+                yield chunk
+        elif self._kind == 'aiter':
+            # Like _spooled, in the default executor in case the spool was
+            # moved to a file.
+            loop = asyncio.get_running_loop()
+            spool = self._spool
+            end = await loop.run_in_executor(None, spool.seek, 0, os.SEEK_END)
+            await loop.run_in_executor(None, spool.seek, 0)
+
+            for position in range(0, end, CHUNK_SIZE):
+                yield await loop.run_in_executor(None, spool.read, min(CHUNK_SIZE, end - position))
+
+            async for chunk in self._source:
+                await loop.run_in_executor(None, spool.write, chunk)
+                yield chunk
+        elif self._kind == 'buffer':
+            for chunk in self.chunks():
+                yield chunk
+        else:
+            loop = asyncio.get_running_loop()
+            chunks = self.chunks()
+            sentinel = object()
+
+            try:
+                while True:
+                    chunk = await loop.run_in_executor(None, next, chunks, sentinel)
+                    if chunk is sentinel:
+                        break
+
+                    yield chunk
+            finally:
+                await loop.run_in_executor(None, chunks.close)
+
+    def requests_kwargs(self, kwargs: dict, span=None) -> dict:
+        # The keyword arguments of one requests attempt. A new body is made
+        # for each attempt, so that retries send the file again. ``span`` is
+        # the span of the attempt, if it is traced.
+        self._claim()
+
+        body = MultipartReader(self, span)
+
+        headers = {**(kwargs.get('headers') or {}), 'Content-Type': body.content_type}
+        return {**{k: v for k, v in kwargs.items() if k != 'upload'}, 'data': body, 'headers': headers}
+
+    def aiohttp_kwargs(self, kwargs: dict, span=None) -> dict:
+        # The keyword arguments of one aiohttp attempt. An aiohttp.FormData
+        # can only be sent once, so a new one is made for each attempt.
+        import aiohttp
+
+        self._claim()
+
+        value = self._source if self._kind == 'buffer' else self.achunks()
+        if span is not None and span.recording:
+            value = _traced_payload(value, span, self.size)
+
+        data = aiohttp.FormData()
+        data.add_field(self.field, value, filename=self.filename, content_type='application/octet-stream')
+
+        return {**{k: v for k, v in kwargs.items() if k != 'upload'}, 'data': data}
+
+
+class MultipartReader:
+    """A ``multipart/form-data`` body that reads an :class:`Upload` lazily.
+
+    requests sends it in chunks with a ``Content-Length`` when the size
+    of the upload is known, and with chunked encoding otherwise.
+    """
+
+    def __init__(self, upload: Upload, span=None):
+        boundary = uuid.uuid4().hex
+        filename = upload.filename.replace('"', '%22')
+
+        self.content_type: str = f'multipart/form-data; boundary={boundary}'
+
+        head = (f'--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="{upload.field}"; filename="{filename}"\r\n'
+                'Content-Type: application/octet-stream\r\n\r\n').encode('utf-8')
+        tail = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+
+        # Read by requests to set the Content-Length.
+        self.len: typing.Optional[int] = len(head) + upload.size + len(tail) if upload.size is not None else None
+
+        self._parts: typing.Iterator[typing.Union[bytes, memoryview]] = _chain(head, upload.chunks(), tail)
+        if span is not None and span.recording:
+            self._parts = _traced_chunks(self._parts, span, upload.size)
+        self._current: typing.Union[bytes, memoryview] = b''
+
+    def __iter__(self):
+        return self._parts
+
+    def read(self, size: int = -1) -> typing.Union[bytes, memoryview]:
+        # Returns at most one chunk at a time, so that nothing is joined.
+        while not self._current:
+            self._current = next(self._parts, None)
+            if self._current is None:
+                self._current = b''
+                return b''
+
+        if size is None or size < 0:
+            size = len(self._current)
+
+        chunk, self._current = self._current[:size], self._current[size:]
+        return chunk
+
+
+def _chain(head: bytes, chunks: typing.Iterator, tail: bytes) -> typing.Iterator:
+    yield head
+    yield from chunks
+    yield tail
+
+
+def _traced_chunks(chunks: typing.Iterator, span, size: typing.Optional[int]) -> typing.Iterator:
+    # The upload starts when requests reads the first chunk, and ends once
+    # it read them all.
+    with span.child('openrobot.upload', {'openrobot.upload.size': size}):
+        yield from chunks
+
+
+def _traced_payload(value: typing.Any, span, size: typing.Optional[int]):
+    # An aiohttp payload whose upload is a span. aiohttp writes the payload
+    # of a buffer in one go, so it can't be timed from its chunks.
+    import aiohttp
+
+    payload = aiohttp.payload.get_payload(value, content_type='application/octet-stream')
+    write = payload.write
+
+    async def traced_write(writer):
+        with span.child('openrobot.upload', {'openrobot.upload.size': size}):
+            await write(writer)
+
+    payload.write = traced_write
+    return payload
@@ -1,5 +1,8 @@
 import os
 import json
+import time
+import typing
+import email.utils
 
 
 def get_token_from_file():
@@ -21,41 +24,96 @@ def get_token_from_file():
     return token
 
 
-def json_or_text(response, *, sync=False):
-    if sync:
-        text = response.text
+def _default_json_loads() -> typing.Callable[[bytes], typing.Any]:
+    # orjson is much faster, and is used when it is installed.
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+
+    return orjson.loads
+
+
+_json_loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = None
+
+
+def get_json_loads() -> typing.Callable[[bytes], typing.Any]:
+    """Returns the function used to decode JSON responses: :func:`orjson.loads`
+    if orjson is installed, else :func:`json.loads`."""
+
+    global _json_loads
 
+    if _json_loads is None:
+        _json_loads = _default_json_loads()
+
+    return _json_loads
+
+
+def is_json_content_type(content_type: typing.Optional[str]) -> bool:
+    # application/json, or a +json type such as application/problem+json,
+    # with or without parameters such as charset.
+    media_type = (content_type or '').split(';', 1)[0].strip().lower()
+
+    return media_type == 'application/json' or (media_type.startswith('application/') and media_type.endswith('+json'))
+
+
+def decode_body(body: bytes, content_type: typing.Optional[str], *,
+                loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = None) -> typing.Any:
+    # Decodes JSON straight from the bytes, in a single pass. Anything else
+    # (e.g a Cloudflare error page) is returned as text.
+    if is_json_content_type(content_type):
         try:
-            if response.headers['content-type'] == 'application/json':
-                try:
-                    return response.json()
-                except:
-                    try:
-                        return json.loads(text)
-                    except:
-                        return text
-        except KeyError:
-            # Thanks, Cloudflare
+            return (loads or get_json_loads())(body)
+        except ValueError:
             pass
 
-        return text
+    return body.decode('utf-8', errors='replace')
+
+
+def parse_retry_after(value: typing.Optional[str]) -> typing.Optional[float]:
+    # A Retry-After header is either a number of seconds or an HTTP date.
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, date.timestamp() - time.time())
+
+
+def json_or_text(response, *, sync=False, loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = None):
+    if sync:
+        return decode_body(response.content, response.headers.get('Content-Type'), loads=loads)
     else:
         async def x():
-            text = await response.text(encoding='utf-8')
-
-            try:
-                if response.content_type == 'application/json':
-                    try:
-                        return await response.json()
-                    except:
-                        try:
-                            return json.loads(text)
-                        except:
-                            return text
-            except KeyError:
-                # Thanks, Cloudflare
-                pass
-
-            return text
+            return decode_body(await response.read(), response.headers.get('Content-Type'), loads=loads)
 
         return x()
+
+
+# Routes that take a path parameter, e.g /api/lyrics/{query}.
+_PARAMETERIZED_ROUTES = {
+    '/api/lyrics': '{query}',
+    '/api/text-generation': '{task_id}',
+    '/api/sentiment': '{task_id}',
+    '/api/summarization': '{task_id}',
+}
+
+
+def get_route(path: str) -> str:
+    # Maps a request path to its route, so that e.g every lyrics query is
+    # accounted under the same /api/lyrics/{query} key.
+    path = '/' + str(path).split('?', 1)[0].strip('/')
+
+    for route, param in _PARAMETERIZED_ROUTES.items():
+        if path.startswith(route + '/'):
+            return f'{route}/{param}'
+
+    return path
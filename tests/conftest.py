@@ -0,0 +1,197 @@
+import collections
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+API = 'https://api.openrobot.xyz'
+
+
+class Request:
+    # A request received by the fake API.
+
+    def __init__(self, method, path, headers, body):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+def _lyrics(request):
+    return 200, {'title': 't', 'artist': 'a', 'lyrics': 'l', 'images': {}}, {}
+
+
+def _ocr(request):
+    return 200, {'text': 'hello'}, {}
+
+
+class FakeAPI:
+    """A local stand-in for the API.
+
+    Each route is a function of the :class:`Request` returning
+    ``(status, body, headers)``, where ``body`` is JSON unless it is
+    :class:`bytes`. The replies queued with :meth:`fail` are used first, one
+    per request.
+    """
+
+    def __init__(self):
+        self.routes = {'/api/lyrics': _lyrics, '/api/ocr': _ocr}
+        self.requests = []
+        self.delay = 0.0
+
+        self._faults = collections.deque()
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.api = self
+        self.server.daemon_threads = True
+        # The clients hang up on purpose, e.g when they time out.
+        self.server.handle_error = lambda request, address: None
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def route(self, prefix, handler):
+        self.routes[prefix] = handler
+
+    def fail(self, *replies):
+        """Queues replies for the next requests: a status (with a JSON error
+        body), ``'drop'`` to close the connection, ``'html'`` for a proxy's
+        error page, or a ``(status, body, headers)`` tuple."""
+        self._faults.extend(replies)
+
+    def count(self, prefix=''):
+        return sum(1 for r in self.requests if r.path.startswith(prefix))
+
+    def respond(self, request):
+        with self._lock:
+            self.requests.append(request)
+            fault = self._faults.popleft() if self._faults else None
+
+        if fault is not None:
+            if fault in ('drop', 'html') or isinstance(fault, tuple):
+                return fault
+
+            return fault, {'message': 'error', 'error': {'code': fault}}, {}
+
+        if self.delay:
+            time.sleep(self.delay)
+
+        for prefix in sorted(self.routes, key=len, reverse=True):
+            if request.path.startswith(prefix):
+                return self.routes[prefix](request)
+
+        return 404, {'message': 'not found', 'error': {'code': 404}}, {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    return body
+                body += chunk
+
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _handle(self):
+        request = Request(self.command, self.path, dict(self.headers), self._read_body())
+        reply = self.server.api.respond(request)
+
+        if reply == 'drop':
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        elif reply == 'html':
+            reply = 502, b'<html>bad gateway</html>', {'Content-Type': 'text/html'}
+
+        status, body, headers = reply
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+            headers = {'Content-Type': 'application/json', **headers}
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_HEAD = _handle
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """A :class:`FakeAPI` every client sends its requests to."""
+
+    import aiohttp
+    from requests.adapters import HTTPAdapter
+
+    fake = FakeAPI()
+
+    send = HTTPAdapter.send
+
+    def redirect_send(self, request, **kwargs):
+        request.url = request.url.replace(API, fake.url)
+        return send(self, request, **kwargs)
+
+    request = aiohttp.ClientSession._request
+
+    def redirect_request(self, method, url, *args, **kwargs):
+        return request(self, method, str(url).replace(API, fake.url), *args, **kwargs)
+
+    monkeypatch.setattr(HTTPAdapter, 'send', redirect_send)
+    monkeypatch.setattr(aiohttp.ClientSession, '_request', redirect_request)
+
+    yield fake
+
+    fake.close()
+
+
+@pytest.fixture
+def sync_client(api):
+    """Makes :class:`SyncClient`\\s for the fake API, closed after the test."""
+
+    from openrobot.api_wrapper import SyncClient
+
+    clients = []
+
+    def make(**kwargs):
+        client = SyncClient('token', **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def async_client(api):
+    """Makes :class:`AsyncClient`\\s for the fake API, to be used as
+    ``async with``."""
+
+    from openrobot.api_wrapper import AsyncClient
+
+    def make(**kwargs):
+        return AsyncClient('token', **kwargs)
+
+    return make
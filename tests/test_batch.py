@@ -0,0 +1,166 @@
+import asyncio
+import concurrent.futures
+import time
+
+from openrobot.api_wrapper import BatchItem, async_map, sync_map
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def run_async_map(func, inputs, **kwargs):
+    return asyncio.run(collect(async_map(func, inputs, **kwargs)))
+
+
+async def sleep_then(value):
+    await asyncio.sleep(value)
+    return value
+
+
+def sleep_then_sync(value):
+    time.sleep(value)
+    return value
+
+
+def test_async_map_keeps_the_order():
+    items = run_async_map(sleep_then, [0.03, 0.01, 0.02], concurrency=3)
+
+    assert [item.index for item in items] == [0, 1, 2]
+    assert [item.result for item in items] == [0.03, 0.01, 0.02]
+
+
+def test_async_map_unordered_yields_as_completed():
+    items = run_async_map(sleep_then, [0.03, 0.01, 0.02], concurrency=3, ordered=False)
+
+    assert [item.index for item in items] == [1, 2, 0]
+
+
+def test_async_map_bounds_the_concurrency():
+    running = 0
+    peak = 0
+
+    async def func(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+        return value
+
+    items = run_async_map(func, range(20), concurrency=4)
+
+    assert peak == 4
+    assert [item.result for item in items] == list(range(20))
+
+
+def test_async_map_captures_errors():
+    async def func(value):
+        if value == 1:
+            raise ValueError(value)
+        return value
+
+    items = run_async_map(func, [0, 1, 2])
+
+    assert [item.ok for item in items] == [True, False, True]
+    assert isinstance(items[1].error, ValueError)
+
+
+def test_async_map_unpacks_tuples_and_dedupes():
+    calls = []
+
+    async def func(a, b):
+        calls.append((a, b))
+        return a + b
+
+    items = run_async_map(func, [(1, 2), (3, 4), (1, 2)], dedupe=True)
+
+    assert [item.result for item in items] == [3, 7, 3]
+    assert calls == [(1, 2), (3, 4)]
+
+
+def test_async_map_timeout_keeps_finished_results():
+    # The first input blocks the ordered output until the deadline, while
+    # the others finish.
+    items = run_async_map(sleep_then, [1.0, 0.01, 0.02, 1.0], concurrency=4, timeout=0.2)
+
+    assert [item.index for item in items] == [0, 1, 2, 3]
+    assert isinstance(items[0].error, asyncio.TimeoutError)
+    assert [items[1].result, items[2].result] == [0.01, 0.02]
+    assert isinstance(items[3].error, asyncio.TimeoutError)
+
+
+def test_async_map_timeout_doesnt_start_the_rest():
+    started = []
+
+    async def func(value):
+        started.append(value)
+        await asyncio.sleep(1)
+
+    items = run_async_map(func, range(10), concurrency=2, timeout=0.05)
+
+    assert started == [0, 1]
+    assert len(items) == 2
+    assert all(isinstance(item.error, asyncio.TimeoutError) for item in items)
+
+
+def test_async_client_map(api, async_client):
+    async def main():
+        async with async_client() as client:
+            return await collect(client.map('lyrics', ['a', 'b', 'c']))
+
+    items = asyncio.run(main())
+
+    assert all(isinstance(item, BatchItem) and item.ok for item in items)
+    assert [item.result.title for item in items] == ['t', 't', 't']
+    assert api.count('/api/lyrics') == 3
+
+
+def run_sync_map(func, inputs, **kwargs):
+    with concurrent.futures.ThreadPoolExecutor(kwargs.get('concurrency', 10)) as executor:
+        return list(sync_map(executor, func, inputs, **kwargs))
+
+
+def test_sync_map_keeps_the_order():
+    items = run_sync_map(sleep_then_sync, [0.03, 0.01, 0.02], concurrency=3)
+
+    assert [item.result for item in items] == [0.03, 0.01, 0.02]
+
+
+def test_sync_map_unordered_yields_as_completed():
+    items = run_sync_map(sleep_then_sync, [0.06, 0.01, 0.03], concurrency=3, ordered=False)
+
+    assert [item.index for item in items] == [1, 2, 0]
+
+
+def test_sync_map_captures_errors_and_dedupes():
+    calls = []
+
+    def func(value):
+        calls.append(value)
+        if value == 'bad':
+            raise ValueError(value)
+        return value.upper()
+
+    items = run_sync_map(func, ['a', 'bad', 'a'], concurrency=1, dedupe=True)
+
+    assert [item.result for item in items] == ['A', None, 'A']
+    assert isinstance(items[1].error, ValueError)
+    assert calls == ['a', 'bad']
+
+
+def test_sync_map_timeout_keeps_finished_results():
+    items = run_sync_map(sleep_then_sync, [0.5, 0.01, 0.02, 0.5], concurrency=4, timeout=0.2)
+
+    assert isinstance(items[0].error, concurrent.futures.TimeoutError)
+    assert [items[1].result, items[2].result] == [0.01, 0.02]
+    assert isinstance(items[3].error, concurrent.futures.TimeoutError)
+
+
+def test_sync_client_map(api, sync_client):
+    client = sync_client(max_workers=4)
+
+    items = list(client.map('lyrics', ['a', 'b', 'c', 'd']))
+
+    assert [item.ok for item in items] == [True] * 4
+    assert api.count('/api/lyrics') == 4
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from openrobot.api_wrapper import CircuitBreaker, CircuitOpen, InternalServerError, RetryPolicy
+
+
+def test_opens_on_the_failure_rate():
+    breaker = CircuitBreaker(0.5, minimum_requests=4)
+
+    for success in (True, False, True):
+        breaker.record('/api/ocr', success)
+    assert breaker.state('/api/ocr') == 'closed'
+
+    breaker.record('/api/ocr', False)
+    assert breaker.state('/api/ocr') == 'open'
+    assert breaker.state('/api/lyrics') == 'closed'
+
+    with pytest.raises(CircuitOpen):
+        breaker.acquire('/api/ocr')
+
+    assert breaker.stats()['/api/ocr']['rejected'] == 1
+
+
+def test_half_open_probe():
+    breaker = CircuitBreaker(minimum_requests=1, cooldown=0.05)
+    breaker.record('/api/ocr', False)
+    time.sleep(0.06)
+
+    assert breaker.state('/api/ocr') == 'half-open'
+    assert breaker.acquire('/api/ocr') is True
+
+    # Only one probe at a time.
+    with pytest.raises(CircuitOpen):
+        breaker.acquire('/api/ocr')
+
+    breaker.record('/api/ocr', False, probe=True)
+    assert breaker.state('/api/ocr') == 'open'
+
+    time.sleep(0.06)
+    breaker.record('/api/ocr', True, probe=breaker.acquire('/api/ocr'))
+    assert breaker.state('/api/ocr') == 'closed'
+
+
+def test_unrelated_failures_free_the_probe():
+    breaker = CircuitBreaker(minimum_requests=1, cooldown=0)
+    breaker.record('/api/ocr', False)
+
+    breaker.record('/api/ocr', None, probe=breaker.acquire('/api/ocr'))
+
+    assert breaker.acquire('/api/ocr') is True
+    assert breaker.state('/api/ocr') == 'half-open'
+
+
+def test_no_breaker_by_default(api, sync_client):
+    client = sync_client()
+
+    for _ in range(30):
+        api.fail(500)
+        with pytest.raises(InternalServerError):
+            client.ocr(b'image')
+
+    assert api.count('/api/ocr') == 30
+    assert client.stats()['breaker'] is None
+
+
+def test_open_breaker_doesnt_send_requests(api, sync_client):
+    client = sync_client(breaker=CircuitBreaker(minimum_requests=2), retry=RetryPolicy(initial=0.01))
+    api.fail(503, 503)
+
+    with pytest.raises(CircuitOpen):
+        client.lyrics('q')
+
+    assert api.count('/api/lyrics') == 2
+    assert client.stats()['breaker']['/api/lyrics/{query}']['state'] == 'open'
+
+
+def test_async_open_breaker_doesnt_send_requests(api, async_client):
+    async def main():
+        async with async_client(breaker=CircuitBreaker(minimum_requests=2)) as client:
+            for _ in range(2):
+                api.fail(500)
+                with pytest.raises(InternalServerError):
+                    await client.ocr(b'image')
+
+            with pytest.raises(CircuitOpen):
+                await client.ocr(b'image')
+
+            # The other routes aren't affected.
+            return await client.lyrics('q')
+
+    assert asyncio.run(main()).title == 't'
+    assert api.count('/api/ocr') == 2
@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from openrobot.api_wrapper import DeadlineExceeded, Forbidden, ResponseCache, RetryPolicy
+
+
+def lyrics(title='t', headers=None):
+    def route(request):
+        return 200, {'title': title, 'artist': 'a', 'lyrics': 'l', 'images': {}}, dict(headers or {})
+
+    return route
+
+
+def test_store_and_lookup():
+    cache = ResponseCache(ttl=60)
+    key = cache.key('/api/lyrics/x', {'a': 1, 'b': None})
+
+    assert cache.lookup(key) == (None, None)
+
+    cache.store(key, {'v': 1}, {'ETag': '"1"'})
+    entry, state = cache.lookup(key)
+
+    assert state == 'fresh'
+    assert entry.value == {'v': 1}
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"1"'}
+
+
+def test_cache_control():
+    cache = ResponseCache(ttl=60)
+
+    cache.store('a', 1, {'Cache-Control': 'no-store'})
+    cache.store('b', 2, {'Cache-Control': 'max-age=0, stale-while-revalidate=30'})
+
+    assert cache.lookup('a') == (None, None)
+    assert cache.lookup('b')[1] == 'stale'
+
+
+def test_lru_eviction():
+    cache = ResponseCache(maxsize=2, ttl=60)
+
+    for key in 'abc':
+        cache.store(key, key, {})
+
+    assert cache.lookup('a') == (None, None)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_fresh_responses_are_not_requested_again(api, sync_client):
+    api.route('/api/lyrics', lyrics(headers={'Cache-Control': 'max-age=60'}))
+    client = sync_client(cache=ResponseCache())
+
+    assert client.lyrics('q').title == client.lyrics('q').title == 't'
+    assert api.count('/api/lyrics') == 1
+
+
+def test_expired_response_is_revalidated_with_its_etag(api, sync_client):
+    def route(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return 304, b'', {'Cache-Control': 'max-age=60'}
+
+        return lyrics(headers={'ETag': '"v1"', 'Cache-Control': 'max-age=0'})(request)
+
+    api.route('/api/lyrics', route)
+    client = sync_client(cache=ResponseCache())
+
+    client.lyrics('q')
+    assert client.lyrics('q').title == 't'
+
+    assert api.requests[1].headers['If-None-Match'] == '"v1"'
+    assert client.cache.stats()['revalidations'] == 1
+
+
+FAILURES = [500, 502, 503, 504, 'html', 'drop']
+
+
+@pytest.mark.parametrize('failure', FAILURES)
+def test_stale_if_error(api, sync_client, failure):
+    client = sync_client(cache=ResponseCache(ttl=0, stale_if_error=60), retry=RetryPolicy(1))
+    client.lyrics('q')
+
+    api.fail(failure)
+    assert client.lyrics('q').title == 't'
+
+
+@pytest.mark.parametrize('failure', FAILURES)
+def test_async_stale_if_error(api, async_client, failure):
+    async def main():
+        async with async_client(cache=ResponseCache(ttl=0, stale_if_error=60), retry=RetryPolicy(1)) as client:
+            await client.lyrics('q')
+
+            api.fail(failure)
+            return await client.lyrics('q')
+
+    assert asyncio.run(main()).title == 't'
+
+
+def test_stale_if_error_on_deadline(api, sync_client):
+    client = sync_client(cache=ResponseCache(ttl=0, stale_if_error=60), retry=RetryPolicy(1))
+    client.lyrics('q')
+
+    api.delay = 0.5
+    assert client.lyrics('q', deadline=0.1).title == 't'
+
+    with pytest.raises(DeadlineExceeded):
+        client.lyrics('other', deadline=0.1)
+
+
+def test_no_stale_response_for_refused_requests(api, sync_client):
+    client = sync_client(cache=ResponseCache(ttl=0, stale_if_error=60), retry=RetryPolicy(1))
+    client.lyrics('q')
+
+    api.fail(403)
+    with pytest.raises(Forbidden):
+        client.lyrics('q')
+
+
+def test_no_stale_response_after_stale_if_error(api, sync_client):
+    client = sync_client(cache=ResponseCache(ttl=0, stale_if_error=0.05), retry=RetryPolicy(1))
+    client.lyrics('q')
+    time.sleep(0.1)
+
+    api.fail(500)
+    with pytest.raises(Exception):
+        client.lyrics('q')
+
+
+class Gate:
+    # A lyrics route that holds the first request made after it is armed.
+
+    def __init__(self):
+        self.armed = False
+        self.event = threading.Event()
+
+    def __call__(self, request):
+        if self.armed:
+            self.armed = False
+            self.event.wait(5)
+
+        return lyrics(headers={'Cache-Control': 'max-age=0'})(request)
+
+
+def test_stale_response_is_refreshed_once_in_the_background(api, sync_client):
+    gate = Gate()
+    api.route('/api/lyrics', gate)
+    client = sync_client(cache=ResponseCache(ttl=0, stale_while_revalidate=60))
+
+    client.lyrics('q')
+
+    # Refreshed in the background, held by the API.
+    gate.armed = True
+    assert client.lyrics('q').title == 't'
+    assert client.lyrics('q').title == 't'
+    time.sleep(0.05)
+
+    # A miss is revalidated in the foreground while the refresh runs.
+    client.cache.clear()
+    client.lyrics('q')
+
+    # The refresh is still running, so it isn't started again.
+    client.lyrics('q')
+    time.sleep(0.1)
+    assert api.count('/api/lyrics') == 3
+
+    gate.event.set()
+
+
+def test_async_stale_response_is_refreshed_once_in_the_background(api, async_client):
+    gate = Gate()
+    api.route('/api/lyrics', gate)
+
+    async def main():
+        async with async_client(cache=ResponseCache(ttl=0, stale_while_revalidate=60)) as client:
+            await client.lyrics('q')
+
+            gate.armed = True
+            await client.lyrics('q')
+            await client.lyrics('q')
+            await asyncio.sleep(0.05)
+
+            client.cache.clear()
+            await client.lyrics('q')
+
+            await client.lyrics('q')
+            await asyncio.sleep(0.1)
+            count = api.count('/api/lyrics')
+
+            gate.event.set()
+            return count
+
+    assert asyncio.run(main()) == 3
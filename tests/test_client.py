@@ -0,0 +1,109 @@
+import asyncio
+
+import aiohttp
+import requests
+
+from openrobot.api_wrapper import AsyncClient, SyncClient
+
+
+def test_sync_session_is_pooled_and_reused(api, sync_client):
+    client = sync_client(pool_maxsize=4)
+    assert client.session is None
+
+    client.lyrics('a')
+    session = client.session
+    client.lyrics('b')
+
+    assert isinstance(session, requests.Session)
+    assert client.session is session
+    assert client.stats()['pool']['hosts'] == 1
+    assert client.stats()['pool']['idle'] == 1
+
+
+def test_sync_close_closes_its_own_session(api):
+    client = SyncClient('token')
+    client.lyrics('a')
+    session = client.session
+    assert len(session.get_adapter('https://').poolmanager.pools) == 1
+
+    client.close()
+
+    assert client.session is None
+    assert all(len(adapter.poolmanager.pools) == 0 for adapter in session.adapters.values())
+
+    # A new session is made if the client is used again.
+    client.lyrics('a')
+    assert client.session is not session
+    client.close()
+
+
+def test_sync_context_manager_closes_the_session(api):
+    with SyncClient('token') as client:
+        client.lyrics('a')
+
+    assert client.session is None
+
+
+def test_sync_session_passed_is_left_open(api):
+    session = requests.Session()
+
+    with SyncClient('token', session=session) as client:
+        client.lyrics('a')
+        assert client.session is session
+
+    assert client.session is session
+    assert len(session.get_adapter('https://').poolmanager.pools) == 1
+
+    session.close()
+
+
+def test_async_session_is_made_once_and_reused(api, async_client):
+    async def main():
+        async with async_client(limit=4) as client:
+            assert client.session is None
+
+            await client.lyrics('a')
+            session = client.session
+            await asyncio.gather(client.lyrics('b'), client.lyrics('c'))
+
+            assert client.session is session
+            assert client.session.connector.limit == 4
+
+        return session
+
+    assert asyncio.run(main()).closed
+
+
+def test_async_aclose_closes_its_own_session(api):
+    async def main():
+        client = AsyncClient('token')
+        await client.lyrics('a')
+        session = client.session
+
+        await client.aclose()
+        assert client.session is None
+
+        # A new session is made if the client is used again.
+        await client.lyrics('a')
+        assert client.session is not session
+        await client.aclose()
+
+        return session
+
+    assert asyncio.run(main()).closed
+
+
+def test_async_session_passed_is_left_open(api):
+    async def main():
+        session = aiohttp.ClientSession()
+
+        async with AsyncClient('token', session=session) as client:
+            await client.lyrics('a')
+            assert client.session is session
+
+        closed = session.closed
+        await session.close()
+
+        return closed
+
+    assert asyncio.run(main()) is False
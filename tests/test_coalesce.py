@@ -0,0 +1,72 @@
+import asyncio
+import concurrent.futures
+
+from openrobot.api_wrapper import async_map
+from openrobot.api_wrapper.coalesce import input_key, request_key
+
+
+def test_input_key_tells_types_apart():
+    keys = {input_key(1), input_key(1.0), input_key(True), input_key('1')}
+
+    assert len(keys) == 4
+    assert input_key((1, 'en')) != input_key((True, 'en'))
+    assert input_key(b'image') == input_key(bytearray(b'image'))
+    assert input_key(open) is None
+    assert input_key((1, open)) is None
+
+
+def test_request_key_ignores_none_params():
+    assert request_key('get', '/api/x', {'a': 1, 'b': None}) == request_key('GET', '/api/x', {'a': 1})
+    assert request_key('GET', '/api/x', {'a': 1}) != request_key('GET', '/api/x', {'a': 2})
+
+
+def test_dedupe_doesnt_merge_equal_values_of_different_types():
+    calls = []
+
+    async def func(value):
+        calls.append(value)
+        return repr(value)
+
+    async def main():
+        return [item.result async for item in async_map(func, [1, 1.0, True, 1], dedupe=True)]
+
+    assert asyncio.run(main()) == ['1', '1.0', 'True', '1']
+    assert calls == [1, 1.0, True]
+
+
+def lookup_twice_at_once(client):
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        return [future.result() for future in [executor.submit(client.lyrics, 'q') for _ in range(2)]]
+
+
+def test_identical_lookups_share_a_request(api, sync_client):
+    api.delay = 0.1
+    client = sync_client(coalesce=True)
+
+    assert [result.title for result in lookup_twice_at_once(client)] == ['t', 't']
+    assert api.count('/api/lyrics') == 1
+    assert client.stats()['coalesced'] == 1
+
+
+def test_lookups_arent_coalesced_by_default(api, sync_client):
+    api.delay = 0.1
+    client = sync_client()
+
+    lookup_twice_at_once(client)
+
+    assert api.count('/api/lyrics') == 2
+
+
+def test_async_identical_lookups_share_a_request(api, async_client):
+    api.delay = 0.1
+
+    async def main():
+        async with async_client(coalesce=True) as client:
+            results = await asyncio.gather(client.lyrics('q'), client.lyrics('q'), client.lyrics('other'))
+            return results, client.stats()['coalesced']
+
+    results, coalesced = asyncio.run(main())
+
+    assert [result.title for result in results] == ['t'] * 3
+    assert api.count('/api/lyrics') == 2
+    assert coalesced == 1
@@ -0,0 +1,95 @@
+import asyncio
+import itertools
+import threading
+import time
+
+from openrobot.api_wrapper import HedgePolicy
+
+
+def test_learned_delay():
+    policy = HedgePolicy(percentile=0.9, min_samples=10)
+
+    for latency in range(1, 10):
+        policy.observe('/api/lyrics/x', latency / 100)
+    assert policy.hedge_delay('/api/lyrics/x') is None
+
+    # Every query is the same route.
+    policy.observe('/api/lyrics/y', 0.5)
+    assert policy.hedge_delay('/api/lyrics/z') == 0.5
+
+
+def test_applies():
+    policy = HedgePolicy(routes=['/api/lyrics/x'])
+
+    assert policy.applies('GET', '/api/lyrics/y')
+    assert not policy.applies('POST', '/api/lyrics/y')
+    assert not policy.applies('GET', '/api/translate')
+    assert HedgePolicy().applies('GET', '/api/translate')
+
+
+def test_max_rate():
+    policy = HedgePolicy(0.01, max_rate=0.5)
+
+    allowed = []
+    for _ in range(10):
+        policy.hedge_delay('/api/ocr')
+        allowed.append(policy.allow('/api/ocr'))
+
+    assert allowed.count(True) == 5
+    assert policy.stats()['/api/ocr'] == {'requests': 10, 'hedged': 5, 'hedge_wins': 0, 'capped': 5}
+
+
+def slow_first(seconds):
+    # A lyrics route whose first request takes ``seconds``.
+    calls = itertools.count()
+    released = threading.Event()
+
+    def route(request):
+        if next(calls) == 0:
+            released.wait(seconds)
+
+        return 200, {'title': 't', 'artist': 'a', 'lyrics': 'l', 'images': {}}, {}
+
+    route.release = released.set
+    return route
+
+
+def test_slow_lookup_is_hedged(api, sync_client):
+    route = slow_first(2)
+    api.route('/api/lyrics', route)
+    client = sync_client(hedge=HedgePolicy(0.05))
+
+    started = time.monotonic()
+    assert client.lyrics('q').title == 't'
+
+    assert time.monotonic() - started < 1
+    assert api.count('/api/lyrics') == 2
+    assert client.stats()['hedge']['/api/lyrics/{query}']['hedge_wins'] == 1
+
+    route.release()
+
+
+def test_fast_lookup_is_not_hedged(api, sync_client):
+    client = sync_client(hedge=HedgePolicy(0.5))
+
+    client.lyrics('q')
+
+    assert api.count('/api/lyrics') == 1
+
+
+def test_async_slow_lookup_is_hedged(api, async_client):
+    route = slow_first(2)
+    api.route('/api/lyrics', route)
+
+    async def main():
+        async with async_client(hedge=HedgePolicy(0.05)) as client:
+            started = time.monotonic()
+            await client.lyrics('q')
+            return time.monotonic() - started, client.stats()['hedge']
+
+    elapsed, stats = asyncio.run(main())
+    route.release()
+
+    assert elapsed < 1
+    assert api.count('/api/lyrics') == 2
+    assert stats['/api/lyrics/{query}']['hedge_wins'] == 1
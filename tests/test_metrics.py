@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from openrobot.api_wrapper import LatencyHistogram, Metrics, RequestEvent, RetryPolicy
+
+
+def test_hooks_are_called():
+    metrics = Metrics()
+    events = []
+
+    @metrics.hook('request_end')
+    def on_end(event):
+        events.append(event)
+
+    metrics.emit(RequestEvent('request_start', 'GET', '/api/lyrics/q', 1))
+    metrics.emit(RequestEvent('request_end', 'GET', '/api/lyrics/q', 1, status=200, duration=0.1))
+
+    assert [event.route for event in events] == ['/api/lyrics/{query}']
+
+    metrics.remove_hook('request_end', on_end)
+    metrics.emit(RequestEvent('request_end', 'GET', '/api/lyrics/q', 1, status=200, duration=0.1))
+    assert len(events) == 1
+
+    with pytest.raises(ValueError):
+        metrics.add_hook('done', on_end)
+
+
+def test_failing_hook_warns():
+    metrics = Metrics()
+    metrics.add_hook('retry', lambda event: 1 / 0)
+
+    with pytest.warns(RuntimeWarning):
+        metrics.emit(RequestEvent('retry', 'GET', '/api/ocr', 1, status=503, duration=0.1))
+
+    assert metrics.get('retries_total', reason='503') == 1
+
+
+def test_prometheus():
+    metrics = Metrics(prefix='test')
+    metrics.emit(RequestEvent('request_start', 'POST', '/api/ocr', 1))
+    metrics.emit(RequestEvent('request_end', 'POST', '/api/ocr', 1, status=200, duration=0.25, bytes_sent=100))
+
+    text = metrics.prometheus()
+
+    assert '# TYPE test_requests_total counter' in text
+    assert 'test_requests_total{method="POST",route="/api/ocr",status="200"} 1\n' in text
+    assert 'test_bytes_sent_total{route="/api/ocr"} 100\n' in text
+    assert 'test_requests_in_flight{route="/api/ocr"} 0\n' in text
+    assert 'test_request_duration_seconds_count{route="/api/ocr"} 1\n' in text
+
+
+def test_client_events(api, sync_client):
+    client = sync_client(retry=RetryPolicy(initial=0.01))
+    events = []
+
+    for event in ('request_start', 'request_end', 'retry', 'error'):
+        client.metrics.add_hook(event, lambda e: events.append((e.event, e.attempt, e.status)))
+
+    api.fail(503, 'drop')
+    client.lyrics('q')
+
+    assert events == [
+        ('request_start', 1, None), ('request_end', 1, 503), ('retry', 1, 503),
+        ('request_start', 2, None), ('error', 2, None), ('retry', 2, None),
+        ('request_start', 3, None), ('request_end', 3, 200),
+    ]
+    assert client.metrics.get('requests_total', status='200') == 1
+    assert client.metrics.get('request_errors_total') == 1
+    assert client.metrics.get('requests_in_flight') == 0
+
+
+def test_histogram_percentiles_are_within_1_percent():
+    histogram = LatencyHistogram()
+    rng = random.Random(0)
+    latencies = sorted(rng.lognormvariate(-3, 1.5) for _ in range(10000))
+
+    for latency in latencies:
+        histogram.record(latency)
+
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = latencies[int(q * len(latencies)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.01, abs=1e-6)
+
+    stats = histogram.stats()
+    assert stats['count'] == 10000
+    assert stats['min'] == latencies[0]
+    assert stats['max'] == latencies[-1]
+    assert stats['mean'] == pytest.approx(sum(latencies) / len(latencies))
+
+
+def test_histogram_edges():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    assert histogram.stats()['mean'] is None
+
+    histogram.record(-1)
+    histogram.record(10 ** 6)
+
+    # Counted as about 19 hours, the largest latency it holds.
+    assert histogram.percentile(0) == 0
+    assert histogram.percentile(1) == pytest.approx(((1 << 36) - 1) / 10 ** 6, rel=0.01)
+    assert histogram.stats()['max'] == 10 ** 6
+
+
+def test_histogram_merge():
+    first, second, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+
+    for i in range(1, 100):
+        (first if i % 2 else second).record(i / 1000)
+        both.record(i / 1000)
+
+    first.merge(second)
+    first.merge(LatencyHistogram())
+
+    assert first.stats() == both.stats()
+
+
+def test_latency_stats_per_route():
+    metrics = Metrics()
+
+    for route, duration in (('/api/ocr', 0.1), ('/api/ocr', 0.3), ('/api/lyrics/q', 0.2)):
+        metrics.emit(RequestEvent('request_start', 'GET', route, 1))
+        metrics.emit(RequestEvent('request_end', 'GET', route, 1, status=200, duration=duration))
+
+    metrics.emit(RequestEvent('request_start', 'GET', '/api/ocr', 1))
+    metrics.emit(RequestEvent('request_end', 'GET', '/api/ocr', 1, status=503, duration=0.1))
+
+    stats = metrics.stats()
+    ocr = stats['routes']['/api/ocr']
+
+    assert ocr['requests'] == 3
+    assert ocr['error_rate'] == pytest.approx(1 / 3)
+    assert ocr['latency']['max'] == 0.3
+    assert stats['total']['latency']['count'] == 4
+    assert stats['total']['requests'] == 4
+
+    metrics.reset()
+    assert metrics.stats()['total']['latency']['count'] == 0
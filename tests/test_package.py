@@ -0,0 +1,16 @@
+import types
+
+import openrobot.api_wrapper
+
+
+def test_star_import_exports_only_the_public_names():
+    namespace = {}
+    exec('from openrobot.api_wrapper import *', namespace)
+
+    assert not [name for name, value in namespace.items() if isinstance(value, types.ModuleType)]
+    assert not {'os', 'json', 'asyncio', 'sqlite3', 'typing', 'importlib', 'sys'} & set(namespace)
+    assert {'AsyncClient', 'SyncClient', 'OpenRobotAPIError', 'RateLimiter', 'Upload', 'UploadSource'} <= set(namespace)
+
+
+def test_submodules_are_still_attributes():
+    assert openrobot.api_wrapper.ratelimit.RateLimiter is openrobot.api_wrapper.RateLimiter
@@ -0,0 +1,159 @@
+import io
+import struct
+import warnings
+import zlib
+
+import pytest
+
+from openrobot.api_wrapper import ImagePreprocessor, PreprocessedImage, UnsupportedImage, Upload, sniff_format
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def encode(image, format='JPEG', **kwargs):
+    out = io.BytesIO()
+    image.save(out, format, **kwargs)
+    return out.getvalue()
+
+
+def noise(width, height):
+    # Doesn't compress well, like a photo.
+    return Image.frombytes('RGB', (width, height), bytes(i * 7919 % 251 for i in range(width * height * 3)))
+
+
+def png_header(width, height):
+    # A PNG that only has a header, claiming a size without its pixels.
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b'')) + chunk(b'IEND', b''))
+
+
+def test_sniff_format():
+    image = Image.new('RGB', (4, 4))
+
+    assert [sniff_format(encode(image, format)) for format in ('JPEG', 'PNG', 'GIF', 'BMP', 'TIFF', 'WEBP')] == \
+        ['JPEG', 'PNG', 'GIF', 'BMP', 'TIFF', 'WEBP']
+    assert sniff_format(b'%PDF-1.7') is None
+
+
+def test_non_images_are_rejected():
+    preprocessor = ImagePreprocessor()
+
+    with pytest.raises(UnsupportedImage, match='unknown'):
+        preprocessor.process(Upload(b'%PDF-1.7 not an image'))
+
+    with pytest.raises(UnsupportedImage, match='GIF'):
+        ImagePreprocessor(formats=['JPEG']).process(Upload(encode(Image.new('RGB', (4, 4)), 'GIF')))
+
+    # A known signature that isn't an image after all.
+    with pytest.raises(UnsupportedImage, match='read'):
+        preprocessor.process(Upload(b'\x89PNG\r\n\x1a\n' + b'\x00' * 32))
+
+    assert preprocessor.stats()['rejected'] == 2
+
+
+def test_max_bytes():
+    with pytest.raises(UnsupportedImage, match='bytes'):
+        ImagePreprocessor(max_bytes=100).process(Upload(encode(noise(64, 64))))
+
+
+def test_max_pixels_is_checked_from_the_header():
+    preprocessor = ImagePreprocessor()
+    assert preprocessor.max_pixels == Image.MAX_IMAGE_PIXELS
+
+    with pytest.raises(UnsupportedImage, match='pixels'):
+        ImagePreprocessor(max_pixels=100).process(Upload(encode(Image.new('RGB', (20, 10)), 'PNG')))
+
+    # Over Pillow's warning threshold, rejected without the warning.
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+
+        with pytest.raises(UnsupportedImage, match='pixels'):
+            preprocessor.process(Upload(png_header(10000, 10000)))
+
+
+def test_downscales_to_the_target_size():
+    data = encode(noise(800, 400), quality=95)
+    preprocessor = ImagePreprocessor(200)
+
+    image = preprocessor.process(Upload(data, field='upload_file', filename='a.jpg'))
+
+    assert image.resized
+    assert (image.format, image.original_size, image.size) == ('JPEG', (800, 400), (200, 100))
+    assert image.upload.size == len(data) - image.bytes_saved
+    assert (image.upload.field, image.upload.filename) == ('upload_file', 'a.jpg')
+    assert Image.open(io.BytesIO(b''.join(image.upload.chunks()))).size == (200, 100)
+
+
+def test_small_images_are_sent_as_they_are():
+    upload = Upload(encode(noise(100, 50)))
+
+    image = ImagePreprocessor(200).process(upload)
+
+    assert image.upload is upload
+    assert not image.resized
+
+
+def test_transparency_is_kept():
+    image = ImagePreprocessor(50).process(Upload(encode(noise(200, 100).convert('RGBA'), 'PNG')))
+
+    assert Image.open(io.BytesIO(b''.join(image.upload.chunks()))).mode == 'RGBA'
+
+
+def test_exif_orientation_is_kept():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotated 90 degrees.
+
+    image = ImagePreprocessor(200).process(Upload(encode(noise(800, 400), exif=exif.tobytes())))
+    sent = Image.open(io.BytesIO(b''.join(image.upload.chunks())))
+
+    # The API rotates it the same way as the original.
+    assert sent.getexif()[0x0112] == 6
+    assert sent.size == (200, 100)
+
+
+def test_restore_maps_the_rectangles_back():
+    image = PreprocessedImage(Upload(b'x'), 'JPEG', (800, 400), (200, 100))
+    js = {'celebrities': [{'name': 'a', 'face_rectangle': {'left': 10, 'top': 20, 'width': 30, 'height': 40}}]}
+
+    restored = image.restore('/api/celebrity', js)
+
+    assert restored['celebrities'][0]['face_rectangle'] == {'left': 40, 'top': 80, 'width': 120, 'height': 160}
+    assert js['celebrities'][0]['face_rectangle']['left'] == 10
+    assert image.restore('/api/ocr', {'text': 'a'}) == {'text': 'a'}
+    assert PreprocessedImage(Upload(b'x'), 'JPEG', (8, 4)).restore('/api/celebrity', js) is js
+
+
+def test_stats():
+    preprocessor = ImagePreprocessor(200)
+    large = encode(noise(800, 400), quality=95)
+    small = encode(noise(100, 50))
+
+    saved = preprocessor.process(Upload(large)).bytes_saved
+    preprocessor.process(Upload(small))
+
+    assert preprocessor.stats() == {
+        'images': 2,
+        'resized': 1,
+        'rejected': 0,
+        'bytes_in': len(large) + len(small),
+        'bytes_out': len(large) - saved + len(small),
+        'bytes_saved': saved,
+    }
+
+
+def test_client_sends_the_downscaled_image(api, sync_client):
+    data = encode(noise(800, 400), quality=95)
+    client = sync_client(preprocess=ImagePreprocessor(200))
+
+    client.ocr(data)
+
+    assert len(api.requests[0].body) < len(data)
+    assert client.stats()['preprocess']['resized'] == 1
+
+    with pytest.raises(UnsupportedImage):
+        client.ocr(b'not an image')
+
+    assert api.count('/api/ocr') == 1
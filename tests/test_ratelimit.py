@@ -0,0 +1,261 @@
+import asyncio
+import email.utils
+import os
+import sqlite3
+import stat
+import time
+
+import pytest
+
+from openrobot.api_wrapper import Deadline, DeadlineExceeded, RateLimiter, RetryPolicy, SQLiteBackend, TokenBucket
+
+
+def test_bucket_lets_the_burst_through():
+    bucket = TokenBucket(2, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.01)
+    # Every caller gets its own place in the queue.
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.01)
+
+
+def test_bucket_refills():
+    bucket = TokenBucket(100, burst=1)
+
+    assert bucket.reserve() == 0.0
+    time.sleep(0.02)
+    assert bucket.reserve() == 0.0
+
+
+def test_bucket_drain():
+    bucket = TokenBucket(10)
+    bucket.drain(2)
+
+    assert bucket.reserve() == pytest.approx(2.1, abs=0.01)
+
+
+def test_endpoint_limits_apply_to_sub_routes():
+    limiter = RateLimiter(endpoints={'/api/lyrics': (1, 10)})
+
+    assert limiter.reserve('/api/lyrics/foo') == 0.0
+    assert limiter.reserve('/api/lyrics/bar') == pytest.approx(10, abs=0.01)
+    assert limiter.reserve('/api/ocr') == 0.0
+
+
+def test_global_and_endpoint_limits():
+    limiter = RateLimiter(1, per=5, burst=2, endpoints={'ocr': 1})
+
+    assert limiter.reserve('/api/ocr') == 0.0
+    # The endpoint bucket is empty, the global one is not.
+    assert limiter.reserve('/api/ocr') == pytest.approx(1, abs=0.01)
+    # Both buckets are empty now.
+    assert limiter.reserve('/api/lyrics/x') == pytest.approx(5, abs=0.01)
+
+
+def test_penalize_holds_back_the_route():
+    limiter = RateLimiter(endpoints={'/api/ocr': 100})
+    limiter.penalize('/api/ocr', 1)
+
+    assert limiter.reserve('/api/ocr') == pytest.approx(1.01, abs=0.01)
+
+
+def test_stats():
+    limiter = RateLimiter(endpoints={'/api/ocr': (1, 1)})
+    limiter.reserve('/api/ocr')
+    limiter.reserve('/api/ocr')
+
+    stats = limiter.stats()
+    assert stats['requests'] == 2
+    assert stats['delayed'] == 1
+    assert stats['endpoints']['/api/ocr']['max_wait'] == pytest.approx(1, abs=0.01)
+
+
+def test_acquire_waits():
+    limiter = RateLimiter(20, burst=1)
+
+    started = time.monotonic()
+    limiter.acquire('/api/ocr')
+    assert limiter.acquire('/api/ocr') > 0
+
+    assert time.monotonic() - started >= 0.04
+
+
+def test_acquire_async_waits():
+    limiter = RateLimiter(20, burst=1)
+
+    async def main():
+        return await asyncio.gather(*[limiter.acquire_async('/api/ocr') for _ in range(3)])
+
+    waits = asyncio.run(main())
+    assert waits[0] == 0.0
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+
+
+def test_rejected_requests_are_given_back():
+    limiter = RateLimiter(10, burst=1, endpoints={'/api/ocr': (10, 1)})
+    limiter.acquire('/api/ocr')
+
+    for _ in range(200):
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire('/api/ocr', deadline=Deadline(0.01))
+
+    # Not behind the 200 requests that were never sent.
+    assert limiter.reserve('/api/ocr') <= 0.1
+
+
+def test_cancelled_waits_are_given_back():
+    limiter = RateLimiter(10, burst=1)
+    limiter.acquire('/api/ocr')
+
+    async def main():
+        waits = [asyncio.ensure_future(limiter.acquire_async('/api/ocr')) for _ in range(50)]
+        await asyncio.sleep(0.01)
+
+        for wait in waits:
+            wait.cancel()
+        await asyncio.gather(*waits, return_exceptions=True)
+
+        return limiter.waiting, limiter.reserve('/api/ocr')
+
+    waiting, delay = asyncio.run(main())
+
+    assert waiting == 0
+    assert delay <= 0.1
+
+
+def test_sqlite_backend_refund(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'ratelimit.sqlite3'))
+    limiter = RateLimiter(1, per=10, backend=backend)
+
+    limiter.reserve('/api/ocr')
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire('/api/ocr', deadline=Deadline(1))
+
+    assert limiter.reserve('/api/ocr') == pytest.approx(10, abs=0.1)
+
+
+def test_sqlite_backend_cancelled_reservation_is_given_back(tmp_path):
+    path = str(tmp_path / 'ratelimit.sqlite3')
+    limiter = RateLimiter(1, per=10, backend=SQLiteBackend(path))
+
+    # Another process holds the lock, so the reservation waits for it.
+    lock = sqlite3.connect(path, isolation_level=None)
+    lock.execute('BEGIN IMMEDIATE')
+
+    async def main():
+        loop = asyncio.get_running_loop()
+
+        wait = asyncio.ensure_future(limiter.acquire_async('/api/ocr'))
+        await asyncio.sleep(0.05)
+        wait.cancel()
+        await asyncio.gather(wait, return_exceptions=True)
+
+        lock.execute('COMMIT')
+        await asyncio.sleep(0.1)
+
+        # The first in the queue, as the cancelled one was given back.
+        first = await loop.run_in_executor(None, limiter.reserve, '/api/ocr')
+
+        # Given back in the executor, once its wait is cancelled.
+        wait = asyncio.ensure_future(limiter.acquire_async('/api/ocr'))
+        await asyncio.sleep(0.05)
+        wait.cancel()
+        await asyncio.gather(wait, return_exceptions=True)
+        await asyncio.sleep(0.1)
+
+        return first, await loop.run_in_executor(None, limiter.reserve, '/api/ocr')
+
+    first, second = asyncio.run(main())
+    lock.close()
+
+    assert first == 0.0
+    # Not behind the cancelled one.
+    assert 9 < second <= 10
+
+
+def test_clients_are_paced(api, sync_client):
+    limiter = RateLimiter()
+    limiter.limit('/api/lyrics', 20, burst=1)
+    client = sync_client(ratelimiter=limiter)
+
+    started = time.monotonic()
+    for _ in range(3):
+        client.lyrics('query')
+
+    assert time.monotonic() - started >= 0.09
+    assert api.count('/api/lyrics') == 3
+
+
+RATELIMITED = {'message': 'ratelimited', 'error': {'code': 429}}
+
+
+def test_retry_after_date_is_waited_for(api, sync_client):
+    waits = []
+    client = sync_client()
+    client.metrics.add_hook('ratelimit_wait', lambda event: waits.append(event.duration))
+    api.fail((429, RATELIMITED, {'Retry-After': email.utils.formatdate(time.time() - 60, usegmt=True)}))
+
+    assert client.lyrics('q').title == 't'
+    assert api.count('/api/lyrics') == 2
+    assert waits == [0.0]
+
+
+def test_missing_retry_after_backs_off(api, sync_client):
+    waits = []
+    client = sync_client(retry=RetryPolicy(initial=0.01))
+    client.metrics.add_hook('ratelimit_wait', lambda event: waits.append(event.duration))
+    api.fail((429, RATELIMITED, {}), (429, RATELIMITED, {'Retry-After': 'soon'}))
+
+    assert client.lyrics('q').title == 't'
+    assert api.count('/api/lyrics') == 3
+    assert len(waits) == 2 and all(0 <= wait <= 0.02 for wait in waits)
+
+
+def test_async_missing_retry_after_backs_off(api, async_client):
+    async def main():
+        async with async_client(retry=RetryPolicy(initial=0.01)) as client:
+            api.fail((429, RATELIMITED, {}))
+            return await client.lyrics('q')
+
+    assert asyncio.run(main()).title == 't'
+    assert api.count('/api/lyrics') == 2
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = str(tmp_path / 'ratelimit.sqlite3')
+
+    first = RateLimiter(1, per=10, backend=SQLiteBackend(path))
+    second = RateLimiter(1, per=10, backend=SQLiteBackend(path))
+
+    assert first.reserve('/api/ocr') == 0.0
+    assert second.reserve('/api/ocr') == pytest.approx(10, abs=0.1)
+
+
+def test_sqlite_backend_default_path_is_private(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+
+    backend = SQLiteBackend()
+
+    assert backend.path == str(tmp_path / '.openrobot' / 'api' / 'ratelimit.sqlite3')
+    assert stat.S_IMODE(os.stat(backend.path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(backend.path)).st_mode) == 0o700
+    assert TokenBucket(1, backend=backend, key='x').reserve() == 0.0
+
+
+def test_async_retry_after_wait_releases_the_connection(api, async_client):
+    async def main():
+        async with async_client(limit=1) as client:
+            api.fail((429, RATELIMITED, {'Retry-After': '0.5'}))
+            ratelimited = asyncio.ensure_future(client.lyrics('q'))
+            await asyncio.sleep(0.2)
+
+            # The only connection isn't held while the first call waits.
+            started = time.monotonic()
+            await client.ocr(b'image')
+            took = time.monotonic() - started
+
+            await ratelimited
+            return took
+
+    assert asyncio.run(main()) < 0.25
+    assert api.count('/api/lyrics') == 2
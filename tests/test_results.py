@@ -0,0 +1,109 @@
+from openrobot.api_wrapper import (CelebrityResult, LyricResult, NSFWCheckResult, SentimentResult,
+                                   TextToSpeechSupportResult)
+
+SENTIMENT = {'task_id': '1', 'text': 'x', 'status': 'COMPLETED', 'timestamp': 1.0,
+             'result': [{'label': 'POSITIVE', 'score': 0.9}, {'label': 'NEGATIVE', 'score': 0.1}]}
+LYRICS = {'title': 't', 'artist': 'a', 'lyrics': 'l', 'images': {'background': 'b.png'}}
+NSFW = {'image_url': 'u', 'adult': {'is_adult': False, 'adult_score': 0.1},
+        'racy': {'is_racy': True, 'racy_score': 0.7}, 'gore': {'is_gore': False, 'gore_score': 0.0}}
+CELEBRITY = {'name': 'n', 'confidence': 0.5, 'face_rectangle': {'left': 1, 'top': 2, 'width': 3, 'height': 4}}
+VOICES = {'languages': ['en-US'], 'voices': [{'Gender': 'Female', 'Id': 'Joanna', 'LanguageCode': 'en-US',
+                                              'LanguageName': 'US English', 'Name': 'Joanna'}]}
+
+
+class Counting(dict):
+    # A payload that counts how many times its nested values are read.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = {}
+
+    def __getitem__(self, key):
+        self.reads[key] = self.reads.get(key, 0) + 1
+        return super().__getitem__(key)
+
+
+def test_nested_objects_are_built_on_first_access():
+    js = Counting(SENTIMENT)
+    result = SentimentResult(js)
+
+    assert js.reads.get('result') is None
+    assert result.status == 'COMPLETED'
+
+    first = result.result
+    assert js.reads['result'] == 1
+    assert result.result is first
+    assert js.reads['result'] == 1
+
+
+def test_nested_objects_have_the_same_values():
+    sentiment = SentimentResult(SENTIMENT)
+    lyrics = LyricResult(LYRICS)
+    nsfw = NSFWCheckResult(NSFW)
+    celebrity = CelebrityResult(CELEBRITY)
+    voices = TextToSpeechSupportResult(VOICES)
+
+    assert [(r.label, r.score) for r in sentiment.result] == [('POSITIVE', 0.9), ('NEGATIVE', 0.1)]
+    assert (lyrics.images.background, lyrics.images.track) == ('b.png', None)
+    assert (nsfw.adult.is_adult, nsfw.racy.racy_score, nsfw.gore.is_gore) == (False, 0.7, False)
+    rectangle = celebrity.face_rectangle
+    assert (rectangle.left, rectangle.top, rectangle.width, rectangle.height) == (1, 2, 3, 4)
+    voice = voices.voices[0]
+    assert (voice.id, voice.gender, voice.language.code, voice.language.name) == \
+        ('Joanna', 'Female', 'en-US', 'US English')
+
+
+def test_lazy_attributes_can_be_assigned():
+    js = Counting(LYRICS)
+    result = LyricResult(js)
+
+    result.images = None
+    assert result.images is None
+    assert 'images' not in js.reads
+
+    sentiment = SentimentResult(SENTIMENT)
+    sentiment.result
+    sentiment.result = []
+    assert sentiment.result == []
+
+
+def test_raw_is_dropped_without_keep_raw():
+    js = Counting(LYRICS)
+    result = LyricResult(js, keep_raw=False)
+    reads = dict(js.reads)
+
+    assert result.raw is None
+    assert result.images.background == 'b.png'
+    # Built before the payload was let go.
+    assert js.reads == reads
+
+    sentiment = SentimentResult(SENTIMENT, keep_raw=False)
+    assert sentiment.raw is None
+    assert sentiment.result[0].label == 'POSITIVE'
+
+
+def test_raw_is_kept_by_default():
+    assert LyricResult(LYRICS).raw is LYRICS
+    assert LyricResult(LYRICS, keep_raw=True).raw is LYRICS
+
+
+def test_results_have_no_dict():
+    from openrobot.api_wrapper import results
+
+    classes = [value for value in vars(results).values()
+               if isinstance(value, type) and value.__module__ == results.__name__ and value is not results._lazy]
+
+    for cls in classes:
+        for base in cls.__mro__[:-1]:
+            assert '__slots__' in vars(base), base
+
+    for result in (SentimentResult(SENTIMENT), LyricResult(LYRICS), NSFWCheckResult(NSFW), CelebrityResult(CELEBRITY),
+                   TextToSpeechSupportResult(VOICES)):
+        assert not hasattr(result, '__dict__')
+
+
+def test_client_drops_raw(api, sync_client):
+    result = sync_client(keep_raw=False).lyrics('q')
+
+    assert result.raw is None
+    assert result.title == 't'
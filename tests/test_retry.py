@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from openrobot.api_wrapper import InternalServerError, OpenRobotAPIError, RetryPolicy
+
+
+def test_delays_grow_with_full_jitter():
+    policy = RetryPolicy(initial=1, maximum=3)
+
+    assert all(0 <= policy.delay(0) <= 1 for _ in range(20))
+    assert all(0 <= policy.delay(5) <= 3 for _ in range(20))
+
+
+def test_next_delay_gives_up():
+    policy = RetryPolicy(2, initial=0.01, budget=10)
+    now = time.monotonic()
+
+    assert policy.next_delay(0, now, 503, retry_after=0.5, remaining=10) == 0.5
+    assert policy.next_delay(0, now, 503, retry_after=5, remaining=1) is None
+    assert policy.next_delay(0, now - 10, 503) is None
+    assert policy.next_delay(1, now, 503) is None
+    assert policy.stats() == {'retries': 1, 'gave_up': 3, 'reasons': {'503': 1}}
+
+
+def test_only_idempotent_methods_by_default():
+    assert RetryPolicy().applies('get')
+    assert not RetryPolicy().applies('POST')
+    assert RetryPolicy(methods=None).applies('POST')
+    assert not RetryPolicy(1, methods=None).applies('GET')
+
+
+def test_lookups_are_retried(api, sync_client):
+    client = sync_client(retry=RetryPolicy(initial=0.01))
+    api.fail(503, 'drop')
+
+    assert client.lyrics('q').title == 't'
+    assert api.count('/api/lyrics') == 3
+    assert client.stats()['retry']['retries'] == 2
+
+
+def test_uploads_are_not_retried_by_default(api, sync_client):
+    client = sync_client()
+    api.fail(500)
+
+    with pytest.raises(InternalServerError):
+        client.ocr(b'image')
+
+    assert api.count('/api/ocr') == 1
+
+
+def test_async_uploads_are_not_retried_by_default(api, async_client):
+    async def main():
+        async with async_client() as client:
+            api.fail(503)
+            with pytest.raises(OpenRobotAPIError):
+                await client.ocr(b'image')
+
+            api.fail(503)
+            return await client.lyrics('q')
+
+    assert asyncio.run(main()).title == 't'
+    assert api.count('/api/ocr') == 1
+    assert api.count('/api/lyrics') == 2
@@ -0,0 +1,88 @@
+import asyncio
+import sqlite3
+import time
+import zlib
+
+from openrobot.api_wrapper import ResultStore
+
+
+def store_at(tmp_path, **kwargs):
+    return ResultStore(str(tmp_path / 'results.sqlite3'), **kwargs)
+
+
+def test_round_trip(tmp_path):
+    store = store_at(tmp_path)
+    digest = store.digest(b'image')
+    value = {'text': 'hello ' * 100, 'nested': [1, 2.5, None]}
+
+    store.put('/api/ocr', digest, value)
+
+    assert store.get('/api/ocr', digest) == value
+    assert store.get('/api/ocr', store.digest(b'other')) is None
+    assert store.get('/api/celebrity', digest) is None
+
+    # Compressed JSON, readable by any other process.
+    blob, size = sqlite3.connect(store.path).execute('SELECT value, size FROM results').fetchone()
+    assert size == len(blob) < len('hello ' * 100)
+    assert zlib.decompress(blob).startswith(b'{"text":"hello')
+
+
+def test_persists_across_instances(tmp_path):
+    store_at(tmp_path).put('/api/ocr', 'd', {'text': 'a'})
+
+    assert store_at(tmp_path).get('/api/ocr', 'd') == {'text': 'a'}
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    store = store_at(tmp_path)
+    size = len(zlib.compress(b'{"text":"a"}'))
+    store.max_bytes = 3 * size
+
+    for digest in 'abc':
+        store.put('/api/ocr', digest, {'text': 'a'})
+        time.sleep(0.01)
+
+    # a is used again, so b is the oldest.
+    store.get('/api/ocr', 'a')
+    time.sleep(0.01)
+    store.put('/api/ocr', 'd', {'text': 'a'})
+
+    assert [store.get('/api/ocr', digest) is not None for digest in 'abcd'] == [True, False, True, True]
+    assert store.report()['size'] == 3 * size
+
+
+def test_report(tmp_path):
+    store = store_at(tmp_path)
+    store.put('/api/ocr', 'a', {'text': 'a'})
+
+    store.get('/api/ocr', 'a')
+    store.get('/api/ocr', 'a')
+    store.get('/api/ocr', 'b')
+    store.get('/api/celebrity', 'a')
+
+    report = store.report()
+
+    assert (report['hits'], report['misses'], report['entries']) == (2, 2, 1)
+    assert report['hit_ratio'] == 0.5
+    assert report['endpoints']['/api/ocr'] == {'hits': 2, 'misses': 1, 'hit_ratio': 2 / 3}
+    assert report['endpoints']['/api/celebrity']['hit_ratio'] == 0.0
+
+
+def test_client_skips_the_upload_on_a_hit(api, sync_client, tmp_path):
+    client = sync_client(store=store_at(tmp_path))
+
+    assert client.ocr(b'image').text == 'hello'
+    assert client.ocr(bytearray(b'image')).text == 'hello'
+    client.ocr(b'other image')
+
+    assert api.count('/api/ocr') == 2
+    assert client.store.report()['hits'] == 1
+
+
+def test_async_client_skips_the_upload_on_a_hit(api, async_client, tmp_path):
+    async def main():
+        async with async_client(store=store_at(tmp_path)) as client:
+            return [(await client.ocr(b'image')).text for _ in range(2)]
+
+    assert asyncio.run(main()) == ['hello', 'hello']
+    assert api.count('/api/ocr') == 1
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from openrobot.api_wrapper import CompletionEstimator, PollBackoff
+
+
+class Tasks:
+    # A task endpoint of the fake API, whose tasks complete ``duration``
+    # seconds after they were submitted. Polling the tasks in ``slow``
+    # takes that many seconds.
+
+    def __init__(self, duration, slow=None):
+        self.duration = duration
+        self.slow = slow or {}
+        self.submitted = {}
+        self.polls = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        if request.method == 'POST':
+            with self._lock:
+                task_id = str(len(self.submitted))
+                self.submitted[task_id] = time.monotonic()
+
+            status = 'STARTED'
+        else:
+            task_id = request.path.split('?', 1)[0].rsplit('/', 1)[1]
+            self.polls[task_id] = self.polls.get(task_id, 0) + 1
+            time.sleep(self.slow.get(task_id, 0))
+
+            duration = self.duration(task_id) if callable(self.duration) else self.duration
+            status = 'COMPLETED' if time.monotonic() - self.submitted[task_id] >= duration else 'PENDING'
+
+        return 200, {'task_id': task_id, 'text': 'x', 'status': status, 'timestamp': 1.0,
+                     'result': [{'label': 'POSITIVE', 'score': 0.9}] if status == 'COMPLETED' else None}, {}
+
+
+def test_poll_backoff():
+    backoff = PollBackoff(0.5, maximum=3, jitter=False)
+
+    assert [backoff.delay(i) for i in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    assert 0.25 <= PollBackoff(0.5).delay(0) <= 0.5
+
+
+def test_estimator_median():
+    estimator = CompletionEstimator(window=3)
+    assert estimator.estimate('sentiment') is None
+
+    for duration in (5, 1, 2, 3):
+        estimator.observe('sentiment', duration)
+
+    # Only the 3 most recent are kept.
+    assert estimator.estimate('sentiment') == 2
+
+
+def test_wait_polls_until_completed(api, sync_client):
+    tasks = Tasks(0.1)
+    api.route('/api/sentiment', tasks)
+    client = sync_client(poll_backoff=PollBackoff(0.02, jitter=False))
+
+    result = client.sentiment('text', wait=True)
+
+    assert result.status == 'COMPLETED'
+    assert result.result[0].label == 'POSITIVE'
+    assert tasks.polls['0'] > 1
+
+
+def test_estimate_goes_down_when_tasks_get_faster(api, sync_client):
+    tasks = Tasks(0.02)
+    api.route('/api/sentiment', tasks)
+    client = sync_client(poll_backoff=PollBackoff(0.02, jitter=False))
+    client.task_estimator.observe('sentiment', 0.4)
+
+    for _ in range(4):
+        client.sentiment('text', wait=True)
+
+    # Each first poll is scheduled at the estimate, and finds the task done.
+    assert all(polls == 1 for polls in tasks.polls.values())
+    assert client.task_estimator.estimate('sentiment') <= 0.25
+
+
+def test_async_wait_polls_until_completed(api, async_client):
+    tasks = Tasks(0.1)
+    api.route('/api/sentiment', tasks)
+
+    async def main():
+        async with async_client(poll_backoff=PollBackoff(0.02, jitter=False)) as client:
+            return await asyncio.gather(*[client.sentiment('text', wait=True) for _ in range(5)])
+
+    results = asyncio.run(main())
+
+    assert [result.status for result in results] == ['COMPLETED'] * 5
+
+
+def test_wait_timeout(api, sync_client):
+    api.route('/api/sentiment', Tasks(10))
+    client = sync_client(poll_backoff=PollBackoff(0.02, jitter=False))
+
+    with pytest.raises(TimeoutError):
+        client.sentiment('text').wait(0.1)
+
+
+def test_slow_poll_doesnt_hold_back_other_tasks(api, sync_client):
+    tasks = Tasks(0.05, slow={'0': 1.0})
+    api.route('/api/sentiment', tasks)
+    client = sync_client(poll_backoff=PollBackoff(0.02, jitter=False))
+
+    slow = client.poller.submit(client.sentiment('text'))
+    time.sleep(0.03)
+
+    started = time.monotonic()
+    results = [client.sentiment('text').wait(2) for _ in range(3)]
+
+    assert [result.status for result in results] == ['COMPLETED'] * 3
+    assert time.monotonic() - started < 0.5
+    assert not slow.done()
+    assert slow.result(2).status == 'COMPLETED'
+
+
+def test_async_slow_poll_doesnt_hold_back_other_tasks(api, async_client):
+    tasks = Tasks(0.05, slow={'0': 1.0})
+    api.route('/api/sentiment', tasks)
+
+    async def main():
+        async with async_client(poll_backoff=PollBackoff(0.02, jitter=False)) as client:
+            slow = asyncio.ensure_future(client.sentiment('text', wait=True))
+            await asyncio.sleep(0.03)
+
+            started = time.monotonic()
+            results = await asyncio.gather(*[client.sentiment('text', wait=True) for _ in range(3)])
+            elapsed = time.monotonic() - started
+
+            return results, elapsed, slow.done(), await slow
+
+    results, elapsed, slow_done, slow = asyncio.run(main())
+
+    assert [result.status for result in results] == ['COMPLETED'] * 3
+    assert elapsed < 0.5
+    assert not slow_done
+    assert slow.status == 'COMPLETED'
+
+
+def test_poller_concurrency(api, sync_client):
+    tasks = Tasks(0.05)
+    api.route('/api/sentiment', tasks)
+    client = sync_client(poll_backoff=PollBackoff(0.02, jitter=False))
+    client.poller.concurrency = 1
+
+    futures = [client.poller.submit(client.sentiment('text')) for _ in range(5)]
+
+    assert [future.result(2).status for future in futures] == ['COMPLETED'] * 5
+    assert client.poller.pending == 0
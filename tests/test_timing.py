@@ -0,0 +1,94 @@
+import asyncio
+import logging
+
+from openrobot.api_wrapper import PHASES, RequestEvent, RequestTimings, SlowRequestLog
+
+
+def slow_event(duration=2.0, timings=None):
+    return RequestEvent('request_end', 'POST', '/api/ocr', 1, status=200, duration=duration, timings=timings)
+
+
+def test_timings_of_a_reused_connection():
+    timings = RequestTimings()
+    timings.headers(0.01)
+    timings.finish()
+
+    assert timings.reused is True
+    assert timings.connect is None
+    assert timings.ttfb is not None and timings.body is not None
+    assert list(timings.as_dict()) == [*PHASES, 'total', 'reused']
+
+
+def test_slow_request_log(caplog):
+    log = SlowRequestLog(1.0)
+    timings = RequestTimings()
+    timings.reused = False
+    timings.finish()
+
+    with caplog.at_level(logging.WARNING, 'openrobot.api_wrapper'):
+        log(slow_event(0.5))
+        log(slow_event(timings=timings))
+
+    [record] = caplog.records
+    assert record.getMessage().startswith('slow request method=POST route=/api/ocr status=200 attempt=1 ')
+    assert 'reused=false' in record.getMessage()
+    assert record.openrobot['route'] == '/api/ocr'
+
+
+def test_slow_request_log_is_capped(caplog):
+    log = SlowRequestLog(1.0, max_per_minute=2)
+
+    with caplog.at_level(logging.WARNING, 'openrobot.api_wrapper'):
+        for _ in range(5):
+            log(slow_event())
+
+    assert len(caplog.records) == 2
+
+    # The next minute tells how many were dropped.
+    log._minute -= 1
+    with caplog.at_level(logging.WARNING, 'openrobot.api_wrapper'):
+        log(slow_event())
+
+    assert caplog.records[-1].openrobot['dropped'] == 3
+
+
+def test_slow_request_log_sampling(caplog):
+    with caplog.at_level(logging.WARNING, 'openrobot.api_wrapper'):
+        for _ in range(10):
+            SlowRequestLog(1.0, sample_rate=0)(slow_event())
+
+    assert not caplog.records
+
+
+def test_client_timings(api, sync_client):
+    client = sync_client()
+    events = []
+    client.metrics.add_hook('request_end', events.append)
+
+    client.lyrics('q')
+    client.lyrics('q')
+
+    first, second = [event.timings for event in events]
+
+    assert first.reused is False and first.connect is not None
+    assert second.reused is True and second.connect is None
+    assert all(timings.ttfb is not None and timings.total >= timings.ttfb for timings in (first, second))
+
+
+def test_async_client_timings(api, async_client):
+    events = []
+
+    async def main():
+        async with async_client() as client:
+            client.metrics.add_hook('request_end', events.append)
+
+            await client.lyrics('q')
+            await client.lyrics('q')
+
+    asyncio.run(main())
+
+    first, second = [event.timings for event in events]
+
+    assert first.reused is False and first.connect is not None
+    assert second.reused is True
+    assert all(timings.ttfb is not None for timings in (first, second))
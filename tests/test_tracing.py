@@ -0,0 +1,89 @@
+import asyncio
+import importlib.util
+
+import pytest
+
+from openrobot.api_wrapper import InMemoryExporter, RetryPolicy, Tracer
+
+
+def test_spans_nest_and_export():
+    exporter = InMemoryExporter(max_spans=2)
+    tracer = Tracer(exporter, opentelemetry=False)
+
+    with tracer.start_span('parent', attributes={'a': 1, 'b': None}) as parent:
+        child = parent.child('child')
+        child.end()
+        child.set_attribute('late', True)
+
+    assert [span.name for span in exporter.spans()] == ['child', 'parent']
+    assert exporter.children(parent) == [child]
+    assert child.trace_id == parent.trace_id and child.parent_id == parent.span_id
+    assert parent.attributes == {'a': 1}
+    assert 'late' not in child.attributes
+
+    tracer.start_span('third').end()
+    assert [span.name for span in exporter.spans()] == ['parent', 'third']
+
+
+def test_span_records_the_error():
+    exporter = InMemoryExporter()
+
+    with pytest.raises(ValueError):
+        with Tracer(exporter, opentelemetry=False).start_span('failed'):
+            raise ValueError
+
+    assert isinstance(exporter.spans('failed')[0].error, ValueError)
+
+
+def test_breakdown():
+    exporter = InMemoryExporter()
+    tracer = Tracer(exporter, opentelemetry=False)
+
+    for _ in range(3):
+        tracer.start_span('step').end()
+
+    stats = exporter.breakdown()['step']
+    assert stats['count'] == 3
+    assert stats['mean'] == pytest.approx(stats['total'] / 3)
+
+
+@pytest.mark.skipif(importlib.util.find_spec('opentelemetry') is not None, reason='OpenTelemetry is installed')
+def test_opentelemetry_is_required_when_asked():
+    with pytest.raises(ImportError):
+        Tracer(opentelemetry=True)
+
+    assert Tracer()._otel is None
+
+
+def test_client_spans(api, sync_client):
+    exporter = InMemoryExporter()
+    client = sync_client(tracer=Tracer(exporter, opentelemetry=False), retry=RetryPolicy(initial=0.01))
+    api.fail(503)
+
+    client.lyrics('q')
+
+    [request] = exporter.spans('openrobot.request')
+    attempts = exporter.spans('openrobot.attempt')
+
+    assert request.attributes['http.method'] == 'GET'
+    assert [span.attributes['openrobot.attempt'] for span in attempts] == [1, 2]
+    assert [span.attributes['http.status_code'] for span in attempts] == [503, 200]
+    assert all(span.parent is request for span in attempts)
+    assert len(exporter.spans('openrobot.backoff')) == 1
+    assert exporter.spans('openrobot.decode')[0].parent is attempts[0]
+
+
+def test_async_client_upload_spans(api, async_client):
+    exporter = InMemoryExporter()
+
+    async def main():
+        async with async_client(tracer=Tracer(exporter, opentelemetry=False)) as client:
+            await client.ocr(b'image')
+
+    asyncio.run(main())
+
+    [attempt] = exporter.spans('openrobot.attempt')
+    names = {span.name for span in exporter.children(attempt)}
+
+    assert {'openrobot.upload', 'openrobot.download', 'openrobot.decode'} <= names
+    assert exporter.spans('openrobot.upload')[0].attributes['openrobot.upload.size'] == 5
@@ -0,0 +1,142 @@
+import asyncio
+import io
+import os
+import threading
+
+import pytest
+
+from openrobot.api_wrapper import MultipartReader, RetryPolicy, Upload
+
+DATA = bytes(range(256)) * 1000
+
+
+def pipe(data):
+    # A file that can't be rewound, like a socket or stdin.
+    read, write = os.pipe()
+
+    def feed():
+        with open(write, 'wb', buffering=0) as f:
+            try:
+                f.write(data)
+            except BrokenPipeError:
+                # The test is done with it.
+                pass
+
+    threading.Thread(target=feed, daemon=True).start()
+    return open(read, 'rb', buffering=0)
+
+
+def test_sources(tmp_path):
+    path = tmp_path / 'image.png'
+    path.write_bytes(DATA)
+
+    with open(path, 'rb') as f:
+        f.read(10)
+
+        uploads = [Upload(DATA), Upload(io.BytesIO(DATA)), Upload(memoryview(DATA)), Upload(path), Upload(f)]
+
+        assert [b''.join(upload.chunks()) for upload in uploads] == [DATA] * 4 + [DATA[10:]]
+        assert [upload.size for upload in uploads] == [len(DATA)] * 4 + [len(DATA) - 10]
+        assert all(upload.replayable for upload in uploads)
+
+        # Read again from where it was.
+        assert b''.join(uploads[-1].chunks()) == DATA[10:]
+
+    assert uploads[3].filename == 'image.png'
+    assert uploads[0].filename == 'file'
+
+    with pytest.raises(TypeError):
+        Upload('image.png')
+
+
+def test_unseekable_file_can_only_be_sent_once():
+    with pipe(b'abc') as f:
+        upload = Upload(f)
+
+        assert not upload.replayable
+        assert upload.size is None
+        assert upload.digest() is None
+
+        upload.requests_kwargs({})
+        with pytest.raises(ValueError):
+            upload.requests_kwargs({})
+
+
+def test_spooled_upload_is_sent_again():
+    upload = Upload(pipe(DATA))
+    upload.spool()
+
+    # The first attempt stops halfway through.
+    chunks = upload.chunks()
+    sent = next(chunks)
+    chunks.close()
+
+    assert sent and b''.join(upload.chunks()) == DATA
+    assert b''.join(upload.chunks()) == DATA
+
+
+def test_multipart_reader():
+    reader = MultipartReader(Upload(DATA, field='upload_file', filename='a"b.png'))
+    body = b''
+
+    while True:
+        chunk = reader.read(1000)
+        if not chunk:
+            break
+
+        assert len(chunk) <= 1000
+        body += bytes(chunk)
+
+    boundary = reader.content_type.split('boundary=')[1]
+
+    assert len(body) == reader.len
+    assert body.startswith(f'--{boundary}\r\n'.encode())
+    assert b'name="upload_file"; filename="a%22b.png"' in body
+    assert body.endswith(DATA + f'\r\n--{boundary}--\r\n'.encode())
+
+
+def test_upload_with_a_content_length(api, sync_client, tmp_path):
+    path = tmp_path / 'image.png'
+    path.write_bytes(DATA)
+    client = sync_client()
+
+    assert client.ocr(path).text == 'hello'
+
+    request = api.requests[0]
+    assert int(request.headers['Content-Length']) == len(request.body)
+    assert DATA in request.body
+
+
+def test_unknown_size_is_sent_chunked(api, sync_client):
+    client = sync_client()
+
+    client.ocr(pipe(DATA))
+
+    request = api.requests[0]
+    assert request.headers['Transfer-Encoding'] == 'chunked'
+    assert DATA in request.body
+
+
+def test_retried_upload_is_spooled(api, sync_client):
+    client = sync_client(retry=RetryPolicy(2, initial=0.01, methods=None))
+    api.fail(503)
+
+    assert client.ocr(pipe(DATA)).text == 'hello'
+    assert api.count('/api/ocr') == 2
+    assert DATA in api.requests[1].body
+
+
+def test_async_upload_from_an_async_iterable(api, async_client):
+    async def chunks():
+        for i in range(0, len(DATA), 4096):
+            await asyncio.sleep(0)
+            yield DATA[i:i + 4096]
+
+    async def main():
+        async with async_client(retry=RetryPolicy(2, initial=0.01, methods=None)) as client:
+            api.fail(503)
+            return await client.ocr(chunks())
+
+    assert asyncio.run(main()).text == 'hello'
+    assert api.count('/api/ocr') == 2
+    assert DATA in api.requests[1].body
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from openrobot.api_wrapper.utils import decode_body, get_json_loads, is_json_content_type
+
+
+@pytest.mark.parametrize('content_type', [
+    'application/json',
+    'application/json; charset=utf-8',
+    'Application/JSON;charset=UTF-8',
+    'application/problem+json',
+    'application/problem+json; charset=utf-8',
+])
+def test_json_content_types(content_type):
+    assert is_json_content_type(content_type)
+
+
+@pytest.mark.parametrize('content_type', [None, '', 'text/html; charset=utf-8', 'text/json+html', 'application/jsonp'])
+def test_other_content_types(content_type):
+    assert not is_json_content_type(content_type)
+
+
+def test_decode_body():
+    assert decode_body(b'{"a": "\xc3\xa9"}', 'application/json; charset=utf-8') == {'a': 'é'}
+    assert decode_body(b'{"title": "Not Found"}', 'application/problem+json') == {'title': 'Not Found'}
+    assert decode_body(b'<html>\xff</html>', 'text/html') == '<html>�</html>'
+
+
+def test_empty_body_is_text():
+    assert decode_body(b'', 'application/json') == ''
+    assert decode_body(b'', None) == ''
+
+
+def test_invalid_json_falls_back_to_text():
+    assert decode_body(b'<html>Bad Gateway</html>', 'application/json') == '<html>Bad Gateway</html>'
+
+
+def test_json_loads_hook():
+    calls = []
+
+    def loads(body):
+        calls.append(body)
+        return json.loads(body)
+
+    assert decode_body(b'[1]', 'application/json', loads=loads) == [1]
+    assert decode_body(b'text', 'text/plain', loads=loads) == 'text'
+    assert calls == [b'[1]']
+
+
+def test_default_json_loads():
+    try:
+        import orjson
+    except ImportError:
+        assert get_json_loads() is json.loads
+    else:
+        assert get_json_loads() is orjson.loads
+
+
+def test_client_json_loads(api, sync_client):
+    calls = []
+
+    def loads(body):
+        calls.append(body)
+        return json.loads(body)
+
+    assert sync_client(json_loads=loads).ocr(b'image').text == 'hello'
+    assert len(calls) == 1